@@ -2,10 +2,16 @@ from flask import Flask
 from flask_cors import CORS
 from app.extensions import db, jwt, bcrypt, migrate
 from app.config import Config
+from app.utils.flight_index import RouteIndex
+from app.utils.search_cache import SearchCache
+from app.utils.airport_directory import AirportDirectory
+from app.utils.fare_quotes import QuoteStore
+from app.utils.reponse_handler import FastJSONProvider
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = FastJSONProvider(app)
     
     # Initialize extensions
     db.init_app(app)
@@ -13,14 +19,30 @@ def create_app(config_class=Config):
     bcrypt.init_app(app)
     migrate.init_app(app, db)
     CORS(app, origins=["http://localhost:5173"])  # Your React app URL
+    app.extensions['flight_index'] = RouteIndex(
+        app.config['FLIGHT_INDEX_MAX_ROUTES'],
+        app.config['FLIGHT_INDEX_MAX_AGE_SECONDS']
+    )
+    app.extensions['search_cache'] = SearchCache(
+        app.config['SEARCH_CACHE_MAX_ENTRIES'],
+        app.config['SEARCH_CACHE_TTL_SECONDS']
+    )
+    app.extensions['airports'] = AirportDirectory()
+    app.extensions['fare_quotes'] = QuoteStore(app.config['SECRET_KEY'], app.config['FARE_QUOTE_MAX_ENTRIES'])
     
     # Register blueprints
     from app.routes.auth import auth_bp
     from app.routes.flights import flights_bp
     from app.routes.bookings import bookings_bp
+    from app.routes.holds import holds_bp
+    from app.routes.airports import airports_bp
+    from app.routes.quotes import quotes_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(flights_bp, url_prefix='/api/flights')
     app.register_blueprint(bookings_bp, url_prefix='/api/bookings')
+    app.register_blueprint(holds_bp, url_prefix='/api/holds')
+    app.register_blueprint(airports_bp, url_prefix='/api/airports')
+    app.register_blueprint(quotes_bp, url_prefix='/api/quotes')
     
     return app
\ No newline at end of file
@@ -8,4 +8,46 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///airline.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'dev-jwt-secret'
-    JWT_ACCESS_TOKEN_EXPIRES = 86400
\ No newline at end of file
+    JWT_ACCESS_TOKEN_EXPIRES = 86400
+    
+    # Seat holds between seat selection and payment
+    SEAT_HOLD_MINUTES = int(os.environ.get('SEAT_HOLD_MINUTES') or 10)
+    SEAT_HOLD_MAX_MINUTES = int(os.environ.get('SEAT_HOLD_MAX_MINUTES') or 30)
+    SEAT_HOLD_SWEEP_BATCH = int(os.environ.get('SEAT_HOLD_SWEEP_BATCH') or 500)
+    
+    # Seat map versions kept per flight for ?since= polling
+    SEAT_CHANGE_LOG_VERSIONS = int(os.environ.get('SEAT_CHANGE_LOG_VERSIONS') or 200)
+    SEAT_EVENTS_KEEPALIVE_SECONDS = int(os.environ.get('SEAT_EVENTS_KEEPALIVE_SECONDS') or 15)
+    
+    # In-memory route/date index in front of flight search
+    FLIGHT_INDEX_ENABLED = (os.environ.get('FLIGHT_INDEX_ENABLED') or 'true').lower() != 'false'
+    FLIGHT_INDEX_MAX_ROUTES = int(os.environ.get('FLIGHT_INDEX_MAX_ROUTES') or 5000)
+    # Entries reload after this long, to pick up writes committed by other workers
+    FLIGHT_INDEX_MAX_AGE_SECONDS = int(os.environ.get('FLIGHT_INDEX_MAX_AGE_SECONDS') or 60)
+    
+    # Search result cache in front of route and controller search
+    SEARCH_CACHE_ENABLED = (os.environ.get('SEARCH_CACHE_ENABLED') or 'true').lower() != 'false'
+    SEARCH_CACHE_TTL_SECONDS = int(os.environ.get('SEARCH_CACHE_TTL_SECONDS') or 30)
+    SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get('SEARCH_CACHE_MAX_ENTRIES') or 10000)
+    
+    # Layover window for one-stop connection search
+    CONNECTION_MIN_LAYOVER_MINUTES = int(os.environ.get('CONNECTION_MIN_LAYOVER_MINUTES') or 45)
+    CONNECTION_MAX_LAYOVER_MINUTES = int(os.environ.get('CONNECTION_MAX_LAYOVER_MINUTES') or 360)
+    
+    # Server-priced fare quotes that bookings can pay without re-pricing
+    FARE_QUOTE_MINUTES = int(os.environ.get('FARE_QUOTE_MINUTES') or 15)
+    FARE_QUOTE_MAX_ENTRIES = int(os.environ.get('FARE_QUOTE_MAX_ENTRIES') or 50000)
+    
+    # Flights repriced per commit by the fare bucket sweep (sweep_fares.py)
+    FARE_SWEEP_BATCH = int(os.environ.get('FARE_SWEEP_BATCH') or 500)
+    
+    # Stored responses for retried requests that send an Idempotency-Key; a retry
+    # arriving while the first attempt runs waits this long before getting a 409
+    IDEMPOTENCY_TTL_SECONDS = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS') or 86400)
+    IDEMPOTENCY_WAIT_SECONDS = float(os.environ.get('IDEMPOTENCY_WAIT_SECONDS') or 10)
+    # Expired keys deleted per commit by the key purge (sweep_idempotency_keys.py)
+    IDEMPOTENCY_PURGE_BATCH = int(os.environ.get('IDEMPOTENCY_PURGE_BATCH') or 500)
+    
+    # Response encoding: 'auto' uses orjson when installed, else the stdlib json module
+    JSON_ENCODER = os.environ.get('JSON_ENCODER') or 'auto'
+    JSON_SORT_KEYS = False
@@ -1,12 +1,15 @@
 from app.models.booking import Booking
+from app.models.booking_passenger import BookingPassenger
 from app.models.flight import Flight
-from app.models.user import User
 from app.extensions import db
 from datetime import datetime
 from marshmallow import ValidationError
+from sqlalchemy.exc import IntegrityError
 from app.schemas.booking_schema import BookingCreateSchema, BookingUpdateSchema
 from app.utils.pnr_generator import generate_pnr
-from app.utils.dynamic_pricing import calculate_dynamic_price
+from app.utils.pagination import InvalidCursor, approximate_count, keyset_page
+from app.utils.dynamic_pricing import price_seats
+from app.utils.fare_quotes import InvalidQuote, quote_for_booking, quote_used
 
 class BookingController:
     """Controller for handling booking-related business logic"""
@@ -35,17 +38,32 @@ class BookingController:
             if not flight:
                 return {'error': 'Flight not found'}, 404
             
-            # Check if seat is available
-            if seat_number not in flight.seats:
-                return {'error': 'Invalid seat number'}, 400
-            
-            if flight.seats[seat_number]['status'] != 'available':
-                return {'error': 'Seat is already booked'}, 400
-            
             # Check if flight is in the past
             if flight.departure_time < datetime.utcnow():
                 return {'error': 'Cannot book a flight in the past'}, 400
             
+            # A fare quote fixes the price; without one the seat is priced now
+            quote_id = validated_data.get('quote_id')
+            if quote_id:
+                try:
+                    final_price = quote_for_booking(quote_id, flight, [seat_number]).total_price
+                except InvalidQuote as e:
+                    return {'error': str(e)}, 400
+            else:
+                final_price = price_seats(flight, [seat_number])
+            
+            # Convert a live hold, or claim the seat atomically; a failed claim changes nothing
+            hold_token = validated_data.get('hold_token')
+            if hold_token:
+                if not flight.book_held_seats({seat_number: passenger_name}, hold_token):
+                    db.session.rollback()
+                    return {'error': 'Seat hold has expired or is invalid'}, 400
+            elif not flight.claim_seat(seat_number, holder=passenger_name):
+                db.session.rollback()
+                if not flight.get_seat(seat_number):
+                    return {'error': 'Invalid seat number'}, 400
+                return {'error': 'Seat is already booked'}, 400
+            
             # Generate PNR
             pnr = generate_pnr()
             
@@ -53,31 +71,32 @@ class BookingController:
             while Booking.query.filter_by(pnr=pnr).first():
                 pnr = generate_pnr()
             
-            # Calculate final price with dynamic pricing
-            final_price = calculate_dynamic_price(
-                base_price=flight.price,
-                available_seats=len(flight.get_available_seats()),
-                total_seats=len(flight.seats),
-                departure_time=flight.departure_time
-            )
-            
             # Create booking
             booking = Booking(
                 pnr=pnr,
                 user_id=user_id,
-                flight_id=flight_id,
+                flight_id=flight.id,
                 passenger_name=passenger_name,
                 seat_number=seat_number,
                 status='confirmed',
-                payment_status=validated_data.get('payment_status', 'completed')
+                payment_status=validated_data.get('payment_status', 'completed'),
+                total_price=final_price,
+                quote_id=quote_id
             )
-            
-            # Mark seat as booked
-            flight.seats[seat_number]['status'] = 'booked'
-            flight.seats[seat_number]['passenger'] = passenger_name
+            booking.passengers.append(BookingPassenger(
+                passenger_name=passenger_name,
+                seat_number=seat_number
+            ))
             
             db.session.add(booking)
-            db.session.commit()
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                # A concurrent booking paid with the same quote first
+                if quote_id and quote_used(quote_id):
+                    return {'error': 'Fare quote has already been used'}, 400
+                raise
             
             # Prepare response
             booking_dict = booking.to_dict()
@@ -111,26 +130,12 @@ class BookingController:
             Tuple of (result_dict, status_code)
         """
         try:
-            bookings = Booking.query.filter_by(user_id=user_id).order_by(
+            # Flights and passengers are loaded with the bookings, not per row
+            bookings = Booking.with_details().filter_by(user_id=user_id).order_by(
                 Booking.booking_date.desc()
             ).all()
             
-            booking_list = []
-            for booking in bookings:
-                booking_dict = booking.to_dict()
-                
-                # Add flight details
-                flight = Flight.query.filter_by(flight_id=booking.flight_id).first()
-                if flight:
-                    booking_dict['flight'] = {
-                        'airline': flight.airline,
-                        'source': flight.source,
-                        'destination': flight.destination,
-                        'departure_time': flight.departure_time.isoformat(),
-                        'arrival_time': flight.arrival_time.isoformat()
-                    }
-                
-                booking_list.append(booking_dict)
+            booking_list = [booking.to_dict() for booking in bookings]
             
             return {
                 'bookings': booking_list,
@@ -151,7 +156,7 @@ class BookingController:
             Tuple of (result_dict, status_code)
         """
         try:
-            booking = Booking.query.filter_by(pnr=pnr).first()
+            booking = Booking.with_details().filter_by(pnr=pnr).first()
             
             if not booking:
                 return {'error': 'Booking not found'}, 404
@@ -163,7 +168,7 @@ class BookingController:
             booking_dict = booking.to_dict()
             
             # Add flight details
-            flight = Flight.query.filter_by(flight_id=booking.flight_id).first()
+            flight = booking.flight
             if flight:
                 booking_dict['flight'] = {
                     'flight_id': flight.flight_id,
@@ -175,7 +180,7 @@ class BookingController:
                 }
             
             # Add user details
-            user = User.query.get(booking.user_id)
+            user = booking.user
             if user:
                 booking_dict['user'] = {
                     'email': user.email
@@ -213,18 +218,16 @@ class BookingController:
                 return {'error': 'Booking is already cancelled'}, 400
             
             # Check if flight has already departed
-            flight = Flight.query.filter_by(flight_id=booking.flight_id).first()
+            flight = booking.flight
             if flight and flight.departure_time < datetime.utcnow():
                 return {'error': 'Cannot cancel a booking for a past flight'}, 400
             
             # Update booking status
             booking.status = 'cancelled'
             
-            # Free up the seat
-            if flight and booking.seat_number in flight.seats:
-                flight.seats[booking.seat_number]['status'] = 'available'
-                if 'passenger' in flight.seats[booking.seat_number]:
-                    del flight.seats[booking.seat_number]['passenger']
+            # Free up every seat on the PNR
+            if flight:
+                flight.release_seats(booking.seat_numbers())
             
             db.session.commit()
             
@@ -269,31 +272,32 @@ class BookingController:
             # Handle seat change
             if 'seat_number' in validated_data and validated_data['seat_number'] != booking.seat_number:
                 new_seat = validated_data['seat_number']
-                flight = Flight.query.filter_by(flight_id=booking.flight_id).first()
+                flight = booking.flight
                 
                 if not flight:
                     return {'error': 'Flight not found'}, 404
                 
-                # Check if new seat is available
-                if new_seat not in flight.seats:
-                    return {'error': 'Invalid seat number'}, 400
-                
-                if flight.seats[new_seat]['status'] != 'available':
+                # Claim new seat first, then free the old one
+                if not flight.claim_seat(new_seat, holder=booking.passenger_name):
+                    db.session.rollback()
+                    if not flight.get_seat(new_seat):
+                        return {'error': 'Invalid seat number'}, 400
                     return {'error': 'New seat is not available'}, 400
                 
-                # Free old seat and book new seat
-                old_seat = booking.seat_number
-                flight.seats[old_seat]['status'] = 'available'
-                if 'passenger' in flight.seats[old_seat]:
-                    del flight.seats[old_seat]['passenger']
+                flight.release_seats([booking.seat_number])
                 
-                flight.seats[new_seat]['status'] = 'booked'
-                flight.seats[new_seat]['passenger'] = booking.passenger_name
+                # Keep the lead passenger's row in step
+                for passenger in booking.passengers:
+                    if passenger.seat_number == booking.seat_number:
+                        passenger.seat_number = new_seat
                 
                 booking.seat_number = new_seat
             
             # Update other fields
             if 'passenger_name' in validated_data:
+                for passenger in booking.passengers:
+                    if passenger.seat_number == booking.seat_number:
+                        passenger.passenger_name = validated_data['passenger_name']
                 booking.passenger_name = validated_data['passenger_name']
             
             if 'status' in validated_data:
@@ -316,37 +320,32 @@ class BookingController:
             return {'error': f'Update failed: {str(e)}'}, 500
     
     @staticmethod
-    def get_all_bookings(page=1, per_page=20):
+    def get_all_bookings(cursor=None, per_page=20, include_total=False):
         """
-        Get all bookings with pagination (admin only)
+        Get all bookings, newest first, with keyset pagination on (booking_date, id) (admin only)
         Args:
-            page: Page number
+            cursor: next_cursor from the previous page, or None for the first
             per_page: Items per page
+            include_total: Add an (approximate) total count
         Returns:
             Tuple of (result_dict, status_code)
         """
         try:
-            pagination = Booking.query.order_by(Booking.booking_date.desc()).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
+            # Flight, user and passengers come with the page: two queries in all
+            page, next_cursor = keyset_page(
+                Booking.with_details(),
+                (Booking.booking_date, Booking.id),
+                cursor=cursor,
+                limit=per_page,
+                descending=True
             )
             
             bookings = []
-            for booking in pagination.items:
+            for booking in page:
                 booking_dict = booking.to_dict()
                 
-                # Add flight details
-                flight = Flight.query.filter_by(flight_id=booking.flight_id).first()
-                if flight:
-                    booking_dict['flight'] = {
-                        'airline': flight.airline,
-                        'source': flight.source,
-                        'destination': flight.destination
-                    }
-                
                 # Add user details
-                user = User.query.get(booking.user_id)
+                user = booking.user
                 if user:
                     booking_dict['user'] = {
                         'email': user.email
@@ -354,12 +353,16 @@ class BookingController:
                 
                 bookings.append(booking_dict)
             
-            return {
+            result = {
                 'bookings': bookings,
-                'total': pagination.total,
-                'pages': pagination.pages,
-                'current_page': page
-            }, 200
+                'next_cursor': next_cursor
+            }
+            if include_total:
+                result['total'], result['total_is_estimate'] = approximate_count(Booking.query)
+            
+            return result, 200
             
+        except InvalidCursor as e:
+            return {'error': str(e)}, 400
         except Exception as e:
             return {'error': f'Failed to fetch bookings: {str(e)}'}, 500
\ No newline at end of file
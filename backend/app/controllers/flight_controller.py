@@ -1,9 +1,10 @@
 from app.models.flight import Flight
+from app.models.aircraft_layout import AircraftLayout
 from app.extensions import db
-from datetime import datetime, timedelta
 from marshmallow import ValidationError
 from app.schemas.flight_schema import FlightCreateSchema, FlightUpdateSchema, FlightSearchSchema
-from app.utils.dynamic_pricing import calculate_dynamic_price
+from app.utils.search_cache import cached_search
+from app.utils.pagination import InvalidCursor, approximate_count, keyset_page
 import random
 
 class FlightController:
@@ -40,9 +41,12 @@ class FlightController:
                 destination=validated_data['destination'],
                 departure_time=validated_data['departure_time'],
                 arrival_time=validated_data['arrival_time'],
-                price=validated_data['price'],
-                seats=validated_data.get('seats', FlightController._generate_default_seats())
+                price=validated_data['price']
             )
+            if validated_data.get('seats'):
+                flight.seats = validated_data['seats']
+            else:
+                flight.apply_layout(AircraftLayout.standard())
             
             db.session.add(flight)
             db.session.commit()
@@ -58,23 +62,6 @@ class FlightController:
             db.session.rollback()
             return {'error': f'Failed to create flight: {str(e)}'}, 500
     
-    @staticmethod
-    def _generate_default_seats():
-        """Generate default seat layout"""
-        seats = {}
-        rows = 30
-        seat_letters = ['A', 'B', 'C', 'D', 'E', 'F']
-        
-        for row in range(1, rows + 1):
-            for letter in seat_letters:
-                seat_number = f"{row}{letter}"
-                seats[seat_number] = {
-                    'status': 'available',
-                    'type': 'economy' if row > 5 else 'business'
-                }
-        
-        return seats
-    
     @staticmethod
     def search_flights(query_params):
         """
@@ -94,35 +81,20 @@ class FlightController:
             date = validated_params['date']
             passengers = validated_params.get('passengers', 1)
             
-            # Query flights
-            start_of_day = datetime.combine(date, datetime.min.time())
-            end_of_day = datetime.combine(date, datetime.max.time())
-            
-            flights = Flight.query.filter(
-                Flight.source.ilike(f'%{source}%'),
-                Flight.destination.ilike(f'%{destination}%'),
-                Flight.departure_time.between(start_of_day, end_of_day)
-            ).all()
-            
-            # Filter by available seats and calculate dynamic pricing
-            available_flights = []
-            for flight in flights:
-                available_seats = flight.get_available_seats()
-                
-                if len(available_seats) >= passengers:
-                    flight_dict = flight.to_dict()
-                    flight_dict['available_seats'] = len(available_seats)
-                    
-                    # Apply dynamic pricing
-                    dynamic_price = calculate_dynamic_price(
-                        base_price=flight.price,
-                        available_seats=len(available_seats),
-                        total_seats=len(flight.seats),
-                        departure_time=flight.departure_time
-                    )
-                    flight_dict['price'] = dynamic_price
-                    
-                    available_flights.append(flight_dict)
+            def load_results():
+                # Query flights through the route/departure index, with their precomputed economy fares
+                records = Flight.fare_records(Flight.with_fares(
+                    Flight.route_query(source, destination, date)
+                ).filter(Flight.seats_available >= passengers))
+                for record in records:
+                    record['price'] = record['fare']
+                return records
+            
+            # Identical searches share one cached result (see app.utils.search_cache)
+            available_flights = cached_search(
+                (*Flight.route_key(source, destination, date), 'controller', passengers),
+                load_results
+            )
             
             return {
                 'flights': available_flights,
@@ -150,7 +122,8 @@ class FlightController:
                 return {'error': 'Flight not found'}, 404
             
             flight_dict = flight.to_dict()
-            flight_dict['available_seats'] = len(flight.get_available_seats())
+            flight_dict['available_seats'] = flight.seats_available
+            flight_dict['available_by_class'] = flight.availability()
             
             return {
                 'flight': flight_dict
@@ -240,35 +213,35 @@ class FlightController:
             return {'error': f'Deletion failed: {str(e)}'}, 500
     
     @staticmethod
-    def get_all_flights(page=1, per_page=20):
+    def get_all_flights(cursor=None, per_page=20, include_total=False):
         """
-        Get all flights with pagination
+        Get all flights with keyset pagination on (departure_time, id)
         Args:
-            page: Page number
+            cursor: next_cursor from the previous page, or None for the first
             per_page: Items per page
+            include_total: Add an (approximate) total count
         Returns:
             Tuple of (result_dict, status_code)
         """
         try:
-            pagination = Flight.query.order_by(Flight.departure_time).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
+            page, next_cursor = keyset_page(
+                Flight.query,
+                (Flight.departure_time, Flight.id),
+                cursor=cursor,
+                limit=per_page
             )
             
-            flights = []
-            for flight in pagination.items:
-                flight_dict = flight.to_dict()
-                flight_dict['available_seats'] = len(flight.get_available_seats())
-                flights.append(flight_dict)
+            result = {
+                'flights': [flight.to_summary_dict() for flight in page],
+                'next_cursor': next_cursor
+            }
+            if include_total:
+                result['total'], result['total_is_estimate'] = approximate_count(Flight.query)
             
-            return {
-                'flights': flights,
-                'total': pagination.total,
-                'pages': pagination.pages,
-                'current_page': page
-            }, 200
+            return result, 200
             
+        except InvalidCursor as e:
+            return {'error': str(e)}, 400
         except Exception as e:
             return {'error': f'Failed to fetch flights: {str(e)}'}, 500
     
@@ -2,8 +2,10 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_bcrypt import Bcrypt
 from flask_migrate import Migrate
+from app.utils.pubsub import InProcessBroker
 
 db = SQLAlchemy()
 jwt = JWTManager()
 bcrypt = Bcrypt()
-migrate = Migrate()
\ No newline at end of file
+migrate = Migrate()
+seat_events = InProcessBroker()  # Committed seat changes, one channel per flight
\ No newline at end of file
@@ -0,0 +1,136 @@
+from app.extensions import db
+from app.utils.seat_bitmap import SeatGrid
+from datetime import datetime
+import hashlib
+import json
+import re
+
+SEAT_NUMBER = re.compile(r'^(\d+)([A-Z]+)$')
+
+# The cabin plan used by seeded and admin-created flights (170 seats).
+# A space in `letters` marks the aisle.
+STANDARD_LAYOUT_CODE = 'STD-170'
+STANDARD_CABINS = [
+    {'class': 'business', 'rows': [1, 5], 'letters': 'AB CD'},
+    {'class': 'premium_economy', 'rows': [6, 10], 'letters': 'ABC DEF'},
+    {'class': 'economy', 'rows': [11, 30], 'letters': 'ABC DEF'},
+]
+
+# Layouts never change once stored, so their parsed plans are cached by code
+_seat_plans = {}
+
+class SeatPlan:
+    """Parsed, read-only view of a layout's cabins"""
+    
+    def __init__(self, cabins):
+        self.seats = []  # [(seat_number, seat_class)] in seat map order
+        self.rows = []  # [(row_label, seat_class, [[seat_number, ...], ...])], one inner list per aisle block
+        
+        for cabin in cabins:
+            seat_class = cabin['class']
+            if 'seats' in cabin:
+                # Free-form seat numbers with no row structure
+                for seat_number in cabin['seats']:
+                    self.seats.append((seat_number, seat_class))
+                    self.rows.append((seat_number, seat_class, [[seat_number]]))
+                continue
+            
+            first, last = cabin['rows']
+            for row in range(first, last + 1):
+                blocks = [[f"{row}{letter}" for letter in block] for block in cabin['letters'].split()]
+                for block in blocks:
+                    for seat_number in block:
+                        self.seats.append((seat_number, seat_class))
+                self.rows.append((str(row), seat_class, blocks))
+        
+        self.seat_classes = dict(self.seats)
+        self.class_totals = {}
+        for _, seat_class in self.seats:
+            self.class_totals[seat_class] = self.class_totals.get(seat_class, 0) + 1
+        
+        self.grid = SeatGrid(self.rows)
+
+class AircraftLayout(db.Model):
+    __tablename__ = 'aircraft_layouts'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    code = db.Column(db.String(50), unique=True, nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    cabins = db.Column(db.JSON, nullable=False)  # [{"class": ..., "rows": [1, 5], "letters": "AB CD"}, ...]
+    seat_count = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    @property
+    def plan(self):
+        plan = _seat_plans.get(self.code)
+        if plan is None:
+            plan = _seat_plans[self.code] = SeatPlan(self.cabins)
+        return plan
+    
+    def to_dict(self):
+        return {
+            'code': self.code,
+            'name': self.name,
+            'cabins': self.cabins,
+            'seat_count': self.seat_count
+        }
+    
+    @classmethod
+    def get_or_create(cls, code, name, cabins):
+        layout = cls.query.filter_by(code=code).first()
+        if layout is None:
+            layout = cls(code=code, name=name, cabins=cabins, seat_count=len(SeatPlan(cabins).seats))
+            db.session.add(layout)
+        return layout
+    
+    @classmethod
+    def standard(cls):
+        """The default three-cabin layout"""
+        return cls.get_or_create(STANDARD_LAYOUT_CODE, 'Standard 3-class (170 seats)', STANDARD_CABINS)
+    
+    @classmethod
+    def for_seat_map(cls, seat_map):
+        """Find or create the layout matching a legacy {"1A": {"type": ...}} seat map"""
+        cabins = cabins_from_seat_map(seat_map)
+        if cabins == STANDARD_CABINS or cabins == _without_aisles(STANDARD_CABINS):
+            return cls.standard()
+        fingerprint = hashlib.sha1(json.dumps(cabins, sort_keys=True).encode()).hexdigest()[:12]
+        return cls.get_or_create(f'CUSTOM-{fingerprint}', f'Custom ({len(seat_map)} seats)', cabins)
+
+def _without_aisles(cabins):
+    return [dict(cabin, letters=cabin['letters'].replace(' ', '')) for cabin in cabins]
+
+def cabins_from_seat_map(seat_map):
+    """
+    Collapse a seat map into cabin ranges: consecutive rows with the same class
+    and seat letters become one cabin entry. Seat numbers that are not
+    <row><letters> are kept as an explicit list.
+    """
+    rows = []  # [(row, seat_class, letters)]
+    loose = []  # [(seat_number, seat_class)]
+    for seat_number, data in seat_map.items():
+        seat_class = data.get('type', 'economy')
+        match = SEAT_NUMBER.match(seat_number)
+        if not match or len(match.group(2)) != 1:
+            loose.append((seat_number, seat_class))
+            continue
+        row, letter = int(match.group(1)), match.group(2)
+        if rows and rows[-1][0] == row and rows[-1][1] == seat_class:
+            rows[-1] = (row, seat_class, rows[-1][2] + letter)
+        else:
+            rows.append((row, seat_class, letter))
+    
+    cabins = []
+    for row, seat_class, letters in rows:
+        last = cabins[-1] if cabins else None
+        if last and last['class'] == seat_class and last['letters'] == letters and last['rows'][1] == row - 1:
+            last['rows'][1] = row
+        else:
+            cabins.append({'class': seat_class, 'rows': [row, row], 'letters': letters})
+    
+    for seat_number, seat_class in loose:
+        if cabins and 'seats' in cabins[-1] and cabins[-1]['class'] == seat_class:
+            cabins[-1]['seats'].append(seat_number)
+        else:
+            cabins.append({'class': seat_class, 'seats': [seat_number]})
+    return cabins
@@ -0,0 +1,22 @@
+from app.extensions import db
+
+class Airport(db.Model):
+    # City/airport dictionary: search inputs resolve to `code` (see app.utils.airport_directory)
+    __tablename__ = 'airports'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    code = db.Column(db.String(3), unique=True, nullable=False, index=True)  # IATA code
+    city = db.Column(db.String(100), nullable=False)
+    name = db.Column(db.String(150), nullable=False)
+    aliases = db.Column(db.JSON, nullable=False, default=list)  # Other names for the city, e.g. ["Bombay"]
+    
+    def search_terms(self):
+        """Names this airport can be found by"""
+        return [self.code, self.city, self.name, *(self.aliases or [])]
+    
+    def to_dict(self):
+        return {
+            'code': self.code,
+            'city': self.city,
+            'name': self.name
+        }
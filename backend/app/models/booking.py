@@ -1,8 +1,17 @@
 from app.extensions import db
+from app.models.booking_passenger import BookingPassenger
+from sqlalchemy.orm import joinedload, selectinload
 from datetime import datetime
 
 class Booking(db.Model):
     __tablename__ = 'bookings'
+    __table_args__ = (
+        # Keyset pagination of the booking listings, newest first
+        db.Index('ix_bookings_booking_date_id', 'booking_date', 'id'),
+        db.Index('ix_bookings_user_booking_date_id', 'user_id', 'booking_date', 'id'),
+        # A fare quote pays for one booking only
+        db.UniqueConstraint('quote_id', name='uq_bookings_quote_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     pnr = db.Column(db.String(50), unique=True, nullable=False, index=True)
@@ -12,14 +21,44 @@ class Booking(db.Model):
     seat_number = db.Column(db.String(10), nullable=False)
     status = db.Column(db.String(20), default='confirmed')
     payment_status = db.Column(db.String(20), default='completed')
+    # Fare charged for every seat on the PNR, from the fare quote when one was paid
+    total_price = db.Column(db.Float)
+    quote_id = db.Column(db.String(512))
     booking_date = db.Column(db.DateTime, default=datetime.utcnow)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def to_dict(self):
-        # Get the flight details using the database ID
+    # Every passenger on the PNR; passenger_name/seat_number above hold the lead passenger
+    passengers = db.relationship(
+        'BookingPassenger',
+        backref='booking',
+        lazy=True,
+        order_by=BookingPassenger.id,
+        cascade='all, delete-orphan',
+        passive_deletes=True
+    )
+    
+    def seat_numbers(self):
+        """Seats held by this PNR"""
+        return [passenger.seat_number for passenger in self.passengers] or [self.seat_number]
+    
+    @classmethod
+    def with_details(cls):
+        """
+        Booking query that loads each row's flight (with its layout) and user
+        in the same SELECT and the passengers in one more, so serializing a
+        page of bookings costs two queries however long the page is.
+        """
         from app.models.flight import Flight
-        flight = Flight.query.get(self.flight_id)
+        return cls.query.options(
+            joinedload(cls.flight).joinedload(Flight.layout),
+            joinedload(cls.user),
+            selectinload(cls.passengers)
+        )
+    
+    def to_dict(self):
+        # Flight details through the flight_id foreign key (loaded up front by with_details)
+        flight = self.flight
         
         result = {
             'pnr': self.pnr,
@@ -29,7 +68,9 @@ class Booking(db.Model):
             'seat_number': self.seat_number,
             'status': self.status,
             'payment_status': self.payment_status,
-            'booking_date': self.booking_date.isoformat(),
+            'total_price': self.total_price,
+            'booking_date': self.booking_date,  # Datetimes are encoded as ISO 8601 by the JSON provider
+            'passengers': [passenger.to_dict() for passenger in self.passengers],
         }
         
         # Add flight details if available
@@ -38,12 +79,13 @@ class Booking(db.Model):
                 'airline': flight.airline,
                 'source': flight.source,
                 'destination': flight.destination,
-                'departure_time': flight.departure_time.isoformat(),
-                'arrival_time': flight.arrival_time.isoformat(),
+                'departure_time': flight.departure_time,
+                'arrival_time': flight.arrival_time,
                 'price': flight.price,
             }
-            # Add seat class
-            if self.seat_number in flight.seats:
-                result['seat_class'] = flight.seats[self.seat_number].get('type', 'economy')
+            # Add seat class, from the layout rather than a seat row lookup
+            plan = flight.seat_plan
+            if plan and self.seat_number in plan.seat_classes:
+                result['seat_class'] = plan.seat_classes[self.seat_number]
         
         return result
\ No newline at end of file
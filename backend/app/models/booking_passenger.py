@@ -0,0 +1,18 @@
+from app.extensions import db
+
+class BookingPassenger(db.Model):
+    __tablename__ = 'booking_passengers'
+    __table_args__ = (
+        db.UniqueConstraint('booking_id', 'seat_number', name='uq_booking_passengers_booking_seat'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    booking_id = db.Column(db.Integer, db.ForeignKey('bookings.id', ondelete='CASCADE'), nullable=False, index=True)
+    passenger_name = db.Column(db.String(200), nullable=False)
+    seat_number = db.Column(db.String(10), nullable=False)
+    
+    def to_dict(self):
+        return {
+            'passenger_name': self.passenger_name,
+            'seat_number': self.seat_number
+        }
@@ -1,24 +1,262 @@
-from app.extensions import db
-from datetime import datetime
+from app.extensions import db, seat_events
+from app.models.aircraft_layout import AircraftLayout
+from app.models.flight_seat import FlightSeat
+from app.models.seat_change import SeatChange
+from app.models.route_day_fare import RouteDayFare
+from app.models.flight_fare import FlightFare
+from app.utils.dynamic_pricing import next_reprice_at, occupancy_tier, price_flights
+from app.utils.upsert import dialect_insert
+from app.utils.connections import Leg
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, validates
+from datetime import datetime, time, timedelta
+from itertools import chain
 import json
 
+# Cabin classes with a maintained availability counter column on flights
+SEAT_CLASSES = ('business', 'premium_economy', 'economy')
+
 class Flight(db.Model):
     __tablename__ = 'flights'
+    __table_args__ = (
+        # Serves route/date search: equality on both cities, range on departure
+        db.Index('ix_flights_route_departure', 'source_norm', 'destination_norm', 'departure_time'),
+        # Keyset pagination of the flight listing
+        db.Index('ix_flights_departure_id', 'departure_time', 'id'),
+        # Connection search: first legs by origin, second legs by destination
+        db.Index('ix_flights_source_departure', 'source_norm', 'departure_time'),
+        db.Index('ix_flights_destination_departure', 'destination_norm', 'departure_time'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     flight_id = db.Column(db.String(50), unique=True, nullable=False, index=True)
     airline = db.Column(db.String(100), nullable=False)
     source = db.Column(db.String(100), nullable=False, index=True)
     destination = db.Column(db.String(100), nullable=False, index=True)
+    # Search keys (IATA code or normalized name), set from source/destination by normalize_city
+    source_norm = db.Column(db.String(100), nullable=False)
+    destination_norm = db.Column(db.String(100), nullable=False)
     departure_time = db.Column(db.DateTime, nullable=False, index=True)
     arrival_time = db.Column(db.DateTime, nullable=False)
     price = db.Column(db.Float, nullable=False)
-    seats = db.Column(db.JSON, default={})  # {"A1": {"status": "available"}, ...}
+    layout_id = db.Column(db.Integer, db.ForeignKey('aircraft_layouts.id'), index=True)
+    # Availability counters, kept in step with flight_seats in the same transaction
+    seats_total = db.Column(db.Integer, nullable=False, default=0)
+    seats_available = db.Column(db.Integer, nullable=False, default=0)
+    business_available = db.Column(db.Integer, nullable=False, default=0)
+    premium_economy_available = db.Column(db.Integer, nullable=False, default=0)
+    economy_available = db.Column(db.Integer, nullable=False, default=0)
+    seats_held = db.Column(db.Integer, nullable=False, default=0)
+    seat_version = db.Column(db.Integer, nullable=False, default=0)  # Bumped on every seat change
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relationship
+    # Relationships
     bookings = db.relationship('Booking', backref='flight', lazy=True)
+    layout = db.relationship('AircraftLayout', lazy='select')
+    # Only seats that are not available have a row; the rest come from the layout
+    seat_overrides = db.relationship(
+        'FlightSeat',
+        lazy='select',
+        order_by=FlightSeat.id,
+        cascade='all, delete-orphan',
+        passive_deletes=True
+    )
+    seat_changes = db.relationship(
+        'SeatChange',
+        lazy='dynamic',
+        cascade='all, delete-orphan',
+        passive_deletes=True
+    )
+    fares = db.relationship(
+        'FlightFare',
+        lazy='select',
+        cascade='all, delete-orphan',
+        passive_deletes=True
+    )
+    
+    @staticmethod
+    def normalize_city(name):
+        """
+        Search key for a city: its IATA code when the name is a known code,
+        city, airport name or alias (see app.utils.airport_directory),
+        otherwise the name trimmed, single-spaced and case-folded
+        """
+        key = ' '.join((name or '').split()).casefold()
+        if key and has_app_context():
+            return current_app.extensions['airports'].resolve(key) or key
+        return key
+    
+    @validates('source', 'destination')
+    def _set_city_key(self, key, value):
+        setattr(self, f'{key}_norm', self.normalize_city(value))
+        return value
+    
+    @classmethod
+    def departing_on(cls, day):
+        """Departure time range for one calendar day, usable by the route index"""
+        start = datetime.combine(day, time.min)
+        return cls.departure_time >= start, cls.departure_time < start + timedelta(days=1)
+    
+    @classmethod
+    def route_key(cls, source, destination, day):
+        """Key of the in-memory route index (app.utils.flight_index)"""
+        return cls.normalize_city(source), cls.normalize_city(destination), day
+    
+    def _route_keys(self):
+        """Index keys this flight is under now and was under when loaded"""
+        state = db.inspect(self)
+        current = (self.source_norm, self.destination_norm, self.departure_time)
+        previous = []
+        for attr, value in zip(('source_norm', 'destination_norm', 'departure_time'), current):
+            history = state.attrs[attr].history
+            previous.append(history.deleted[0] if history.deleted else value)
+        return {
+            (source, destination, departure.date())
+            for source, destination, departure in (current, previous)
+            if departure is not None
+        }
+    
+    @classmethod
+    def route_query(cls, source, destination, day):
+        """Flights on a route departing on a day, in departure order"""
+        return cls.query.filter(
+            cls.source_norm == cls.normalize_city(source),
+            cls.destination_norm == cls.normalize_city(destination),
+            *cls.departing_on(day)
+        ).order_by(cls.departure_time)
+    
+    @classmethod
+    def connection_legs(cls, origin, destination, depart_from, depart_until, min_layover, max_layover, seats=1):
+        """
+        The only flights a one-stop search from origin to destination can use,
+        as Legs carrying the flight's row id, in two indexed reads: first legs
+        leaving origin in [depart_from, depart_until), then second legs into
+        destination from those legs' hubs inside their connection window.
+        
+        Args:
+            origin, destination: Normalized city names
+            depart_from, depart_until: Window for the first leg's departure
+            min_layover, max_layover: timedelta bounds on the connection time
+            seats: Seats needed on both legs
+        
+        Returns:
+            List of Leg
+        """
+        columns = (cls.source_norm, cls.destination_norm, cls.departure_time,
+                   cls.arrival_time, cls.price, cls.seats_available, cls.id)
+        first_legs = [Leg(*row) for row in db.session.execute(
+            db.select(*columns).where(
+                cls.source_norm == origin,
+                cls.departure_time >= depart_from,
+                cls.departure_time < depart_until,
+                cls.destination_norm.notin_((origin, destination)),
+                cls.seats_available >= seats
+            )
+        )]
+        if not first_legs:
+            return []
+        
+        second_legs = [Leg(*row) for row in db.session.execute(
+            db.select(*columns).where(
+                cls.destination_norm == destination,
+                cls.departure_time >= min(leg.arrival for leg in first_legs) + min_layover,
+                cls.departure_time <= max(leg.arrival for leg in first_legs) + max_layover,
+                cls.source_norm.in_({leg.destination for leg in first_legs}),
+                cls.seats_available >= seats
+            )
+        )]
+        return first_legs + second_legs
+    
+    @property
+    def seat_plan(self):
+        return self.layout.plan if self.layout else None
+    
+    @property
+    def seats(self):
+        """Seat map in the legacy {"A1": {"status": "available", "type": ...}} shape"""
+        plan = self.seat_plan
+        if plan is None:
+            return {}
+        overrides = {seat.seat_number: seat for seat in self.seat_overrides}
+        result = {}
+        for seat_number, seat_class in plan.seats:
+            override = overrides.get(seat_number)
+            result[seat_number] = override.to_dict() if override else {'status': 'available', 'type': seat_class}
+        return result
+    
+    @seats.setter
+    def seats(self, seat_map):
+        # Store the grid once as a layout and keep rows only for non-available seats
+        seat_map = seat_map or {}
+        self.apply_layout(AircraftLayout.for_seat_map(seat_map))
+        
+        existing = {seat.seat_number: seat for seat in self.seat_overrides}
+        for seat_number, data in seat_map.items():
+            status = data.get('status', 'available')
+            if status == 'available':
+                continue
+            seat = existing.pop(seat_number, None)
+            if seat is None:
+                seat = FlightSeat(seat_number=seat_number)
+                self.seat_overrides.append(seat)
+            seat.seat_class = data.get('type', 'economy')
+            seat.status = status
+            seat.holder = data.get('passenger')
+        
+        for seat in existing.values():
+            self.seat_overrides.remove(seat)
+        
+        taken = [data for data in seat_map.values() if data.get('status', 'available') != 'available']
+        self.seats_available -= len(taken)
+        self.seats_held = sum(1 for data in taken if data.get('status') == 'held')
+        for data in taken:
+            seat_class = data.get('type', 'economy')
+            if seat_class in SEAT_CLASSES:
+                column = f'{seat_class}_available'
+                setattr(self, column, getattr(self, column) - 1)
+    
+    def apply_layout(self, layout):
+        """Point the flight at a layout with every seat available"""
+        # No log entry for this version, so pollers fall back to the full map
+        self.seat_version = (self.seat_version or 0) + 1
+        self.layout = layout
+        plan = layout.plan
+        self.seats_total = len(plan.seats)
+        self.seats_available = len(plan.seats)
+        self.seats_held = 0
+        for seat_class in SEAT_CLASSES:
+            setattr(self, f'{seat_class}_available', plan.class_totals.get(seat_class, 0))
+    
+    def availability(self):
+        """Per-class availability read from the counter columns"""
+        result = {seat_class: getattr(self, f'{seat_class}_available') for seat_class in SEAT_CLASSES}
+        result['total'] = self.seats_available
+        result['held'] = self.seats_held
+        return result
+    
+    def to_summary_dict(self):
+        """
+        Summary for list and search results: availability counts instead of
+        the seat map, so building it never loads the layout or seat rows.
+        This is also the record the route index holds. Times stay datetimes;
+        the app's JSON provider encodes them as ISO 8601.
+        """
+        return {
+            'id': self.id,
+            'flight_id': self.flight_id,
+            'airline': self.airline,
+            'source': self.source,
+            'destination': self.destination,
+            'departure_time': self.departure_time,
+            'arrival_time': self.arrival_time,
+            'price': self.price,
+            'seat_version': self.seat_version,
+            'available_seats': self.seats_available,
+            'available_by_class': self.availability()
+        }
     
     def to_dict(self):
         return {
@@ -27,18 +265,567 @@ class Flight(db.Model):
             'airline': self.airline,
             'source': self.source,
             'destination': self.destination,
-            'departure_time': self.departure_time.isoformat(),
-            'arrival_time': self.arrival_time.isoformat(),
+            'departure_time': self.departure_time,  # Encoded as ISO 8601 by the JSON provider
+            'arrival_time': self.arrival_time,
             'price': self.price,
-            'seats': self.seats
+            'seats': self.seats,
+            'seat_version': self.seat_version
+        }
+    
+    def get_seat(self, seat_number):
+        """
+        Look up one seat without building the seat map. Available seats have
+        no row, so they come back as a transient FlightSeat from the layout.
+        """
+        plan = self.seat_plan
+        if plan is None or seat_number not in plan.seat_classes:
+            return None
+        seat = FlightSeat.query.filter_by(flight_id=self.id, seat_number=seat_number).first()
+        if seat is None:
+            seat = FlightSeat(
+                flight_id=self.id,
+                seat_number=seat_number,
+                seat_class=plan.seat_classes[seat_number],
+                status='available'
+            )
+        return seat
+    
+    def _taken_seat_numbers(self):
+        return {
+            row.seat_number
+            for row in db.session.query(FlightSeat.seat_number).filter_by(flight_id=self.id)
         }
     
     def get_available_seats(self):
-        return [seat for seat, data in self.seats.items() if data.get('status') == 'available']
+        plan = self.seat_plan
+        if plan is None:
+            return []
+        taken = self._taken_seat_numbers()
+        return [seat_number for seat_number, _ in plan.seats if seat_number not in taken]
+    
+    def seat_bitmap(self):
+        """Free seats as a bitmap over the layout (see app.utils.seat_bitmap)"""
+        plan = self.seat_plan
+        if plan is None:
+            return None
+        return plan.grid.bitmap(self._taken_seat_numbers())
+    
+    def _insert_seats(self, seat_numbers, values):
+        """
+        Insert override rows for seats that are currently available. The unique
+        (flight_id, seat_number) constraint makes this the atomic claim: if any
+        seat already has a row the insert fails and the caller must roll back.
+        Returns [(seat_number, seat_class)] claimed, or None on failure.
+        """
+        plan = self.seat_plan
+        seat_numbers = list(seat_numbers)
+        if plan is None or any(seat_number not in plan.seat_classes for seat_number in seat_numbers):
+            return None
+        
+        rows = []
+        for seat_number in seat_numbers:
+            row = {
+                'flight_id': self.id,
+                'seat_number': seat_number,
+                'seat_class': plan.seat_classes[seat_number]
+            }
+            row.update(values(seat_number) if callable(values) else values)
+            rows.append(row)
+        
+        try:
+            db.session.execute(db.insert(FlightSeat), rows)
+        except IntegrityError:
+            return None
+        db.session.expire(self, ['seat_overrides'])
+        return [(row['seat_number'], row['seat_class']) for row in rows]
+    
+    def _delete_seats(self, *criteria):
+        """Delete override rows (making the seats available), returning [(seat_number, seat_class)]"""
+        stmt = db.delete(FlightSeat).where(
+            FlightSeat.flight_id == self.id,
+            *criteria
+        ).returning(FlightSeat.seat_number, FlightSeat.seat_class)
+        seats = [tuple(row) for row in db.session.execute(
+            stmt,
+            execution_options={'synchronize_session': False}
+        )]
+        db.session.expire(self, ['seat_overrides'])
+        return seats
+    
+    def _update_seats(self, seat_numbers, values, *criteria):
+        """Conditional UPDATE over seat rows, returning [(seat_number, seat_class)] changed"""
+        stmt = db.update(FlightSeat).where(
+            FlightSeat.flight_id == self.id,
+            FlightSeat.seat_number.in_(list(seat_numbers)),
+            *criteria
+        ).values(**values).returning(FlightSeat.seat_number, FlightSeat.seat_class)
+        return [tuple(row) for row in db.session.execute(stmt)]
+    
+    @classmethod
+    def _apply_seat_changes(cls, flight_id, seats, status, available_delta, held_delta=0, holders=None):
+        """
+        Shift one flight's counters, bump its seat_version and log the new
+        status of each seat, all in the caller's transaction.
+        Args:
+            seats: [(seat_number, seat_class)] that changed
+            status: Status the seats now have
+            holders: Optional dictionary mapping seat_number -> passenger name
+        """
+        if not seats:
+            return
+        seat_classes = [seat_class for _, seat_class in seats]
+        values = {cls.seat_version: cls.seat_version + 1}
+        if available_delta:
+            values[cls.seats_available] = cls.seats_available + available_delta * len(seat_classes)
+            for seat_class in SEAT_CLASSES:
+                count = seat_classes.count(seat_class)
+                if count:
+                    column = getattr(cls, f'{seat_class}_available')
+                    values[column] = column + available_delta * count
+        if held_delta:
+            values[cls.seats_held] = cls.seats_held + held_delta * len(seat_classes)
+        counters = db.session.execute(
+            db.update(cls).where(cls.id == flight_id).values(values).returning(
+                cls.seat_version, cls.seats_total, cls.seats_available, cls.seats_held,
+                *(getattr(cls, f'{seat_class}_available') for seat_class in SEAT_CLASSES),
+                cls.source_norm, cls.destination_norm, cls.departure_time
+            ),
+            execution_options={'synchronize_session': 'evaluate'}
+        ).one()
+        version = counters.seat_version
+        
+        holders = holders or {}
+        changes = [
+            {
+                'flight_id': flight_id,
+                'version': version,
+                'seat_number': seat_number,
+                'seat_class': seat_class,
+                'status': status,
+                'holder': holders.get(seat_number)
+            }
+            for seat_number, seat_class in seats
+        ]
+        db.session.execute(db.insert(SeatChange), changes)
+        
+        # Published to seat_events once the transaction commits
+        if status == 'available':
+            kind = 'released' if held_delta else 'cancelled'
+        else:
+            kind = status
+        availability = {seat_class: getattr(counters, f'{seat_class}_available') for seat_class in SEAT_CLASSES}
+        availability['total'] = counters.seats_available
+        availability['held'] = counters.seats_held
+        route_key = (counters.source_norm, counters.destination_norm, counters.departure_time.date())
+        if available_delta and counters.seats_available in (0, available_delta * len(seats)):
+            # Sold out or back on sale: the fare calendar for that day changes
+            db.session.info.setdefault('fare_keys', set()).add(route_key)
+        if available_delta and counters.seats_total:
+            # Occupancy crossed a pricing tier: the flight's fares change
+            before = counters.seats_available - available_delta * len(seats)
+            if occupancy_tier(1 - before / counters.seats_total) != \
+                    occupancy_tier(1 - counters.seats_available / counters.seats_total):
+                db.session.info.setdefault('fare_flights', set()).add(flight_id)
+        db.session.info.setdefault('seat_events', []).append((flight_id, route_key, {
+            'event': kind,
+            'version': version,
+            'seats': {change['seat_number']: SeatChange(**change).to_dict() for change in changes},
+            'availability': availability
+        }))
+        
+        # Keep the log bounded to the last few hundred versions
+        keep = current_app.config['SEAT_CHANGE_LOG_VERSIONS']
+        if version > keep:
+            db.session.execute(
+                db.delete(SeatChange).where(
+                    SeatChange.flight_id == flight_id,
+                    SeatChange.version <= version - keep
+                ),
+                execution_options={'synchronize_session': False}
+            )
+    
+    def seat_changes_since(self, version):
+        """
+        Seats changed after `version`, as {seat_number: entry} with the
+        latest entry winning. Returns None when the log no longer covers
+        every version since then and the client needs the full seat map.
+        """
+        if version > self.seat_version:
+            return None
+        changes = self.seat_changes.filter(SeatChange.version > version).order_by(
+            SeatChange.version, SeatChange.id
+        ).all()
+        if {change.version for change in changes} != set(range(version + 1, self.seat_version + 1)):
+            return None
+        return {change.seat_number: change.to_dict() for change in changes}
+    
+    def claim_seats(self, holders):
+        """
+        Atomically claim seats with one INSERT and adjust the availability
+        counters in the same transaction.
+        Args:
+            holders: Dictionary mapping seat_number -> passenger name
+        Returns:
+            True if every seat was available and is now booked.
+            On False the caller must roll back.
+        """
+        seats = self._insert_seats(holders, lambda seat_number: {
+            'status': 'booked',
+            'holder': holders[seat_number]
+        })
+        if seats is None:
+            return False
+        self._apply_seat_changes(self.id, seats, 'booked', -1, holders=holders)
+        return True
+    
+    def claim_seat(self, seat_number, holder=None):
+        return self.claim_seats({seat_number: holder})
+    
+    def release_seats(self, seat_numbers, from_status='booked'):
+        """
+        Make seats available again with one conditional DELETE.
+        Returns the number of seats released.
+        """
+        seats = self._delete_seats(
+            FlightSeat.seat_number.in_(list(seat_numbers)),
+            FlightSeat.status == from_status
+        )
+        self._apply_seat_changes(self.id, seats, 'available', 1, held_delta=-1 if from_status == 'held' else 0)
+        return len(seats)
+    
+    def hold_seats(self, seat_numbers, hold_token, expires_at):
+        """
+        Hold available seats until expires_at with one INSERT.
+        Returns True if every seat is now held; on False the caller must roll back.
+        """
+        seats = self._insert_seats(seat_numbers, {
+            'status': 'held',
+            'hold_token': hold_token,
+            'hold_expires_at': expires_at
+        })
+        if seats is None:
+            return False
+        self._apply_seat_changes(self.id, seats, 'held', -1, held_delta=1)
+        return True
+    
+    def book_held_seats(self, holders, hold_token):
+        """
+        Turn live held seats into booked seats without re-checking the seat map.
+        Returns True if every seat was held under hold_token; on False the caller must roll back.
+        """
+        seats = self._update_seats(holders, {
+            'status': 'booked',
+            'holder': db.case(holders, value=FlightSeat.seat_number),
+            'hold_token': None,
+            'hold_expires_at': None
+        },
+            FlightSeat.status == 'held',
+            FlightSeat.hold_token == hold_token,
+            FlightSeat.hold_expires_at > datetime.utcnow()
+        )
+        if len(seats) != len(holders):
+            return False
+        self._apply_seat_changes(self.id, seats, 'booked', 0, held_delta=-1, holders=holders)
+        return True
+    
+    def release_hold(self, hold_token):
+        """Release every seat held under hold_token. Returns the number of seats released."""
+        seats = self._delete_seats(
+            FlightSeat.status == 'held',
+            FlightSeat.hold_token == hold_token
+        )
+        self._apply_seat_changes(self.id, seats, 'available', 1, held_delta=-1)
+        return len(seats)
+    
+    @classmethod
+    def release_expired_holds(cls, batch_size=500, now=None, flight_id=None):
+        """
+        Release holds that have expired, in batches walked along the
+        hold_expires_at index. Each batch is one DELETE plus one counter UPDATE
+        per affected flight, committed before the next batch starts.
+        Returns the number of seats released.
+        """
+        now = now or datetime.utcnow()
+        expired = [FlightSeat.status == 'held', FlightSeat.hold_expires_at <= now]
+        if flight_id is not None:
+            expired.append(FlightSeat.flight_id == flight_id)
+        
+        released = 0
+        while True:
+            batch = db.select(FlightSeat.id).where(*expired).order_by(
+                FlightSeat.hold_expires_at
+            ).limit(batch_size)
+            rows = db.session.execute(
+                db.delete(FlightSeat).where(FlightSeat.id.in_(batch), *expired).returning(
+                    FlightSeat.flight_id, FlightSeat.seat_number, FlightSeat.seat_class
+                ),
+                execution_options={'synchronize_session': False}
+            ).all()
+            
+            seats_by_flight = {}
+            for row in rows:
+                seats_by_flight.setdefault(row.flight_id, []).append((row.seat_number, row.seat_class))
+            for held_flight_id, seats in seats_by_flight.items():
+                cls._apply_seat_changes(held_flight_id, seats, 'available', 1, held_delta=-1)
+            
+            db.session.commit()
+            released += len(rows)
+            if len(rows) < batch_size:
+                return released
+    
+    @classmethod
+    def refresh_seat_counters(cls):
+        """Recompute every flight's counters from its layout and seat rows, one UPDATE per layout"""
+        def seat_count(*criteria):
+            return db.select(db.func.count(FlightSeat.id)).where(
+                FlightSeat.flight_id == cls.id, *criteria
+            ).scalar_subquery()
+        
+        for layout in AircraftLayout.query.all():
+            plan = layout.plan
+            values = {
+                cls.seats_total: len(plan.seats),
+                cls.seats_available: len(plan.seats) - seat_count(),
+                cls.seats_held: seat_count(FlightSeat.status == 'held')
+            }
+            for seat_class in SEAT_CLASSES:
+                values[getattr(cls, f'{seat_class}_available')] = (
+                    plan.class_totals.get(seat_class, 0) - seat_count(FlightSeat.seat_class == seat_class)
+                )
+            db.session.execute(
+                db.update(cls).where(cls.layout_id == layout.id).values(values),
+                execution_options={'synchronize_session': False}
+            )
+    
+    @classmethod
+    def refresh_day_fares(cls, route_keys):
+        """
+        Recompute the fare calendar rows for (source_norm, destination_norm, day)
+        keys from the flights that still have seats, in the caller's transaction.
+        The lowest fare is the precomputed economy fare search shows (the base
+        price for a flight not priced yet), so refresh fares first.
+        
+        Each row is upserted before its aggregate is read. The upsert locks the
+        row, so concurrent transactions on one route/day take turns and the
+        later one aggregates over the earlier one's committed flights (each
+        statement reads a fresh snapshot under READ COMMITTED). Keys are
+        visited in order so two transactions never lock rows in opposite orders.
+        """
+        insert = dialect_insert(db.session)
+        for source_norm, destination_norm, day in sorted(route_keys):
+            now = datetime.utcnow()
+            # The placeholder values never outlive this transaction
+            stmt = insert(RouteDayFare).values(
+                source_norm=source_norm,
+                destination_norm=destination_norm,
+                day=day,
+                min_fare=0,
+                flight_count=0,
+                updated_at=now
+            )
+            db.session.execute(stmt.on_conflict_do_update(
+                index_elements=['source_norm', 'destination_norm', 'day'],
+                set_={'updated_at': now}
+            ))
+            
+            min_fare, flight_count = db.session.execute(
+                db.select(db.func.min(db.func.coalesce(FlightFare.fare, cls.price)), db.func.count(cls.id)).outerjoin(
+                    FlightFare,
+                    (FlightFare.flight_id == cls.id) & (FlightFare.seat_class == 'economy')
+                ).where(
+                    cls.source_norm == source_norm,
+                    cls.destination_norm == destination_norm,
+                    *cls.departing_on(day),
+                    cls.seats_available > 0
+                )
+            ).one()
+            
+            key = (
+                RouteDayFare.source_norm == source_norm,
+                RouteDayFare.destination_norm == destination_norm,
+                RouteDayFare.day == day
+            )
+            if not flight_count:
+                db.session.execute(db.delete(RouteDayFare).where(*key), execution_options={'synchronize_session': False})
+                continue
+            
+            db.session.execute(
+                db.update(RouteDayFare).where(*key).values(
+                    min_fare=min_fare,
+                    flight_count=flight_count,
+                    updated_at=now
+                ),
+                execution_options={'synchronize_session': False}
+            )
+    
+    @classmethod
+    def with_fares(cls, query):
+        """Add each flight's precomputed economy FlightFare (or None) to a Flight query's rows"""
+        return query.outerjoin(
+            FlightFare,
+            (FlightFare.flight_id == cls.id) & (FlightFare.seat_class == 'economy')
+        ).add_entity(FlightFare)
+    
+    @staticmethod
+    def fare_records(rows, now=None):
+        """
+        Summary records, each with its economy 'fare', for (Flight, FlightFare)
+        rows from with_fares(). Only flights without a current fare row are
+        priced here, in one batch.
+        """
+        now = now or datetime.utcnow()
+        rows = list(rows)
+        stale = [flight for flight, fare in rows if fare is None or not fare.is_current(now)]
+        repriced = dict(zip(stale, price_flights(stale, now=now)))
+        
+        records = []
+        for flight, fare in rows:
+            record = flight.to_summary_dict()
+            record['fare'] = repriced[flight] if flight in repriced else fare.fare
+            records.append(record)
+        return records
+    
+    def current_fare(self, seat_class='economy', now=None):
+        """Precomputed fare for a cabin, priced on the spot if the row is missing or its bucket has moved on"""
+        fare = FlightFare.query.filter_by(flight_id=self.id, seat_class=seat_class).first()
+        if fare is not None and fare.is_current(now):
+            return fare.fare
+        return price_flights([self], seat_class, now)[0]
+    
+    @classmethod
+    def refresh_fares(cls, flight_ids, now=None):
+        """
+        Reprice every cabin of the given flights into flight_fares, one
+        batch pricing pass per chunk of flights, in the caller's transaction.
+        
+        Rows are upserted on (flight_id, seat_class), so a sweep and a booking
+        repricing the same flight both succeed and the later one wins. The
+        flights' routes are recorded so their search records, which carry the
+        economy fare, are dropped on commit.
+        """
+        now = now or datetime.utcnow()
+        flight_ids = sorted(flight_ids)  # Rows are locked in id order
+        upsert = dialect_insert(db.session)(FlightFare)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=['flight_id', 'seat_class'],
+            set_={
+                'fare': upsert.excluded.fare,
+                'reprice_at': upsert.excluded.reprice_at,
+                'updated_at': upsert.excluded.updated_at
+            }
+        )
+        routes = db.session.info.setdefault('repriced_routes', set())
+        for start in range(0, len(flight_ids), 500):
+            chunk = flight_ids[start:start + 500]
+            flights = db.session.execute(
+                db.select(
+                    cls.id, cls.price, cls.seats_total, cls.seats_available,
+                    cls.departure_time, cls.source_norm, cls.destination_norm
+                ).where(cls.id.in_(chunk)).order_by(cls.id)
+            ).all()
+            if not flights:
+                continue
+            routes.update((flight.source_norm, flight.destination_norm, flight.departure_time.date()) for flight in flights)
+            
+            cabins = [(flight, seat_class) for flight in flights for seat_class in SEAT_CLASSES]
+            fares = price_flights([flight for flight, _ in cabins], [seat_class for _, seat_class in cabins], now)
+            db.session.execute(upsert, [
+                {
+                    'flight_id': flight.id,
+                    'seat_class': seat_class,
+                    'fare': fare,
+                    'reprice_at': next_reprice_at(flight.departure_time, now),
+                    'updated_at': now
+                }
+                for (flight, seat_class), fare in zip(cabins, fares)
+            ])
+    
+    @classmethod
+    def reprice_due_fares(cls, batch_size=500, now=None):
+        """
+        Reprice the flights whose fares have moved to another last-minute
+        bucket, found on the reprice_at index, committing each batch.
+        Flights still in their bucket are not read.
+        Returns the number of flights repriced.
+        """
+        now = now or datetime.utcnow()
+        repriced = 0
+        while True:
+            flight_ids = db.session.execute(
+                db.select(FlightFare.flight_id).where(FlightFare.reprice_at < now).distinct().limit(batch_size)
+            ).scalars().all()
+            if flight_ids:
+                cls.refresh_fares(flight_ids, now)
+            db.session.commit()
+            repriced += len(flight_ids)
+            if len(flight_ids) < batch_size:
+                return repriced
     
     def book_seat(self, seat_number):
-        if seat_number in self.seats and self.seats[seat_number]['status'] == 'available':
-            self.seats[seat_number]['status'] = 'booked'
+        if self.claim_seat(seat_number):
             db.session.commit()
             return True
-        return False
\ No newline at end of file
+        db.session.rollback()
+        return False
+
+@event.listens_for(Session, 'before_flush')
+def _track_route_changes(session, flush_context, instances):
+    # Flights written in this transaction; their index keys are dropped on commit
+    keys = session.info.setdefault('route_keys', set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Flight):
+            keys.update(obj._route_keys())
+    # New and edited flights are repriced on commit, once they have ids
+    session.info.setdefault('priced_flights', set()).update(
+        obj for obj in chain(session.new, session.dirty) if isinstance(obj, Flight)
+    )
+
+@event.listens_for(Session, 'before_commit')
+def _refresh_fare_calendar(session):
+    # Flush first so the route keys of pending flight writes are known
+    session.flush()
+    flight_ids = {flight.id for flight in session.info.pop('priced_flights', ()) if flight.id is not None}
+    flight_ids |= session.info.pop('fare_flights', set())
+    if flight_ids:
+        Flight.refresh_fares(flight_ids)
+    
+    # The calendar reads the fares, so it goes after them and covers every repriced route
+    keys = session.info.get('route_keys', set()) | session.info.pop('fare_keys', set())
+    keys |= session.info.get('repriced_routes', set())
+    if keys:
+        Flight.refresh_day_fares(keys)
+
+@event.listens_for(Session, 'after_commit')
+def _publish_seat_events(session):
+    # Repriced flights' records carry a stale fare, so their routes are dropped too
+    route_keys = session.info.pop('route_keys', set()) | session.info.pop('repriced_routes', set())
+    messages = session.info.pop('seat_events', [])
+    
+    extensions = current_app.extensions if has_app_context() else {}
+    index = extensions.get('flight_index')
+    if index is not None:
+        if route_keys:
+            index.invalidate(route_keys)
+        for flight_id, _, message in messages:
+            index.update_availability(flight_id, {
+                'seat_version': message['version'],
+                'available_seats': message['availability']['total'],
+                'available_by_class': message['availability']
+            })
+    
+    # Cached search results also filter and price on availability, so drop them
+    cache = extensions.get('search_cache')
+    if cache is not None:
+        cache.invalidate(route_keys | {route_key for _, route_key, _ in messages})
+    
+    for flight_id, _, message in messages:
+        seat_events.publish(flight_id, message)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_seat_events(session):
+    session.info.pop('seat_events', None)
+    session.info.pop('route_keys', None)
+    session.info.pop('fare_keys', None)
+    session.info.pop('priced_flights', None)
+    session.info.pop('fare_flights', None)
+    session.info.pop('repriced_routes', None)
@@ -0,0 +1,29 @@
+from app.extensions import db
+from datetime import datetime
+
+class FlightFare(db.Model):
+    # Current dynamic fare per cabin for each flight, kept up to date by Flight's commit hooks
+    # and the fare bucket sweep (sweep_fares.py)
+    __tablename__ = 'flight_fares'
+    __table_args__ = (
+        db.UniqueConstraint('flight_id', 'seat_class', name='uq_flight_fares_flight_class'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    flight_id = db.Column(db.Integer, db.ForeignKey('flights.id', ondelete='CASCADE'), nullable=False)
+    seat_class = db.Column(db.String(20), nullable=False)
+    fare = db.Column(db.Float, nullable=False)
+    # Next last-minute bucket boundary; the sweep reprices rows once it has passed (null in the last bucket)
+    reprice_at = db.Column(db.DateTime, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def is_current(self, now=None):
+        """False once the fare's time-to-departure bucket has moved on"""
+        return self.reprice_at is None or self.reprice_at >= (now or datetime.utcnow())
+    
+    def to_dict(self):
+        return {
+            'seat_class': self.seat_class,
+            'fare': self.fare,
+            'reprice_at': self.reprice_at.isoformat() if self.reprice_at else None
+        }
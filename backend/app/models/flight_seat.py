@@ -0,0 +1,29 @@
+from app.extensions import db
+from datetime import datetime
+
+class FlightSeat(db.Model):
+    # One row per seat that is not available; free seats come from the flight's layout
+    __tablename__ = 'flight_seats'
+    __table_args__ = (
+        db.UniqueConstraint('flight_id', 'seat_number', name='uq_flight_seats_flight_seat'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    flight_id = db.Column(db.Integer, db.ForeignKey('flights.id', ondelete='CASCADE'), nullable=False, index=True)
+    seat_number = db.Column(db.String(10), nullable=False)
+    seat_class = db.Column(db.String(20), nullable=False, default='economy')
+    status = db.Column(db.String(20), nullable=False, default='available')
+    holder = db.Column(db.String(200))  # Passenger name while the seat is booked
+    hold_token = db.Column(db.String(64), index=True)  # Set while the seat is held
+    hold_expires_at = db.Column(db.DateTime, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        # Same shape as the entries of the old Flight.seats JSON blob
+        result = {
+            'status': self.status,
+            'type': self.seat_class
+        }
+        if self.holder:
+            result['passenger'] = self.holder
+        return result
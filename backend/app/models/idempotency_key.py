@@ -0,0 +1,43 @@
+from app.extensions import db
+from datetime import datetime, timedelta
+
+class IdempotencyKey(db.Model):
+    # A request sent with an Idempotency-Key, claimed in the same transaction as the
+    # write it makes, and its stored response once it has finished (app.utils.idempotency)
+    __tablename__ = 'idempotency_keys'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'method', 'path', 'key', name='uq_idempotency_keys_request'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    method = db.Column(db.String(10), nullable=False)
+    path = db.Column(db.String(255), nullable=False)
+    key = db.Column(db.String(255), nullable=False)
+    fingerprint = db.Column(db.String(64), nullable=False)  # SHA-256 of the request body
+    # Null while the first request is still running
+    status_code = db.Column(db.Integer)
+    response_body = db.Column(db.Text)
+    mimetype = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    
+    @classmethod
+    def purge_expired(cls, ttl_seconds, batch_size=500, now=None):
+        """
+        Delete keys older than ttl_seconds, in batches walked along the
+        created_at index, committing each batch. No request runs for a whole
+        TTL, so rows still marked running by then were left by a crashed worker.
+        Returns the number of keys deleted.
+        """
+        cutoff = (now or datetime.utcnow()) - timedelta(seconds=ttl_seconds)
+        purged = 0
+        while True:
+            batch = db.select(cls.id).where(cls.created_at < cutoff).order_by(cls.created_at).limit(batch_size)
+            deleted = db.session.execute(
+                db.delete(cls).where(cls.id.in_(batch)),
+                execution_options={'synchronize_session': False}
+            ).rowcount
+            db.session.commit()
+            purged += deleted
+            if deleted < batch_size:
+                return purged
@@ -0,0 +1,24 @@
+from app.extensions import db
+from datetime import datetime
+
+class RouteDayFare(db.Model):
+    # Lowest fare and flight count per route per day, kept up to date by Flight's commit hooks
+    __tablename__ = 'route_day_fares'
+    __table_args__ = (
+        db.UniqueConstraint('source_norm', 'destination_norm', 'day', name='uq_route_day_fares_route_day'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    source_norm = db.Column(db.String(100), nullable=False)
+    destination_norm = db.Column(db.String(100), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    min_fare = db.Column(db.Float, nullable=False)  # Cheapest economy fare (flight_fares) among flights with seats left
+    flight_count = db.Column(db.Integer, nullable=False)  # Flights with seats left
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'date': self.day.isoformat(),
+            'min_fare': self.min_fare,
+            'flights': self.flight_count
+        }
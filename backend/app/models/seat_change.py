@@ -0,0 +1,28 @@
+from app.extensions import db
+from datetime import datetime
+
+class SeatChange(db.Model):
+    # Bounded per-flight log of seat changes, read by polling clients via ?since=<version>
+    __tablename__ = 'seat_changes'
+    __table_args__ = (
+        db.Index('ix_seat_changes_flight_version', 'flight_id', 'version'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    flight_id = db.Column(db.Integer, db.ForeignKey('flights.id', ondelete='CASCADE'), nullable=False)
+    version = db.Column(db.Integer, nullable=False)  # flights.seat_version after this change
+    seat_number = db.Column(db.String(10), nullable=False)
+    seat_class = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    holder = db.Column(db.String(200))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        # Same shape as a Flight.seats entry
+        result = {
+            'status': self.status,
+            'type': self.seat_class
+        }
+        if self.holder:
+            result['passenger'] = self.holder
+        return result
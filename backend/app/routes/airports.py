@@ -0,0 +1,25 @@
+from flask import Blueprint, request, jsonify, current_app
+
+airports_bp = Blueprint('airports', __name__)
+
+@airports_bp.route('/suggest', methods=['GET'])
+def suggest_airports():
+    """Autocomplete cities and airports by code, city, airport name or alias prefix"""
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'q is required'}), 400
+        
+        limit = request.args.get('limit', 8, type=int)
+        if limit < 1 or limit > 20:
+            return jsonify({'error': 'limit must be between 1 and 20'}), 400
+        
+        airports = current_app.extensions['airports'].suggest(query, limit)
+        
+        return jsonify({
+            'airports': airports,
+            'count': len(airports)
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
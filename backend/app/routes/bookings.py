@@ -1,9 +1,15 @@
 from flask import Blueprint, request, jsonify
 from app.models.booking import Booking
+from app.models.booking_passenger import BookingPassenger
 from app.models.flight import Flight
 from app.extensions import db
+from app.utils.pagination import InvalidCursor, approximate_count, keyset_page
+from app.utils.fare_quotes import InvalidQuote, quote_for_booking, quote_used
+from app.utils.dynamic_pricing import price_seats
+from app.utils.idempotency import idempotent
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from marshmallow import Schema, fields, ValidationError, EXCLUDE
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError, EXCLUDE
+from sqlalchemy.exc import IntegrityError
 import random
 
 bookings_bp = Blueprint('bookings', __name__)
@@ -19,9 +25,12 @@ class BookingSchema(Schema):
     flight_id = fields.Str(required=True)
     passenger_name = fields.Str(required=True)
     seat_number = fields.Str(required=True)
+    hold_token = fields.Str(missing=None)
+    quote_id = fields.Str(missing=None)
 
 @bookings_bp.route('', methods=['POST'])
 @jwt_required()
+@idempotent
 def create_booking():
     """Create new booking"""
     print("\n" + "="*50)
@@ -68,22 +77,39 @@ def create_booking():
         
         print(f"✅ Flight found: {flight.flight_id}")
         
-        # Check seat availability
+        # A fare quote fixes the price; without one the seat is priced now
         seat = data['seat_number']
-        print(f"🪑 Checking seat: {seat}")
-        
-        if seat not in flight.seats:
-            print(f"❌ Seat {seat} does not exist in flight.seats")
-            print(f"Available seats: {list(flight.seats.keys())[:10]}")
-            return jsonify({'error': f'Seat {seat} does not exist'}), 400
-        
-        print(f"✅ Seat exists: {flight.seats[seat]}")
+        if data['quote_id']:
+            try:
+                total_price = quote_for_booking(data['quote_id'], flight, [seat]).total_price
+            except InvalidQuote as e:
+                return jsonify({'error': str(e)}), 400
+        else:
+            total_price = price_seats(flight, [seat])
+        
+        # Convert a live hold with one conditional UPDATE of its seat row, or
+        # claim the seat by inserting its row (the unique seat key rejects a
+        # taken seat) plus one counter UPDATE; only look the seat up again to
+        # explain a failure
+        print(f"🪑 Claiming seat: {seat}")
+        
+        if data['hold_token']:
+            # The hold already reserved the seat, so just convert it
+            if not flight.book_held_seats({seat: data['passenger_name']}, data['hold_token']):
+                db.session.rollback()
+                print(f"❌ No live hold on seat {seat}")
+                return jsonify({'error': 'Seat hold has expired or is invalid'}), 400
+        elif not flight.claim_seat(seat, holder=data['passenger_name']):
+            db.session.rollback()
+            seat_row = flight.get_seat(seat)
+            if not seat_row:
+                print(f"❌ Seat {seat} does not exist on flight {flight.flight_id}")
+                return jsonify({'error': f'Seat {seat} does not exist'}), 400
             
-        if flight.seats[seat]['status'] != 'available':
-            print(f"❌ Seat {seat} status is: {flight.seats[seat]['status']}")
+            print(f"❌ Seat {seat} status is: {seat_row.status}")
             return jsonify({'error': f'Seat {seat} is not available'}), 400
         
-        print("✅ Seat is available")
+        print("✅ Seat claimed")
         
         # Generate PNR
         pnr = f"PNR{random.randint(100000, 999999)}"
@@ -93,23 +119,30 @@ def create_booking():
         booking = Booking(
             pnr=pnr,
             user_id=user_id_int,
-            flight_id=data['flight_id'],
+            flight_id=flight.id,
             passenger_name=data['passenger_name'],
             seat_number=seat,
             status='confirmed',
-            payment_status='completed'
+            payment_status='completed',
+            total_price=total_price,
+            quote_id=data['quote_id']
         )
+        booking.passengers.append(BookingPassenger(
+            passenger_name=data['passenger_name'],
+            seat_number=seat
+        ))
         
         print("✅ Booking object created")
         
-        # Update seat status
-        flight.seats[seat]['status'] = 'booked'
-        flight.seats = flight.seats.copy()  # Trigger update
-        
-        print("✅ Seat marked as booked")
-        
         db.session.add(booking)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            # A concurrent booking paid with the same quote first
+            if data['quote_id'] and quote_used(data['quote_id']):
+                return jsonify({'error': 'Fare quote has already been used'}), 400
+            raise
         
         print(f"✅ Database committed successfully")
         print(f"🎉 BOOKING SUCCESSFUL: {pnr}")
@@ -128,6 +161,111 @@ def create_booking():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+class GroupPassengerSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE
+    
+    passenger_name = fields.Str(required=True, validate=validate.Length(min=2, max=200))
+    seat_number = fields.Str(required=True)
+
+class GroupBookingSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE
+    
+    flight_id = fields.Str(required=True)
+    passengers = fields.List(
+        fields.Nested(GroupPassengerSchema),
+        required=True,
+        validate=validate.Length(min=1, max=9)
+    )
+    hold_token = fields.Str(missing=None)
+    quote_id = fields.Str(missing=None)
+    
+    @validates_schema
+    def validate_unique_seats(self, data, **kwargs):
+        seats = [passenger['seat_number'] for passenger in data.get('passengers', [])]
+        if len(seats) != len(set(seats)):
+            raise ValidationError('Each passenger needs a different seat', 'passengers')
+
+@bookings_bp.route('/group', methods=['POST'])
+@jwt_required()
+@idempotent
+def create_group_booking():
+    """Book several passengers on one PNR in a single transaction"""
+    try:
+        user_id = get_jwt_identity()
+        # Convert to int to match database
+        user_id_int = int(user_id) if isinstance(user_id, str) else user_id
+        
+        schema = GroupBookingSchema()
+        try:
+            data = schema.load(request.json or {})
+        except ValidationError as ve:
+            return jsonify({'error': ve.messages}), 422
+        
+        flight = Flight.query.filter_by(flight_id=data['flight_id']).first()
+        if not flight:
+            return jsonify({'error': 'Flight not found'}), 404
+        
+        holders = {p['seat_number']: p['passenger_name'] for p in data['passengers']}
+        
+        # A fare quote fixes the price; without one the seats are priced now
+        if data['quote_id']:
+            try:
+                total_price = quote_for_booking(data['quote_id'], flight, list(holders)).total_price
+            except InvalidQuote as e:
+                return jsonify({'error': str(e)}), 400
+        else:
+            total_price = price_seats(flight, list(holders))
+        
+        # Held seats are converted by one conditional UPDATE, free seats claimed by
+        # one INSERT of their rows plus a counter UPDATE; any miss rolls back the lot
+        if data['hold_token']:
+            claimed = flight.book_held_seats(holders, data['hold_token'])
+        else:
+            claimed = flight.claim_seats(holders)
+        
+        if not claimed:
+            db.session.rollback()
+            return jsonify({'error': 'One or more seats are not available'}), 400
+        
+        lead = data['passengers'][0]
+        booking = Booking(
+            pnr=f"PNR{random.randint(100000, 999999)}",
+            user_id=user_id_int,
+            flight_id=flight.id,
+            passenger_name=lead['passenger_name'],
+            seat_number=lead['seat_number'],
+            status='confirmed',
+            payment_status='completed',
+            total_price=total_price,
+            quote_id=data['quote_id']
+        )
+        for passenger in data['passengers']:
+            booking.passengers.append(BookingPassenger(
+                passenger_name=passenger['passenger_name'],
+                seat_number=passenger['seat_number']
+            ))
+        
+        db.session.add(booking)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            # A concurrent booking paid with the same quote first
+            if data['quote_id'] and quote_used(data['quote_id']):
+                return jsonify({'error': 'Fare quote has already been used'}), 400
+            raise
+        
+        return jsonify({
+            'message': 'Booking created successfully',
+            'booking': booking.to_dict()
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @bookings_bp.route('', methods=['GET'])
 @jwt_required()
 def get_bookings():
@@ -137,13 +275,31 @@ def get_bookings():
         # Convert to int to match database
         user_id_int = int(user_id) if isinstance(user_id, str) else user_id
         
-        bookings = Booking.query.filter_by(user_id=user_id_int).order_by(
-            Booking.booking_date.desc()
-        ).all()
+        limit = request.args.get('limit', 50, type=int)
+        if limit < 1 or limit > 100:
+            return jsonify({'error': 'limit must be between 1 and 100'}), 400
         
-        return jsonify({
-            'bookings': [booking.to_dict() for booking in bookings]
-        }), 200
+        # Newest first, paged on (booking_date, id) with an opaque cursor
+        query = Booking.query.filter_by(user_id=user_id_int)
+        try:
+            bookings, next_cursor = keyset_page(
+                Booking.with_details().filter_by(user_id=user_id_int),
+                (Booking.booking_date, Booking.id),
+                cursor=request.args.get('cursor'),
+                limit=limit,
+                descending=True
+            )
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        
+        result = {
+            'bookings': [booking.to_dict() for booking in bookings],
+            'next_cursor': next_cursor
+        }
+        if request.args.get('include_total', '').lower() == 'true':
+            result['total'], result['total_is_estimate'] = approximate_count(query)
+        
+        return jsonify(result), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -169,6 +325,7 @@ def get_booking(pnr):
 
 @bookings_bp.route('/<string:pnr>/cancel', methods=['PUT'])
 @jwt_required()
+@idempotent
 def cancel_booking(pnr):
     """Cancel booking"""
     try:
@@ -187,11 +344,9 @@ def cancel_booking(pnr):
         # Update booking status
         booking.status = 'cancelled'
         
-        # Free up the seat
-        flight = Flight.query.filter_by(flight_id=booking.flight_id).first()
-        if flight:
-            flight.seats[booking.seat_number]['status'] = 'available'
-            flight.seats = flight.seats.copy()
+        # Free up every seat on the PNR in one update
+        if booking.flight:
+            booking.flight.release_seats(booking.seat_numbers())
         
         db.session.commit()
         
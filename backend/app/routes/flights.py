@@ -1,8 +1,15 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, current_app
 from app.models.flight import Flight
-from app.extensions import db
+from app.models.aircraft_layout import AircraftLayout
+from app.models.route_day_fare import RouteDayFare
+from app.extensions import db, seat_events
+from app.utils.dynamic_pricing import fare_lifetime
+from app.utils.search_cache import cached_search
+from app.utils.search_options import SearchOptions
+from app.utils.pagination import InvalidCursor, approximate_count, keyset_page
+from app.utils.connections import ConnectionGraph, SORT_KEYS, cheapest_round_trips
 from flask_jwt_extended import jwt_required, get_jwt
-from datetime import datetime
+from datetime import datetime, timedelta
 from marshmallow import Schema, fields, ValidationError
 
 flights_bp = Blueprint('flights', __name__)
@@ -21,6 +28,40 @@ def admin_required():
         return jsonify({'error': 'Admin access required'}), 403
     return None
 
+def search_route(source, destination, day, passengers, options=None):
+    """
+    Search records for flights on a route and day with enough free seats.
+    Queries flights (case insensitive) through the route/departure index;
+    records carry availability counts and the precomputed economy fare but no
+    seat map, see get_flight for that.
+    options (SearchOptions) sorts, filters and limits the results.
+    """
+    route_key = Flight.route_key(source, destination, day)
+    
+    if not current_app.config['FLIGHT_INDEX_ENABLED']:
+        # No in-memory copy of the route, so let the database filter, sort and limit
+        options = options or SearchOptions()
+        
+        def load_query():
+            query = Flight.with_fares(Flight.route_query(source, destination, day)).filter(Flight.seats_available >= passengers)
+            records = Flight.fare_records(options.apply_to_query(query, day))
+            return options.apply_to_records(records, day, presorted=options.sort not in ('duration', 'price'))
+        
+        return cached_search((*route_key, 'route', passengers, *options.key()), load_query)
+    
+    def load_route():
+        return Flight.fare_records(Flight.with_fares(Flight.route_query(source, destination, day)))
+    
+    def load_results():
+        # Served from memory once the route/date has been loaded
+        records = current_app.extensions['flight_index'].search(route_key, load_route, fare_lifetime)
+        return [record for record in records if record['available_seats'] >= passengers]
+    
+    records = cached_search((*route_key, 'route', passengers), load_results)
+    if options is None:
+        return records
+    return options.apply_to_records(records, day, presorted=options.sort == 'departure')
+
 @flights_bp.route('/search', methods=['GET'])
 def search_flights():
     """Search for flights"""
@@ -40,21 +81,16 @@ def search_flights():
         except ValueError:
             return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
         
-        # Query flights (case insensitive)
-        query = Flight.query.filter(
-            db.func.lower(Flight.source) == source.lower(),
-            db.func.lower(Flight.destination) == destination.lower(),
-            db.func.date(Flight.departure_time) == date_obj.date()
-        )
+        passengers = request.args.get('passengers', 1, type=int)
+        if passengers < 1 or passengers > 9:
+            return jsonify({'error': 'passengers must be between 1 and 9'}), 400
         
-        flights = query.all()
+        try:
+            options = SearchOptions.from_args(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Add available seats count to each flight
-        flights_data = []
-        for flight in flights:
-            flight_dict = flight.to_dict()
-            flight_dict['available_seats'] = len(flight.get_available_seats())
-            flights_data.append(flight_dict)
+        flights_data = search_route(source, destination, date_obj.date(), passengers, options)
         
         return jsonify({
             'flights': flights_data,
@@ -64,13 +100,138 @@ def search_flights():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@flights_bp.route('/search/roundtrip', methods=['GET'])
+def search_round_trip():
+    """Search outbound and return flights together and pair them up"""
+    try:
+        source = request.args.get('source', '').strip()
+        destination = request.args.get('destination', '').strip()
+        date = request.args.get('date', '').strip()
+        return_date = request.args.get('return_date', '').strip()
+        
+        if not source or not destination or not date or not return_date:
+            return jsonify({
+                'error': 'Source, destination, date, and return_date are required'
+            }), 400
+        
+        try:
+            outbound_day = datetime.fromisoformat(date).date()
+            return_day = datetime.fromisoformat(return_date).date()
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        
+        if return_day < outbound_day:
+            return jsonify({'error': 'return_date cannot be before date'}), 400
+        
+        passengers = request.args.get('passengers', 1, type=int)
+        if passengers < 1 or passengers > 9:
+            return jsonify({'error': 'passengers must be between 1 and 9'}), 400
+        
+        limit = request.args.get('limit', 10, type=int)
+        if limit < 1 or limit > 50:
+            return jsonify({'error': 'limit must be between 1 and 50'}), 400
+        
+        # Each leg is its own route/date key, so both are usually answered
+        # from the search cache or route index without touching the database
+        outbound = search_route(source, destination, outbound_day, passengers)
+        inbound = search_route(destination, source, return_day, passengers)
+        
+        return jsonify({
+            'outbound': {'flights': outbound, 'count': len(outbound)},
+            'return': {'flights': inbound, 'count': len(inbound)},
+            'pairings': [{
+                'outbound_id': outbound_record['flight_id'],
+                'return_id': return_record['flight_id'],
+                'total_price': round(outbound_record['fare'] + return_record['fare'], 2)
+            } for outbound_record, return_record in cheapest_round_trips(outbound, inbound, limit)]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@flights_bp.route('/search/connections', methods=['GET'])
+def search_connections():
+    """Search for one-stop itineraries (two flights through a hub)"""
+    try:
+        source = request.args.get('source', '').strip()
+        destination = request.args.get('destination', '').strip()
+        date = request.args.get('date', '').strip()
+        
+        if not source or not destination or not date:
+            return jsonify({
+                'error': 'Source, destination, and date are required'
+            }), 400
+        
+        try:
+            date_obj = datetime.fromisoformat(date)
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        
+        passengers = request.args.get('passengers', 1, type=int)
+        if passengers < 1 or passengers > 9:
+            return jsonify({'error': 'passengers must be between 1 and 9'}), 400
+        
+        sort = request.args.get('sort', 'price')
+        if sort not in SORT_KEYS:
+            return jsonify({'error': f"sort must be one of: {', '.join(SORT_KEYS)}"}), 400
+        
+        limit = request.args.get('limit', 10, type=int)
+        if limit < 1 or limit > 50:
+            return jsonify({'error': 'limit must be between 1 and 50'}), 400
+        
+        min_layover = request.args.get('min_layover', current_app.config['CONNECTION_MIN_LAYOVER_MINUTES'], type=int)
+        max_layover = request.args.get('max_layover', current_app.config['CONNECTION_MAX_LAYOVER_MINUTES'], type=int)
+        if min_layover < 0 or max_layover < min_layover:
+            return jsonify({'error': 'Layover window must satisfy 0 <= min_layover <= max_layover'}), 400
+        
+        # Only the flights that can be a leg: departures from the origin on the
+        # day and arrivals at the destination in their connection window
+        day_start = datetime.combine(date_obj.date(), datetime.min.time())
+        day_end = day_start + timedelta(days=1)
+        source_norm = Flight.normalize_city(source)
+        destination_norm = Flight.normalize_city(destination)
+        min_layover = timedelta(minutes=min_layover)
+        max_layover = timedelta(minutes=max_layover)
+        graph = ConnectionGraph(Flight.connection_legs(
+            source_norm, destination_norm, day_start, day_end, min_layover, max_layover, passengers
+        ))
+        itineraries = graph.find(
+            source_norm,
+            destination_norm,
+            day_start,
+            day_end - timedelta(microseconds=1),
+            min_layover,
+            max_layover,
+            seats=passengers,
+            sort=sort,
+            limit=limit
+        )
+        
+        # Full rows only for the flights in the results, in one query
+        flight_ids = {leg.flight for itinerary in itineraries for leg in itinerary}
+        flights = {flight.id: flight for flight in Flight.query.filter(Flight.id.in_(flight_ids))} if flight_ids else {}
+        
+        return jsonify({
+            'itineraries': [{
+                'via': flights[itinerary.first.flight].destination,
+                'legs': [flights[leg.flight].to_summary_dict() for leg in itinerary],
+                'total_price': itinerary.price,
+                'total_duration_minutes': int(itinerary.duration.total_seconds() // 60),
+                'layover_minutes': int(itinerary.layover.total_seconds() // 60)
+            } for itinerary in itineraries],
+            'count': len(itineraries)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @flights_bp.route('', methods=['GET'])
 def get_flights():
     """Get all flights with optional filters"""
     try:
         # Get query parameters
-        source = request.args.get('source', '').lower()
-        destination = request.args.get('destination', '').lower()
+        source = Flight.normalize_city(request.args.get('source', ''))
+        destination = Flight.normalize_city(request.args.get('destination', ''))
         date = request.args.get('date')
         
         # Base query
@@ -78,22 +239,91 @@ def get_flights():
         
         # Apply filters
         if source:
-            query = query.filter(db.func.lower(Flight.source) == source)
+            query = query.filter(Flight.source_norm == source)
         if destination:
-            query = query.filter(db.func.lower(Flight.destination) == destination)
+            query = query.filter(Flight.destination_norm == destination)
         if date:
             date_obj = datetime.fromisoformat(date)
-            query = query.filter(db.func.date(Flight.departure_time) == date_obj.date())
+            query = query.filter(*Flight.departing_on(date_obj.date()))
+        
+        limit = request.args.get('limit', 50, type=int)
+        if limit < 1 or limit > 100:
+            return jsonify({'error': 'limit must be between 1 and 100'}), 400
         
-        flights = query.all()
+        # Keyset pagination on (departure_time, id): deep pages cost the same as the first
+        try:
+            flights, next_cursor = keyset_page(
+                query,
+                (Flight.departure_time, Flight.id),
+                cursor=request.args.get('cursor'),
+                limit=limit
+            )
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        
+        result = {
+            'flights': [flight.to_summary_dict() for flight in flights],
+            'next_cursor': next_cursor
+        }
+        if request.args.get('include_total', '').lower() == 'true':
+            result['total'], result['total_is_estimate'] = approximate_count(query)
+        
+        return jsonify(result), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@flights_bp.route('/calendar', methods=['GET'])
+def get_fare_calendar():
+    """Lowest fare and number of flights for each day of a month on a route"""
+    try:
+        source = request.args.get('source', '').strip()
+        destination = request.args.get('destination', '').strip()
+        month = request.args.get('month', '').strip()
+        
+        if not source or not destination or not month:
+            return jsonify({
+                'error': 'Source, destination, and month are required'
+            }), 400
+        
+        try:
+            first_day = datetime.strptime(month, '%Y-%m').date()
+        except ValueError:
+            return jsonify({'error': 'Invalid month format. Use YYYY-MM'}), 400
+        next_month = (first_day.replace(day=28) + timedelta(days=4)).replace(day=1)
+        
+        # One range read on the (source_norm, destination_norm, day) unique index
+        fares = RouteDayFare.query.filter(
+            RouteDayFare.source_norm == Flight.normalize_city(source),
+            RouteDayFare.destination_norm == Flight.normalize_city(destination),
+            RouteDayFare.day >= first_day,
+            RouteDayFare.day < next_month
+        ).order_by(RouteDayFare.day).all()
         
         return jsonify({
-            'flights': [flight.to_dict() for flight in flights]
+            'source': source,
+            'destination': destination,
+            'month': first_day.strftime('%Y-%m'),
+            'days': [fare.to_dict() for fare in fares]
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@flights_bp.route('/index/stats', methods=['GET'])
+@jwt_required()
+def get_index_stats():
+    """Hit/miss counters of the in-memory search index and result cache (Admin only)"""
+    error_response = admin_required()
+    if error_response:
+        return error_response
+    
+    index_stats = current_app.extensions['flight_index'].stats()
+    index_stats['enabled'] = current_app.config['FLIGHT_INDEX_ENABLED']
+    cache_stats = current_app.extensions['search_cache'].stats()
+    cache_stats['enabled'] = current_app.config['SEARCH_CACHE_ENABLED']
+    return jsonify({'index': index_stats, 'cache': cache_stats}), 200
+
 @flights_bp.route('/<string:flight_id>', methods=['GET'])
 def get_flight(flight_id):
     """Get single flight by ID"""
@@ -104,7 +334,8 @@ def get_flight(flight_id):
             return jsonify({'error': 'Flight not found'}), 404
         
         flight_dict = flight.to_dict()
-        flight_dict['available_seats'] = len(flight.get_available_seats())
+        flight_dict['available_seats'] = flight.seats_available
+        flight_dict['available_by_class'] = flight.availability()
         
         return jsonify({'flight': flight_dict}), 200
         
@@ -113,13 +344,38 @@ def get_flight(flight_id):
 
 @flights_bp.route('/<string:flight_id>/seats', methods=['GET'])
 def get_available_seats(flight_id):
-    """Get available seats for a flight"""
+    """
+    Get available seats for a flight. With ?since=<seat_version> only the
+    seats changed after that version are returned, or 304 if none changed.
+    """
     try:
         flight = Flight.query.filter_by(flight_id=flight_id).first()
         
         if not flight:
             return jsonify({'error': 'Flight not found'}), 404
         
+        since = request.args.get('since', type=int)
+        if since is not None:
+            if since == flight.seat_version:
+                return '', 304
+            
+            changes = flight.seat_changes_since(since)
+            if changes is None:
+                # Too old for the change log: send the whole map once
+                return jsonify({
+                    'flight_id': flight_id,
+                    'version': flight.seat_version,
+                    'full': True,
+                    'seats': flight.seats
+                }), 200
+            
+            return jsonify({
+                'flight_id': flight_id,
+                'version': flight.seat_version,
+                'full': False,
+                'seats': changes
+            }), 200
+        
         available_seats = flight.get_available_seats()
         
         return jsonify({
@@ -131,6 +387,104 @@ def get_available_seats(flight_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@flights_bp.route('/<string:flight_id>/seats/stream', methods=['GET'])
+def stream_seat_changes(flight_id):
+    """
+    Server-Sent Events stream of seat changes (booked, cancelled, held,
+    released) as they are committed. Each event's id is the flight's
+    seat_version; reconnecting with Last-Event-ID replays what was missed.
+    """
+    try:
+        flight = Flight.query.filter_by(flight_id=flight_id).first()
+        
+        if not flight:
+            return jsonify({'error': 'Flight not found'}), 404
+        
+        # Subscribe before reading the version so nothing committed in between is lost
+        subscription = seat_events.subscribe(flight.id)
+        db.session.refresh(flight)
+        current_version = flight.seat_version
+        last_version = request.headers.get('Last-Event-ID', type=int)
+        backlog = None
+        if last_version is not None and last_version != current_version:
+            backlog = flight.seat_changes_since(last_version)
+        keepalive = current_app.config['SEAT_EVENTS_KEEPALIVE_SECONDS']
+        db.session.remove()  # Don't hold a connection for the life of the stream
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    encode = current_app.json.dumps
+    
+    def format_event(kind, version, data):
+        return f"event: {kind}\nid: {version}\ndata: {encode(data)}\n\n"
+    
+    def generate():
+        try:
+            if last_version is None or last_version == current_version:
+                yield format_event('connected', current_version, {'version': current_version})
+            elif backlog is None:
+                # Missed more than the change log holds
+                yield format_event('resync', current_version, {'version': current_version})
+            else:
+                yield format_event('changes', current_version, {'version': current_version, 'seats': backlog})
+            
+            seen_version = current_version
+            while True:
+                message = subscription.get(timeout=keepalive)
+                if subscription.overflowed:
+                    # Events were dropped; the client has to reload the seat map
+                    yield format_event('resync', seen_version, {'version': seen_version})
+                    return
+                if message is None:
+                    yield ': keep-alive\n\n'
+                    continue
+                if message['version'] <= seen_version:
+                    continue
+                seen_version = message['version']
+                yield format_event(message['event'], message['version'], message)
+        finally:
+            subscription.close()
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@flights_bp.route('/<string:flight_id>/seats/adjacent', methods=['GET'])
+def find_adjacent_seats(flight_id):
+    """Auto-assign a block of side-by-side seats for a group"""
+    try:
+        count = request.args.get('count', 2, type=int)
+        seat_class = request.args.get('seat_class') or None
+        
+        if count < 1 or count > 9:
+            return jsonify({'error': 'count must be between 1 and 9'}), 400
+        
+        flight = Flight.query.filter_by(flight_id=flight_id).first()
+        
+        if not flight:
+            return jsonify({'error': 'Flight not found'}), 404
+        
+        bitmap = flight.seat_bitmap()
+        match = bitmap.find_adjacent(count, seat_class) if bitmap else None
+        
+        if not match:
+            return jsonify({'error': f'No {count} adjacent seats available'}), 404
+        
+        row, match_class, seat_numbers = match
+        
+        return jsonify({
+            'flight_id': flight_id,
+            'row': row,
+            'seat_class': match_class,
+            'seat_numbers': seat_numbers,
+            'available_in_class': bitmap.count(match_class)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @flights_bp.route('', methods=['POST'])
 @jwt_required()
 def create_flight():
@@ -148,16 +502,6 @@ def create_flight():
         import random
         flight_id = f"FL{random.randint(100000, 999999)}"
         
-        # Initialize 30 seats (Rows 1-5, Columns A-F)
-        seats = {}
-        for row_num in range(1, 6):  # Rows 1-5
-            for col in ['A', 'B', 'C', 'D', 'E', 'F']:  # Columns A-F
-                seat_id = f"{row_num}{col}"  # Format: 1A, 1B, ..., 5F
-                seats[seat_id] = {
-                    "status": "available",
-                    "type": "economy" if row_num > 2 else "business"  # First 2 rows = business
-                }
-        
         # Create flight
         flight = Flight(
             flight_id=flight_id,
@@ -166,9 +510,9 @@ def create_flight():
             destination=data['destination'],
             departure_time=data['departure_time'],
             arrival_time=data['arrival_time'],
-            price=data['price'],
-            seats=seats
+            price=data['price']
         )
+        flight.apply_layout(AircraftLayout.standard())
         
         db.session.add(flight)
         db.session.commit()
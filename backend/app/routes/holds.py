@@ -0,0 +1,115 @@
+from flask import Blueprint, request, jsonify, current_app
+from app.models.flight import Flight
+from app.models.flight_seat import FlightSeat
+from app.extensions import db
+from flask_jwt_extended import jwt_required
+from marshmallow import Schema, fields, validate, ValidationError, EXCLUDE
+from datetime import datetime, timedelta
+import secrets
+
+holds_bp = Blueprint('holds', __name__)
+
+class SeatHoldSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE  # Ignore extra fields
+    
+    flight_id = fields.Str(required=True)
+    seat_numbers = fields.List(fields.Str(), required=True, validate=validate.Length(min=1, max=9))
+    ttl_minutes = fields.Int(validate=validate.Range(min=1))
+
+@holds_bp.route('', methods=['POST'])
+@jwt_required()
+def create_hold():
+    """Hold seats for a few minutes while the user pays"""
+    try:
+        schema = SeatHoldSchema()
+        data = schema.load(request.json or {})
+        
+        flight = Flight.query.filter_by(flight_id=data['flight_id']).first()
+        if not flight:
+            return jsonify({'error': 'Flight not found'}), 404
+        
+        seat_numbers = list(dict.fromkeys(data['seat_numbers']))
+        ttl_minutes = min(
+            data.get('ttl_minutes', current_app.config['SEAT_HOLD_MINUTES']),
+            current_app.config['SEAT_HOLD_MAX_MINUTES']
+        )
+        hold_token = secrets.token_urlsafe(24)
+        expires_at = datetime.utcnow() + timedelta(minutes=ttl_minutes)
+        
+        if not flight.hold_seats(seat_numbers, hold_token, expires_at):
+            db.session.rollback()
+            # Seats may only be blocked by holds that ran out; free those and retry once
+            if not Flight.release_expired_holds(flight_id=flight.id) or \
+                    not flight.hold_seats(seat_numbers, hold_token, expires_at):
+                db.session.rollback()
+                return jsonify({'error': 'One or more seats are not available'}), 400
+        
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Seats held successfully',
+            'hold': {
+                'hold_token': hold_token,
+                'flight_id': flight.flight_id,
+                'seat_numbers': seat_numbers,
+                'expires_at': expires_at.isoformat()
+            }
+        }), 201
+    
+    except ValidationError as err:
+        return jsonify({'error': err.messages}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@holds_bp.route('/<string:hold_token>', methods=['GET'])
+@jwt_required()
+def get_hold(hold_token):
+    """Get the seats and expiry of a hold"""
+    try:
+        seats = FlightSeat.query.filter(
+            FlightSeat.hold_token == hold_token,
+            FlightSeat.status == 'held',
+            FlightSeat.hold_expires_at > datetime.utcnow()
+        ).all()
+        
+        if not seats:
+            return jsonify({'error': 'Hold not found or expired'}), 404
+        
+        flight = db.session.get(Flight, seats[0].flight_id)
+        
+        return jsonify({
+            'hold': {
+                'hold_token': hold_token,
+                'flight_id': flight.flight_id,
+                'seat_numbers': [seat.seat_number for seat in seats],
+                'expires_at': seats[0].hold_expires_at.isoformat()
+            }
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@holds_bp.route('/<string:hold_token>', methods=['DELETE'])
+@jwt_required()
+def release_hold(hold_token):
+    """Release held seats before the hold expires"""
+    try:
+        seat = FlightSeat.query.filter_by(hold_token=hold_token, status='held').first()
+        
+        if not seat:
+            return jsonify({'error': 'Hold not found or expired'}), 404
+        
+        flight = db.session.get(Flight, seat.flight_id)
+        released = flight.release_hold(hold_token)
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Hold released successfully',
+            'released': released
+        }), 200
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,63 @@
+from flask import Blueprint, request, jsonify, current_app
+from app.models.flight import Flight, SEAT_CLASSES
+from marshmallow import Schema, fields, validate, ValidationError, EXCLUDE
+from datetime import datetime
+
+quotes_bp = Blueprint('quotes', __name__)
+
+class FareQuoteSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE  # Ignore extra fields
+    
+    flight_id = fields.Str(required=True)
+    seat_class = fields.Str(missing='economy', validate=validate.OneOf(SEAT_CLASSES))
+    passengers = fields.Int(missing=1, validate=validate.Range(min=1, max=9))
+
+@quotes_bp.route('', methods=['POST'])
+def create_quote():
+    """Price seats on a flight and return a quote id that bookings can pay"""
+    try:
+        schema = FareQuoteSchema()
+        data = schema.load(request.json or {})
+        
+        flight = Flight.query.filter_by(flight_id=data['flight_id']).first()
+        if not flight:
+            return jsonify({'error': 'Flight not found'}), 404
+        
+        if flight.departure_time < datetime.utcnow():
+            return jsonify({'error': 'Cannot quote a flight in the past'}), 400
+        
+        seat_class = data['seat_class']
+        if getattr(flight, f'{seat_class}_available') < data['passengers']:
+            return jsonify({'error': f'Not enough {seat_class} seats available'}), 400
+        
+        quote_id, quote = current_app.extensions['fare_quotes'].issue(
+            flight.flight_id,
+            seat_class,
+            data['passengers'],
+            flight.current_fare(seat_class),
+            current_app.config['FARE_QUOTE_MINUTES'] * 60
+        )
+        
+        return jsonify({
+            'message': 'Fare quoted successfully',
+            'quote': quote.to_dict(quote_id)
+        }), 201
+    
+    except ValidationError as err:
+        return jsonify({'error': err.messages}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@quotes_bp.route('/<string:quote_id>', methods=['GET'])
+def get_quote(quote_id):
+    """Look up a live quote"""
+    try:
+        quote = current_app.extensions['fare_quotes'].get(quote_id)
+        if quote is None:
+            return jsonify({'error': 'Fare quote has expired or is invalid'}), 404
+        
+        return jsonify({'quote': quote.to_dict(quote_id)}), 200
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
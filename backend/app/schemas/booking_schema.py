@@ -17,6 +17,8 @@ class BookingCreateSchema(Schema):
         missing='completed',
         validate=validate.OneOf(['pending', 'completed', 'failed'])
     )
+    hold_token = fields.Str(missing=None)
+    quote_id = fields.Str(missing=None)
 
 class BookingUpdateSchema(Schema):
     """Schema for updating booking information"""
@@ -38,6 +40,7 @@ class BookingResponseSchema(Schema):
     seat_number = fields.Str()
     status = fields.Str()
     payment_status = fields.Str()
+    total_price = fields.Float()
     booking_date = fields.DateTime()
     created_at = fields.DateTime()
 
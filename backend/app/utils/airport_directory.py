@@ -0,0 +1,92 @@
+from app.models.airport import Airport
+from app.extensions import db
+import threading
+
+def normalize_term(text):
+    """Lookup form of a name: trimmed, single-spaced, case-folded"""
+    return ' '.join((text or '').split()).casefold()
+
+class PrefixTrie:
+    """
+    Character trie that maps every prefix of the inserted terms to the
+    values inserted under them, in insertion order and at most max_values
+    per prefix, so a lookup costs one step per character of the prefix.
+    """
+    
+    _VALUES = None  # Key of the value list inside a node; children are keyed by character
+    
+    def __init__(self, max_values=20):
+        self.max_values = max_values
+        self._root = {}
+    
+    def insert(self, term, value):
+        node = self._root
+        for char in term:
+            node = node.setdefault(char, {})
+            values = node.setdefault(self._VALUES, [])
+            if value not in values and len(values) < self.max_values:
+                values.append(value)
+    
+    def lookup(self, prefix):
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        return node.get(self._VALUES, []) if prefix else []
+
+class AirportDirectory:
+    """
+    In-memory copy of the airports table: an exact map from every code,
+    city, airport name and alias to the IATA code, and a prefix trie for
+    autocomplete. Loaded from the database on first use; airports are
+    reference data maintained by migrations, so it is not refreshed.
+    """
+    
+    def __init__(self, max_suggestions=20):
+        self.max_suggestions = max_suggestions
+        self._codes = None  # normalized term -> code
+        self._airports = {}  # code -> airport dict
+        self._trie = None
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        with self._lock:
+            if self._codes is not None:
+                return
+            # Called from Flight's validators; don't flush a half-built object
+            with db.session.no_autoflush:
+                airports = Airport.query.order_by(Airport.city).all()
+            codes, trie = {}, PrefixTrie(self.max_suggestions)
+            for airport in airports:
+                self._airports[airport.code] = airport.to_dict()
+                for term in airport.search_terms():
+                    term = normalize_term(term)
+                    codes.setdefault(term, airport.code)
+                    trie.insert(term, airport.code)
+            # Later words of multi-word names also complete ("Gandhi"), ranked after whole terms
+            for airport in airports:
+                for term in airport.search_terms():
+                    for word in normalize_term(term).split()[1:]:
+                        trie.insert(word, airport.code)
+            self._trie = trie
+            self._codes = codes
+    
+    def resolve(self, text):
+        """IATA code for a code, city, airport name or alias, or None if unknown"""
+        if self._codes is None:
+            self._load()
+        return self._codes.get(normalize_term(text))
+    
+    def suggest(self, prefix, limit=8):
+        """Airports whose code, city, name or alias starts with prefix"""
+        if self._codes is None:
+            self._load()
+        return [self._airports[code] for code in self._trie.lookup(normalize_term(prefix))[:limit]]
+    
+    def clear(self):
+        """Drop the loaded copy; the next lookup reloads it"""
+        with self._lock:
+            self._codes = None
+            self._airports = {}
+            self._trie = None
@@ -0,0 +1,113 @@
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+import heapq
+
+# One flight as seen by the connection search; `flight` is whatever the caller
+# wants back for the legs of an itinerary (e.g. the Flight row)
+Leg = namedtuple('Leg', 'origin destination departure arrival price seats flight')
+
+SORT_KEYS = {
+    'price': lambda itinerary: (itinerary.price, itinerary.duration),
+    'duration': lambda itinerary: (itinerary.duration, itinerary.price),
+}
+
+class Itinerary(namedtuple('Itinerary', 'first second')):
+    """Two legs connecting at first.destination"""
+    
+    @property
+    def price(self):
+        return self.first.price + self.second.price
+    
+    @property
+    def duration(self):
+        return self.second.arrival - self.first.departure
+    
+    @property
+    def layover(self):
+        return self.second.departure - self.first.arrival
+
+class ConnectionGraph:
+    """
+    Flights grouped for connection search. Departures from each airport
+    and on each route are kept sorted by departure time, so the flights
+    leaving a hub inside a layover window are found with two binary
+    searches instead of a join over every flight.
+    """
+    
+    def __init__(self, legs):
+        self._by_origin = {}  # airport -> ([departure, ...], [Leg, ...])
+        self._by_route = {}  # (origin, destination) -> ([departure, ...], [Leg, ...])
+        
+        for leg in sorted(legs, key=lambda leg: leg.departure):
+            for groups, key in ((self._by_origin, leg.origin), (self._by_route, (leg.origin, leg.destination))):
+                times, group = groups.setdefault(key, ([], []))
+                times.append(leg.departure)
+                group.append(leg)
+    
+    @staticmethod
+    def _window(groups, key, start, end):
+        """Legs in groups[key] departing in [start, end]"""
+        times, group = groups.get(key, ((), ()))
+        return group[bisect_left(times, start):bisect_right(times, end)]
+    
+    def find(self, origin, destination, depart_from, depart_until, min_layover, max_layover,
+             seats=1, sort='price', limit=10):
+        """
+        Best one-stop itineraries from origin to destination.
+        
+        Args:
+            origin, destination: Airport keys, as used to build the legs
+            depart_from, depart_until: Window for the first leg's departure
+            min_layover, max_layover: timedelta bounds on the connection time
+            seats: Seats needed on both legs
+            sort: 'price' or 'duration'
+            limit: Number of itineraries to return
+        
+        Returns:
+            List of Itinerary, best first
+        """
+        candidates = []
+        for first in self._window(self._by_origin, origin, depart_from, depart_until):
+            if first.destination in (origin, destination) or first.seats < seats:
+                continue
+            for second in self._window(
+                self._by_route,
+                (first.destination, destination),
+                first.arrival + min_layover,
+                first.arrival + max_layover
+            ):
+                if second.seats >= seats:
+                    candidates.append(Itinerary(first, second))
+        
+        return heapq.nsmallest(limit, candidates, key=SORT_KEYS[sort])
+
+def cheapest_round_trips(outbound, inbound, limit=10):
+    """
+    Cheapest (outbound, return) pairs of search records where the return
+    leaves after the outbound lands, pairing each outbound flight with its
+    cheapest valid return. Records are ranked on their economy 'fare'.
+    
+    Args:
+        outbound: Search records for the outbound leg
+        inbound: Search records for the return leg
+        limit: Number of pairs to return
+    
+    Returns:
+        List of (outbound_record, return_record), cheapest first
+    """
+    # Returns ordered by departure, with the cheapest return leaving at or after each one
+    inbound = sorted(inbound, key=lambda record: record['departure_time'])
+    departures = [record['departure_time'] for record in inbound]
+    cheapest_from = [None] * (len(inbound) + 1)
+    for position in range(len(inbound) - 1, -1, -1):
+        best = cheapest_from[position + 1]
+        cheapest_from[position] = inbound[position] if best is None or inbound[position]['fare'] < best['fare'] else best
+    
+    pairs = []
+    for record in outbound:
+        # Every return after this one's arrival is a suffix of the departure array
+        first = bisect_right(departures, record['arrival_time'])
+        if cheapest_from[first] is not None:
+            pairs.append((record, cheapest_from[first]))
+    
+    return heapq.nsmallest(limit, pairs, key=lambda pair: pair[0]['fare'] + pair[1]['fare'])
@@ -1,27 +1,157 @@
-def calculate_dynamic_price(flight, seat_class='economy'):
-    """Calculate dynamic price based on seat availability"""
-    base_price = flight.price
-    available_seats = len(flight.get_available_seats())
-    total_seats = len(flight.seats)
-    
-    # Calculate occupancy rate
-    occupancy = (total_seats - available_seats) / total_seats
+from datetime import datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # Optional: vectorized batch pricing when installed
+    np = None
+
+# Pricing rules, declared once and shared by every caller.
+# Occupancy tiers: (booked share above, fare multiplier), highest first
+OCCUPANCY_TIERS = (
+    (0.8, 1.5),
+    (0.5, 1.2),
+)
+
+# Cabin multipliers; unknown classes price as economy
+CLASS_MULTIPLIERS = {
+    'economy': 1.0,
+    'premium_economy': 1.4,
+    'business': 2.0,
+    'first': 3.0,
+}
+
+# Last-minute surcharges: (hours to departure below, share of the fare added), closest first
+LAST_MINUTE_SURCHARGES = (
+    (24, 0.45),
+    (48, 0.15),
+)
+
+# Below this many fares the NumPy setup costs more than the Python loop saves
+VECTORIZE_MIN_BATCH = 64
+
+
+def _tier(value, tiers, above, default):
+    for threshold, result in tiers:
+        if (value > threshold) if above else (value < threshold):
+            return result
+    return default
+
+
+def _price_python(base_prices, occupancies, hours, seat_classes):
+    # Rounds to cents the way np.rint does, so both engines return identical fares
+    return [
+        round(
+            base
+            * _tier(occupancy, OCCUPANCY_TIERS, True, 1.0)
+            * CLASS_MULTIPLIERS.get(seat_class, 1.0)
+            * (1 + _tier(hours_left, LAST_MINUTE_SURCHARGES, False, 0.0))
+            * 100
+        ) / 100
+        for base, occupancy, hours_left, seat_class in zip(base_prices, occupancies, hours, seat_classes)
+    ]
+
+
+def _price_numpy(base_prices, occupancies, hours, seat_classes):
+    base = np.asarray(base_prices, dtype=float)
+    occupancy = np.asarray(occupancies, dtype=float)
+    hours = np.asarray(hours, dtype=float)
     
-    # Price multiplier based on occupancy
-    if occupancy > 0.8:  # More than 80% booked
-        multiplier = 1.5
-    elif occupancy > 0.5:  # More than 50% booked
-        multiplier = 1.2
-    else:
-        multiplier = 1.0
+    occupancy_multiplier = np.select(
+        [occupancy > threshold for threshold, _ in OCCUPANCY_TIERS],
+        [multiplier for _, multiplier in OCCUPANCY_TIERS],
+        1.0
+    )
+    surcharge = np.select(
+        [hours < threshold for threshold, _ in LAST_MINUTE_SURCHARGES],
+        [share for _, share in LAST_MINUTE_SURCHARGES],
+        0.0
+    )
+    class_multiplier = np.fromiter(
+        (CLASS_MULTIPLIERS.get(seat_class, 1.0) for seat_class in seat_classes),
+        dtype=float,
+        count=len(base)
+    )
+    fares = base * occupancy_multiplier * class_multiplier * (1 + surcharge)
+    return (np.rint(fares * 100) / 100).tolist()
+
+
+def occupancy_tier(occupancy):
+    """Index of the occupancy tier a booked share falls in; len(OCCUPANCY_TIERS) below every tier"""
+    for index, (threshold, _) in enumerate(OCCUPANCY_TIERS):
+        if occupancy > threshold:
+            return index
+    return len(OCCUPANCY_TIERS)
+
+
+def next_reprice_at(departure_time, now):
+    """
+    When a fare priced at `now` next moves to another last-minute bucket,
+    or None once it is in the last one. The surcharge starts just after
+    this instant, so a fare is due for repricing once now is past it.
+    """
+    upcoming = [
+        departure_time - timedelta(hours=hours)
+        for hours, _ in LAST_MINUTE_SURCHARGES
+        if departure_time - timedelta(hours=hours) >= now
+    ]
+    return min(upcoming) if upcoming else None
+
+
+def fare_lifetime(records, now):
+    """
+    Seconds from `now` until the first fare in these search records (which
+    carry departure_time) moves to another last-minute bucket, or None if
+    none of them will. Caches of priced records keep them no longer.
+    """
+    due = [moment for moment in (next_reprice_at(record['departure_time'], now) for record in records) if moment]
+    return (min(due) - now).total_seconds() if due else None
+
+
+def price_fares(base_prices, occupancies, hours_to_departure, seat_classes, engine='auto'):
+    """
+    Price a whole result set in one pass.
     
-    # Seat class multiplier
-    class_multipliers = {
-        'economy': 1.0,
-        'business': 2.0,
-        'first': 3.0
-    }
+    Args:
+        base_prices: Base fare per flight
+        occupancies: Booked share of seats per flight (0-1)
+        hours_to_departure: Hours until departure per flight
+        seat_classes: Cabin class per flight
+        engine: 'numpy', 'python', or 'auto' (NumPy for large batches when installed)
     
-    final_price = base_price * multiplier * class_multipliers.get(seat_class, 1.0)
-    
-    return round(final_price, 2)
\ No newline at end of file
+    Returns:
+        List of fares, rounded to 2 decimals, in input order
+    """
+    if engine == 'auto':
+        engine = 'numpy' if np is not None and len(base_prices) >= VECTORIZE_MIN_BATCH else 'python'
+    if engine == 'numpy':
+        if np is None:
+            raise ValueError('NumPy pricing requested but numpy is not installed')
+        return _price_numpy(base_prices, occupancies, hours_to_departure, seat_classes)
+    return _price_python(base_prices, occupancies, hours_to_departure, seat_classes)
+
+
+def price_flights(flights, seat_class='economy', now=None):
+    """Dynamic fares for Flight rows, from their availability counters; seat_class may be one per flight"""
+    now = now or datetime.utcnow()
+    seat_classes = [seat_class] * len(flights) if isinstance(seat_class, str) else seat_class
+    return price_fares(
+        [flight.price for flight in flights],
+        [
+            (flight.seats_total - flight.seats_available) / flight.seats_total if flight.seats_total else 0
+            for flight in flights
+        ],
+        [(flight.departure_time - now).total_seconds() / 3600 for flight in flights],
+        seat_classes
+    )
+
+
+def calculate_dynamic_price(flight, seat_class='economy'):
+    """Calculate dynamic price based on seat availability and time to departure"""
+    return price_flights([flight], seat_class)[0]
+
+
+def price_seats(flight, seat_numbers):
+    """Total dynamic fare for seat_numbers on flight, each at its cabin's price"""
+    plan = flight.seat_plan
+    seat_classes = [plan.seat_classes.get(seat_number, 'economy') if plan else 'economy' for seat_number in seat_numbers]
+    return round(sum(price_flights([flight] * len(seat_classes), seat_classes)), 2)
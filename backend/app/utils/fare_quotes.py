@@ -0,0 +1,114 @@
+from app.extensions import db
+from app.models.booking import Booking
+from collections import namedtuple
+from datetime import datetime
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeSerializer
+import threading
+import time
+
+class InvalidQuote(ValueError):
+    """Raised when a fare quote can't pay for a booking"""
+
+class FareQuote(namedtuple('FareQuote', 'flight_id seat_class passengers fare total_price expires_at')):
+    """A priced (flight, cabin, passengers) request; expires_at is a Unix timestamp"""
+    
+    __slots__ = ()
+    
+    def to_dict(self, quote_id):
+        return {
+            'quote_id': quote_id,
+            'flight_id': self.flight_id,
+            'seat_class': self.seat_class,
+            'passengers': self.passengers,
+            'fare': self.fare,
+            'total_price': self.total_price,
+            'expires_at': datetime.utcfromtimestamp(self.expires_at).isoformat()
+        }
+
+class QuoteStore:
+    """
+    Fare quotes priced by the server, looked up by quote id. The id is the
+    quote itself signed with the app's secret key: the in-memory map makes
+    a lookup one dict access, and a worker that didn't issue a quote (or
+    restarted since) can still verify it from the id alone. Either way,
+    honouring a quote never prices the flight again.
+    """
+    
+    def __init__(self, secret_key, max_entries=50000):
+        self.max_entries = max_entries
+        self._serializer = URLSafeSerializer(secret_key, salt='fare-quote')
+        self._quotes = {}  # quote id -> FareQuote, in issue order
+        self._lock = threading.Lock()
+    
+    def issue(self, flight_id, seat_class, passengers, fare, ttl_seconds):
+        """
+        Record a quote for passengers seats at fare each.
+        
+        Returns:
+            Tuple of (quote_id, FareQuote)
+        """
+        quote = FareQuote(
+            flight_id, seat_class, passengers, fare,
+            round(fare * passengers, 2), int(time.time()) + ttl_seconds
+        )
+        quote_id = self._serializer.dumps(list(quote))
+        self._remember(quote_id, quote)
+        return quote_id, quote
+    
+    def get(self, quote_id):
+        """The quote for quote_id, or None if it is expired, unknown or forged"""
+        now = time.time()
+        quote = self._quotes.get(quote_id)
+        if quote is None:
+            try:
+                quote = FareQuote(*self._serializer.loads(quote_id))
+            except (BadSignature, TypeError):
+                return None
+            if quote.expires_at > now:
+                self._remember(quote_id, quote)
+        return quote if quote.expires_at > now else None
+    
+    def clear(self):
+        with self._lock:
+            self._quotes.clear()
+    
+    def _remember(self, quote_id, quote):
+        with self._lock:
+            # Quotes are kept in issue order, which is close to expiry order,
+            # so expired ones (and the oldest, when full) are at the front.
+            # Evicted quotes stay valid through their signature.
+            now = time.time()
+            while self._quotes:
+                oldest = next(iter(self._quotes))
+                if self._quotes[oldest].expires_at > now and len(self._quotes) < self.max_entries:
+                    break
+                del self._quotes[oldest]
+            self._quotes[quote_id] = quote
+
+def quote_used(quote_id):
+    """Whether a booking has already paid with quote_id"""
+    return db.session.query(Booking.query.filter_by(quote_id=quote_id).exists()).scalar()
+
+def quote_for_booking(quote_id, flight, seat_numbers):
+    """
+    The live, unused quote paying for seat_numbers on flight. Checked before
+    any seat is claimed, so a bad quote changes nothing. The booking records
+    quote_id, whose unique constraint stops a concurrent second use at commit.
+    
+    Raises:
+        InvalidQuote: If the quote is expired, forged, used, or for other seats
+    """
+    quote = current_app.extensions['fare_quotes'].get(quote_id)
+    if quote is None:
+        raise InvalidQuote('Fare quote has expired or is invalid')
+    if quote_used(quote_id):
+        raise InvalidQuote('Fare quote has already been used')
+    if quote.flight_id != flight.flight_id:
+        raise InvalidQuote('Fare quote is for a different flight')
+    if quote.passengers != len(seat_numbers):
+        raise InvalidQuote(f'Fare quote is for {quote.passengers} passenger(s)')
+    plan = flight.seat_plan
+    if plan and any(plan.seat_classes.get(seat_number) != quote.seat_class for seat_number in seat_numbers):
+        raise InvalidQuote(f'Seats must be in the quoted {quote.seat_class} cabin')
+    return quote
@@ -0,0 +1,145 @@
+from collections import OrderedDict
+from datetime import datetime
+import threading
+import time
+
+class RouteIndex:
+    """
+    In-process index of flight search results keyed by
+    (source_norm, destination_norm, date). Each entry is a list of
+    lightweight flight records sorted by departure time.
+    
+    Entries are filled from the database on a miss and then kept current
+    from the session hooks in app.models.flight: committed flight writes
+    drop the affected keys and committed seat changes patch the counters
+    in place. Those hooks only see this process's commits, so an entry is
+    also reloaded once it is max_age seconds old, which bounds how long
+    writes from other workers go unseen. A search may also cap an entry's
+    age by its records (see search). At most max_routes keys are kept,
+    least recently used first out.
+    """
+    
+    def __init__(self, max_routes=5000, max_age=60):
+        self.max_routes = max_routes
+        self.max_age = max_age
+        self._routes = OrderedDict()  # key -> (expires_at, [record, ...])
+        self._route_of = {}  # flight pk -> key it is indexed under
+        # key -> invalidation count, kept only while the key is loading, to discard loads that raced a write
+        self._generations = {}
+        self._loads = {}  # key -> misses reading it from the database
+        self._loading = 0  # Misses currently reading the database
+        self._pending = {}  # flight pk -> counter patch that arrived during a load
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.patches = 0
+    
+    def search(self, key, load, lifetime=None):
+        """
+        Records for key, calling load() to build them from the database
+        on a miss. Returns copies the caller may modify.
+        
+        Args:
+            key: Route key
+            load: Reads the key's records from the database
+            lifetime: Optional lifetime(records, now) giving the most seconds
+                the loaded records may be kept, counted from the UTC time
+                the load started, or None for max_age
+        """
+        with self._lock:
+            entry = self._routes.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._routes.move_to_end(key)
+                    self.hits += 1
+                    return [dict(record) for record in entry[1]]
+                self._drop(key)
+            self.misses += 1
+            self._loading += 1
+            self._loads[key] = self._loads.get(key, 0) + 1
+            generation = self._generations.setdefault(key, 0)
+            started, loaded_at = time.monotonic(), datetime.utcnow()
+        
+        try:
+            records = sorted(load(), key=lambda record: record['departure_time'])
+        except Exception:
+            with self._lock:
+                self._end_load(key)
+            raise
+        
+        max_age = lifetime(records, loaded_at) if lifetime else None
+        expires_at = started + (self.max_age if max_age is None else min(self.max_age, max_age))
+        with self._lock:
+            for record in records:
+                # Counters committed while the load was reading
+                patch = self._pending.get(record['id'])
+                if patch and patch['seat_version'] > record['seat_version']:
+                    record.update(patch)
+            if self._generations[key] == generation:
+                if key in self._routes:
+                    self._drop(key)
+                self._routes[key] = (expires_at, records)
+                for record in records:
+                    self._route_of[record['id']] = key
+                while len(self._routes) > self.max_routes:
+                    self._drop(next(iter(self._routes)))
+            self._end_load(key)
+        return [dict(record) for record in records]
+    
+    def invalidate(self, keys):
+        """Forget the given keys; the next search for each reloads it"""
+        with self._lock:
+            for key in keys:
+                if key in self._generations:
+                    self._generations[key] += 1
+                if key in self._routes:
+                    self._drop(key)
+                    self.invalidations += 1
+    
+    def update_availability(self, flight_pk, values):
+        """Patch one flight's record with new counter values (which include seat_version)"""
+        with self._lock:
+            if self._loading:
+                self._pending[flight_pk] = values
+            key = self._route_of.get(flight_pk)
+            for record in self._routes[key][1] if key in self._routes else ():
+                if record['id'] == flight_pk and values['seat_version'] > record['seat_version']:
+                    record.update(values)
+                    self.patches += 1
+                    return
+    
+    def clear(self):
+        with self._lock:
+            for key in self._generations:
+                self._generations[key] += 1
+            self._routes.clear()
+            self._route_of.clear()
+    
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'routes': len(self._routes),
+                'flights': sum(len(records) for _, records in self._routes.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'invalidations': self.invalidations,
+                'patches': self.patches
+            }
+    
+    def _end_load(self, key):
+        self._loading -= 1
+        if not self._loading:
+            self._pending.clear()
+        self._loads[key] -= 1
+        if not self._loads[key]:
+            del self._loads[key]
+            del self._generations[key]
+    
+    def _drop(self, key):
+        _, records = self._routes.pop(key)
+        for record in records:
+            if self._route_of.get(record['id']) == key:
+                del self._route_of[record['id']]
@@ -0,0 +1,136 @@
+from app.extensions import db
+from app.models.idempotency_key import IdempotencyKey
+from datetime import datetime, timedelta
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity
+from functools import wraps
+from sqlalchemy.exc import IntegrityError
+import hashlib
+import time
+
+class IdempotencyConflict(ValueError):
+    """Raised when an Idempotency-Key can't be replayed for this request"""
+    
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+def _claim(request_key, fingerprint):
+    """
+    Claim request_key for this request, or find the response to an earlier one.
+    The claim is flushed but not committed, so it lands in the transaction the
+    view commits its write in. A concurrent request inserting the same key
+    waits on the unique constraint until that transaction ends.
+    
+    Returns:
+        Tuple of (claim, None) when the caller should run the request, or
+        (None, stored) with the finished IdempotencyKey to replay
+    
+    Raises:
+        IdempotencyConflict: If the key was used for a different request
+            body, or its first request is still running
+    """
+    ttl = timedelta(seconds=current_app.config['IDEMPOTENCY_TTL_SECONDS'])
+    deadline = time.monotonic() + current_app.config['IDEMPOTENCY_WAIT_SECONDS']
+    while True:
+        stored = IdempotencyKey.query.filter_by(**request_key).first()
+        if stored is not None and stored.created_at < datetime.utcnow() - ttl:
+            # Expired but not purged yet; the key is free again
+            db.session.delete(stored)
+            db.session.commit()
+            stored = None
+        
+        if stored is None:
+            claim = IdempotencyKey(**request_key, fingerprint=fingerprint)
+            db.session.add(claim)
+            try:
+                db.session.flush()
+                return claim, None
+            except IntegrityError:
+                # Another request claimed the key first; look at its row again
+                db.session.rollback()
+                continue
+        
+        if stored.fingerprint != fingerprint:
+            raise IdempotencyConflict('Idempotency-Key was already used for a different request', 422)
+        if stored.status_code is not None:
+            return None, stored
+        if time.monotonic() >= deadline:
+            raise IdempotencyConflict('A request with this Idempotency-Key is still in progress', 409)
+        # End the read so the next one sees the first request's response
+        db.session.rollback()
+        time.sleep(0.05)
+
+def _store(claim, request_key, fingerprint, response):
+    """Record the response on the claim, putting the claim back if the view rolled it back"""
+    if claim not in db.session:
+        claim = IdempotencyKey(**request_key, fingerprint=fingerprint)
+        db.session.add(claim)
+    claim.status_code = response.status_code
+    claim.response_body = response.get_data(as_text=True)
+    claim.mimetype = response.mimetype
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A retry claimed the key after the view's rollback; it runs the request itself
+        db.session.rollback()
+
+def _release(claim):
+    """Forget an unfinished claim so a retry runs again"""
+    db.session.rollback()
+    if claim in db.session:
+        # The view committed the claim before failing
+        IdempotencyKey.query.filter_by(id=claim.id, status_code=None).delete()
+        db.session.commit()
+
+def purge_expired_keys():
+    """Delete stored keys older than IDEMPOTENCY_TTL_SECONDS, committing each batch; returns the number deleted"""
+    return IdempotencyKey.purge_expired(
+        current_app.config['IDEMPOTENCY_TTL_SECONDS'],
+        batch_size=current_app.config['IDEMPOTENCY_PURGE_BATCH']
+    )
+
+def idempotent(view):
+    """
+    Replay the stored response when a request repeats its Idempotency-Key.
+    Keys are scoped to the user and endpoint, so place this under
+    @jwt_required(). They live in idempotency_keys, claimed in the view's
+    transaction, so a retry is recognised by every worker. Server errors are
+    not stored, so their retries run again.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        idempotency_key = request.headers.get('Idempotency-Key')
+        if not idempotency_key:
+            return view(*args, **kwargs)
+        if len(idempotency_key) > 255:
+            return jsonify({'error': 'Idempotency-Key must be at most 255 characters'}), 400
+        
+        request_key = {
+            'user_id': int(get_jwt_identity()),
+            'method': request.method,
+            'path': request.path,
+            'key': idempotency_key
+        }
+        fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+        try:
+            claim, stored = _claim(request_key, fingerprint)
+        except IdempotencyConflict as e:
+            return jsonify({'error': str(e)}), e.status_code
+        
+        if stored is not None:
+            response = current_app.response_class(stored.response_body, status=stored.status_code, mimetype=stored.mimetype)
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+        
+        response = None
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+            return response
+        finally:
+            if response is not None and response.status_code < 500:
+                _store(claim, request_key, fingerprint, response)
+            else:
+                _release(claim)
+    
+    return wrapper
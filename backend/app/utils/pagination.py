@@ -0,0 +1,80 @@
+from sqlalchemy import text, tuple_
+import base64
+import json
+from datetime import datetime
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor can't be decoded"""
+
+def encode_cursor(values):
+    """Opaque cursor for the sort key values of the last row on a page"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, columns):
+    """Sort key values from a cursor made by encode_cursor for the same columns"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(payload, list) or len(payload) != len(columns):
+            raise InvalidCursor('Invalid cursor')
+        return [
+            datetime.fromisoformat(value) if column.type.python_type is datetime else value
+            for column, value in zip(columns, payload)
+        ]
+    except InvalidCursor:
+        raise
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+
+def keyset_page(query, columns, cursor=None, limit=20, descending=False):
+    """
+    One page of query ordered by columns, continuing after cursor.
+    
+    Rows are located with a row-value comparison on the sort key instead
+    of OFFSET, so with an index on the columns every page costs the same
+    as the first. The last column must be unique (e.g. the primary key).
+    
+    Args:
+        query: Query to page through
+        columns: Sort key columns, e.g. (Flight.departure_time, Flight.id)
+        cursor: next_cursor from the previous page, or None for the first
+        limit: Rows per page
+        descending: Walk the key from newest to oldest
+    
+    Returns:
+        Tuple of (rows, next_cursor); next_cursor is None on the last page
+    
+    Raises:
+        InvalidCursor: If cursor is malformed
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        key = tuple_(*columns)
+        after = tuple_(*values, types=[column.type for column in columns])
+        query = query.filter(key < after if descending else key > after)
+    
+    order = [column.desc() if descending else column.asc() for column in columns]
+    # One extra row tells us whether there is a next page without a COUNT
+    rows = query.order_by(*order).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    
+    rows = rows[:limit]
+    return rows, encode_cursor([getattr(rows[-1], column.key) for column in columns])
+
+def approximate_count(query):
+    """
+    Row count for query, cheap on PostgreSQL: the planner's estimate from
+    EXPLAIN instead of a COUNT(*) scan. Other databases get an exact count.
+    
+    Returns:
+        Tuple of (count, is_estimate)
+    """
+    query = query.order_by(None)
+    bind = query.session.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return query.count(), False
+    
+    statement = query.statement.compile(dialect=bind.dialect, compile_kwargs={'literal_binds': True})
+    plan = query.session.execute(text(f'EXPLAIN (FORMAT JSON) {statement}')).scalar()
+    return int(plan[0]['Plan']['Plan Rows']), True
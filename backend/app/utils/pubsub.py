@@ -0,0 +1,64 @@
+import queue
+import threading
+
+class Subscription:
+    """One subscriber's queue of messages on a channel"""
+    
+    def __init__(self, broker, channel, maxsize):
+        self.broker = broker
+        self.channel = channel
+        self.messages = queue.Queue(maxsize=maxsize)
+        self.overflowed = False  # Set when messages were dropped; the subscriber must resync
+    
+    def get(self, timeout=None):
+        """Next message, or None if nothing arrived within timeout seconds"""
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def close(self):
+        self.broker.unsubscribe(self)
+
+class InProcessBroker:
+    """
+    Publish/subscribe between threads of one process. Anything offering the
+    same publish/subscribe/unsubscribe methods (e.g. a Redis-backed broker)
+    can replace it once the app runs on more than one process.
+    """
+    
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscriptions = {}  # channel -> set of Subscription
+        self._lock = threading.Lock()
+    
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel, self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.channel)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[subscription.channel]
+    
+    def publish(self, channel, message):
+        """Queue message for every subscriber of channel. Returns the number of subscribers reached."""
+        with self._lock:
+            subscribers = list(self._subscriptions.get(channel, ()))
+        
+        for subscription in subscribers:
+            try:
+                subscription.messages.put_nowait(message)
+            except queue.Full:
+                # A stalled client must not block publishers
+                subscription.overflowed = True
+        return len(subscribers)
+    
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from app.extensions import db
+
+class QueryCounter:
+    """SQL statements run on an engine while counting"""
+    
+    def __init__(self):
+        self.statements = []
+    
+    def __len__(self):
+        return len(self.statements)
+    
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+@contextmanager
+def count_queries(engine=None):
+    """
+    Count the SQL statements run inside the block.
+    
+    Args:
+        engine: Engine to watch; defaults to the app's db.engine
+    
+    Yields:
+        QueryCounter whose statements list fills as the block runs
+    """
+    engine = engine or db.engine
+    counter = QueryCounter()
+    event.listen(engine, 'before_cursor_execute', counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter._record)
+
+@contextmanager
+def assert_num_queries(expected, engine=None):
+    """
+    Fail unless the block runs exactly `expected` SQL statements, so a
+    test can lock in a constant query count for an endpoint.
+    
+    Raises:
+        AssertionError: Listing the statements that ran
+    """
+    with count_queries(engine) as counter:
+        yield counter
+    if len(counter) != expected:
+        ran = '\n'.join(f'  {statement}' for statement in counter.statements)
+        raise AssertionError(f'Expected {expected} queries, {len(counter)} ran:\n{ran}')
@@ -1,5 +1,106 @@
 from flask import jsonify
-from datetime import datetime
+from flask.json.provider import JSONProvider
+from datetime import date, datetime, time
+from decimal import Decimal
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional: faster encoding when installed
+    orjson = None
+
+
+def _encode_default(value):
+    """Encode types JSON has no native form for"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+class StdlibEncoder:
+    """Compact stdlib json encoding"""
+    name = 'json'
+    
+    def __init__(self, sort_keys=False):
+        self.sort_keys = sort_keys
+    
+    def dumps(self, obj):
+        return json.dumps(obj, default=_encode_default, separators=(',', ':'), sort_keys=self.sort_keys)
+    
+    def dumps_bytes(self, obj):
+        return self.dumps(obj).encode()
+    
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonEncoder:
+    """orjson encoding: datetimes, dates and times are encoded natively in C"""
+    name = 'orjson'
+    
+    def __init__(self, sort_keys=False):
+        self.option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+    
+    def dumps(self, obj):
+        return self.dumps_bytes(obj).decode()
+    
+    def dumps_bytes(self, obj):
+        return orjson.dumps(obj, default=_encode_default, option=self.option)
+    
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+ENCODERS = {
+    'json': StdlibEncoder,
+    'orjson': OrjsonEncoder,
+}
+
+
+def get_encoder(name='auto', sort_keys=False):
+    """
+    Build a JSON encoder by name
+    
+    Args:
+        name: 'orjson', 'json', or 'auto' for orjson when it is installed
+        sort_keys: Emit object keys in sorted order
+    
+    Returns:
+        Encoder with dumps(), dumps_bytes() and loads()
+    """
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'json'
+    if name == 'orjson' and orjson is None:
+        raise ValueError('JSON_ENCODER is orjson but orjson is not installed')
+    if name not in ENCODERS:
+        raise ValueError(f"Unknown JSON encoder: {name}")
+    return ENCODERS[name](sort_keys=sort_keys)
+
+
+class FastJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by get_encoder(). Installed on the app in
+    create_app, so every jsonify() in every blueprint, and the helpers
+    below, encode through it. Datetimes encode as ISO 8601.
+    """
+    
+    def __init__(self, app):
+        super().__init__(app)
+        self.encoder = get_encoder(app.config.get('JSON_ENCODER', 'auto'), app.config.get('JSON_SORT_KEYS', False))
+    
+    def dumps(self, obj, **kwargs):
+        return self.encoder.dumps(obj)
+    
+    def loads(self, s, **kwargs):
+        return self.encoder.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.encoder.dumps_bytes(obj), mimetype='application/json')
 
 def success_response(data=None, message="Success", status_code=200):
     """
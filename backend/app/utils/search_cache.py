@@ -0,0 +1,147 @@
+from app.utils.dynamic_pricing import fare_lifetime
+from collections import OrderedDict
+from datetime import datetime
+from flask import current_app
+import threading
+import time
+
+class _Load:
+    """A database load in progress that identical requests wait on"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+class SearchCache:
+    """
+    LRU cache of search results with a TTL. Keys are tuples whose first
+    three items are the route key (source_norm, destination_norm, date),
+    so every entry for a route can be dropped when one of its flights
+    changes. Concurrent misses on the same key are coalesced: one caller
+    loads and the others wait for its result.
+    """
+    
+    def __init__(self, max_entries=10000, ttl=30, wait_timeout=10):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._keys_by_route = {}  # route key -> set of keys cached for it
+        self._loads = {}  # key -> _Load in progress
+        # route key -> invalidation count, kept only while the route has loads in progress
+        self._generations = {}
+        self._route_loads = {}  # route key -> loads in progress for it
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+    
+    def get_or_load(self, key, load, lifetime=None):
+        """
+        Cached value for key, or the result of load() shared with concurrent
+        callers. lifetime(value, now), if given, caps how many seconds a
+        loaded value is kept, counted from the UTC time the load started;
+        it returns None to keep the value for the full ttl.
+        """
+        route = key[:3]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self._remove(key)
+            
+            pending = self._loads.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._loads[key] = _Load()
+                self.misses += 1
+                self._route_loads[route] = self._route_loads.get(route, 0) + 1
+                generation = self._generations.setdefault(route, 0)
+                started, loaded_at = time.monotonic(), datetime.utcnow()
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            if pending.done.wait(self.wait_timeout):
+                if pending.error is not None:
+                    raise pending.error
+                return pending.value
+            # The leader is stuck; don't queue behind it forever
+            return load()
+        
+        try:
+            value = load()
+        except Exception as e:
+            pending.error = e
+            raise
+        else:
+            pending.value = value
+            with self._lock:
+                # A write during the load may have made value stale; serve it once, don't keep it
+                if self._generations[route] == generation:
+                    max_age = lifetime(value, loaded_at) if lifetime else None
+                    self._entries[key] = (started + (self.ttl if max_age is None else min(self.ttl, max_age)), value)
+                    self._keys_by_route.setdefault(route, set()).add(key)
+                    while len(self._entries) > self.max_entries:
+                        self._remove(next(iter(self._entries)))
+            return value
+        finally:
+            with self._lock:
+                self._loads.pop(key, None)
+                self._route_loads[route] -= 1
+                if not self._route_loads[route]:
+                    del self._route_loads[route]
+                    del self._generations[route]
+            pending.done.set()
+    
+    def invalidate(self, routes):
+        """Drop every entry cached for the given route keys"""
+        with self._lock:
+            for route in routes:
+                if route in self._generations:
+                    self._generations[route] += 1
+                for key in list(self._keys_by_route.get(route, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+    
+    def clear(self):
+        with self._lock:
+            for route in self._generations:
+                self._generations[route] += 1
+            self._entries.clear()
+            self._keys_by_route.clear()
+    
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'hit_rate': round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+                'invalidations': self.invalidations
+            }
+    
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        keys = self._keys_by_route.get(key[:3])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_route[key[:3]]
+
+def cached_search(key, load):
+    """
+    Run load() through the app's search cache unless SEARCH_CACHE_ENABLED is
+    off. load() returns priced flight records, which are kept no longer than
+    their fares are current.
+    """
+    if not current_app.config['SEARCH_CACHE_ENABLED']:
+        return load()
+    return current_app.extensions['search_cache'].get_or_load(key, load, fare_lifetime)
@@ -0,0 +1,136 @@
+from app.models.flight import Flight
+from datetime import datetime, time
+from sqlalchemy import func
+import heapq
+
+SORT_FIELDS = ('departure', 'arrival', 'price', 'duration')
+
+def _duration(record):
+    return record['arrival_time'] - record['departure_time']
+
+# Record sort keys; departure time and id break ties so results are stable.
+_RECORD_KEYS = {
+    'departure': lambda record: (record['departure_time'], record['id']),
+    'arrival': lambda record: (record['arrival_time'], record['departure_time'], record['id']),
+    'price': lambda record: (record['fare'], record['departure_time'], record['id']),
+    'duration': lambda record: (_duration(record), record['departure_time'], record['id']),
+}
+
+class SearchOptions:
+    """
+    Sort, filters and limit for one route/day search, applied either to a
+    query (when results come from the database) or to search records
+    (when they come from the in-memory route index).
+    """
+    
+    def __init__(self, sort='departure', min_price=None, max_price=None,
+                 depart_after=None, depart_before=None, airlines=None, limit=None):
+        self.sort = sort
+        self.min_price = min_price
+        self.max_price = max_price
+        self.depart_after = depart_after
+        self.depart_before = depart_before
+        self.airlines = frozenset(airline.lower() for airline in airlines) if airlines else None
+        self.limit = limit
+    
+    @classmethod
+    def from_args(cls, args):
+        """
+        Build options from request args: sort, min_price, max_price,
+        depart_after / depart_before (HH:MM), airlines (comma separated)
+        and limit.
+        
+        Raises:
+            ValueError: If a parameter is invalid
+        """
+        sort = args.get('sort', 'departure')
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"sort must be one of: {', '.join(SORT_FIELDS)}")
+        
+        try:
+            min_price = args.get('min_price', type=float)
+            max_price = args.get('max_price', type=float)
+            depart_after = time.fromisoformat(args['depart_after']) if args.get('depart_after') else None
+            depart_before = time.fromisoformat(args['depart_before']) if args.get('depart_before') else None
+        except ValueError:
+            raise ValueError('Invalid time format for depart_after/depart_before. Use HH:MM')
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise ValueError('min_price cannot be greater than max_price')
+        
+        limit = args.get('limit', type=int)
+        if limit is not None and (limit < 1 or limit > 100):
+            raise ValueError('limit must be between 1 and 100')
+        
+        airlines = [airline.strip() for airline in args.get('airlines', '').split(',') if airline.strip()]
+        
+        return cls(sort, min_price, max_price, depart_after, depart_before, airlines, limit)
+    
+    def key(self):
+        """Hashable form of the options, for cache keys"""
+        return (
+            self.sort, self.min_price, self.max_price, self.depart_after,
+            self.depart_before, self.airlines, self.limit
+        )
+    
+    def apply_to_query(self, query, day):
+        """
+        Filter, order and limit a route/day Flight query in SQL. The
+        departure window narrows the range read on the route/departure
+        index; the other filters run on that range. Duration has no
+        portable SQL expression, and prices are the dynamic fares, which
+        are only final once stale ones are repriced after the query, so
+        those sorts and the price filters are left to apply_to_records.
+        """
+        if self.depart_after is not None:
+            query = query.filter(Flight.departure_time >= datetime.combine(day, self.depart_after))
+        if self.depart_before is not None:
+            query = query.filter(Flight.departure_time <= datetime.combine(day, self.depart_before))
+        if self.airlines:
+            query = query.filter(func.lower(Flight.airline).in_(self.airlines))
+        
+        if self.sort in ('duration', 'price'):
+            return query
+        
+        columns = {
+            'departure': (Flight.departure_time, Flight.id),
+            'arrival': (Flight.arrival_time, Flight.departure_time, Flight.id),
+        }[self.sort]
+        query = query.order_by(None).order_by(*columns)
+        if self.limit is not None and self.min_price is None and self.max_price is None:
+            query = query.limit(self.limit)
+        return query
+    
+    def apply_to_records(self, records, day, presorted=False):
+        """
+        Filter, sort and limit search records in memory. The top `limit`
+        come from a bounded heap rather than a full sort. Price filters and
+        the price sort use each record's economy 'fare', which is what a
+        booking is charged.
+        
+        Args:
+            records: Search records for the route/day
+            day: The searched date, for the departure window
+            presorted: records are already in this sort order
+        
+        Returns:
+            New list of records
+        """
+        after = datetime.combine(day, self.depart_after) if self.depart_after is not None else None
+        before = datetime.combine(day, self.depart_before) if self.depart_before is not None else None
+        
+        def wanted(record):
+            return (
+                (after is None or record['departure_time'] >= after)
+                and (before is None or record['departure_time'] <= before)
+                and (self.min_price is None or record['fare'] >= self.min_price)
+                and (self.max_price is None or record['fare'] <= self.max_price)
+                and (self.airlines is None or record['airline'].lower() in self.airlines)
+            )
+        
+        matches = [record for record in records if wanted(record)]
+        if presorted:
+            return matches[:self.limit]
+        key = _RECORD_KEYS[self.sort]
+        if self.limit is None:
+            return sorted(matches, key=key)
+        return heapq.nsmallest(self.limit, matches, key=key)
@@ -0,0 +1,92 @@
+def _popcount(value):
+    """Number of set bits (int.bit_count needs Python 3.10)"""
+    return bin(value).count('1')
+
+class SeatGrid:
+    """
+    Bit positions for a layout's seats. Every seat gets one bit in seat map
+    order, so each aisle block of a row is a run of consecutive bits and
+    cabins never share a block.
+    Built once per layout and shared by all flights using it.
+    """
+    
+    def __init__(self, rows):
+        self.bits = {}  # seat_number -> bit position
+        self.positions = []  # bit position -> (seat_number, row_label, seat_class)
+        self.class_masks = {}  # seat_class -> mask of that cabin's seats
+        self.block_widths = []  # (first_bit, width) of every aisle block
+        self._run_starts = {}  # count -> mask of bits that start `count` seats within one block
+        
+        for row_label, seat_class, blocks in rows:
+            for block in blocks:
+                self.block_widths.append((len(self.positions), len(block)))
+                for seat_number in block:
+                    position = len(self.positions)
+                    self.bits[seat_number] = position
+                    self.positions.append((seat_number, row_label, seat_class))
+                    self.class_masks[seat_class] = self.class_masks.get(seat_class, 0) | (1 << position)
+        
+        self.full_mask = (1 << len(self.positions)) - 1
+    
+    def run_starts(self, count):
+        """Mask of the bits where `count` seats fit before the block ends"""
+        starts = self._run_starts.get(count)
+        if starts is None:
+            starts = 0
+            for first_bit, width in self.block_widths:
+                if width >= count:
+                    starts |= ((1 << (width - count + 1)) - 1) << first_bit
+            self._run_starts[count] = starts
+        return starts
+    
+    def bitmap(self, taken_seats):
+        """Availability bitmap with every seat in taken_seats cleared"""
+        bits = self.bits
+        taken = sum(1 << bits[seat_number] for seat_number in set(taken_seats) if seat_number in bits)
+        return SeatBitmap(self, self.full_mask & ~taken)
+
+class SeatBitmap:
+    """Free seats of one flight as a single integer, one bit per seat"""
+    
+    def __init__(self, grid, mask):
+        self.grid = grid
+        self.mask = mask
+    
+    def is_free(self, seat_number):
+        bit = self.grid.bits.get(seat_number)
+        return bit is not None and bool(self.mask >> bit & 1)
+    
+    def count(self, seat_class=None):
+        """Free seats, optionally within one cabin"""
+        if seat_class is None:
+            return _popcount(self.mask)
+        return _popcount(self.mask & self.grid.class_masks.get(seat_class, 0))
+    
+    def find_adjacent(self, count, seat_class=None):
+        """
+        Find `count` free seats side by side in one row block (no aisle
+        between them), front rows first.
+        
+        Args:
+            count: Number of seats needed
+            seat_class: Restrict the search to one cabin
+        
+        Returns:
+            (row_label, seat_class, [seat_number, ...]) or None
+        """
+        if count < 1:
+            return None
+        
+        # Bit i survives only if seats i .. i+count-1 are all free and in one block
+        runs = self.mask & self.grid.run_starts(count)
+        for shift in range(1, count):
+            runs &= self.mask >> shift
+        if seat_class:
+            runs &= self.grid.class_masks.get(seat_class, 0)
+        if not runs:
+            return None
+        
+        start = (runs & -runs).bit_length() - 1
+        _, row_label, block_class = self.grid.positions[start]
+        seat_numbers = [self.grid.positions[bit][0] for bit in range(start, start + count)]
+        return row_label, block_class, seat_numbers
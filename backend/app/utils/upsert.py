@@ -0,0 +1,20 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+# INSERT constructs with on_conflict_do_update, per supported database
+_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+def dialect_insert(session):
+    """
+    The session database's insert() construct, which supports
+    .on_conflict_do_update() for INSERT ... ON CONFLICT upserts.
+    
+    Raises:
+        NotImplementedError: If the database has no ON CONFLICT support here
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect not in _INSERTS:
+        raise NotImplementedError(f'Upserts are not supported on {dialect}')
+    return _INSERTS[dialect]
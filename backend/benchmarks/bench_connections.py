@@ -0,0 +1,98 @@
+"""
+Time a whole connection search as the endpoint runs it: load the legs,
+build the departure arrays and find itineraries. Compares the two indexed
+reads in Flight.connection_legs against loading every flight departing in
+the search window as ORM rows.
+
+Run seed_flights.py first; this reads the flights from DATABASE_URL.
+
+Usage: python benchmarks/bench_connections.py [min_layover] [max_layover]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from app.models.flight import Flight
+from app.utils.connections import ConnectionGraph, Leg, SORT_KEYS
+
+
+def search(load, origin, destination, day_start, min_layover, max_layover):
+    legs, fetch_rows = load(origin, destination, day_start, min_layover, max_layover)
+    itineraries = ConnectionGraph(legs).find(
+        origin, destination, day_start, day_start + timedelta(days=1) - timedelta(microseconds=1),
+        min_layover, max_layover, limit=10)
+    fetch_rows({leg.flight for itinerary in itineraries for leg in itinerary})
+    return itineraries
+
+
+def indexed_legs(origin, destination, day_start, min_layover, max_layover):
+    # Full rows are read afterwards, only for the flights in the results
+    legs = Flight.connection_legs(
+        origin, destination, day_start, day_start + timedelta(days=1), min_layover, max_layover)
+    return legs, lambda ids: Flight.query.filter(Flight.id.in_(ids)).all() if ids else []
+
+
+def window_legs(origin, destination, day_start, min_layover, max_layover):
+    # Every flight that could be a leg of any search on the day, as full rows
+    flights = Flight.query.filter(
+        Flight.departure_time >= day_start,
+        Flight.departure_time < day_start + timedelta(days=2) + max_layover
+    ).all()
+    legs = [
+        Leg(flight.source_norm, flight.destination_norm, flight.departure_time,
+            flight.arrival_time, flight.price, flight.seats_available, flight.id)
+        for flight in flights
+    ]
+    return legs, lambda ids: None
+
+
+def main():
+    min_layover = timedelta(minutes=int(sys.argv[1]) if len(sys.argv) > 1 else 45)
+    max_layover = timedelta(minutes=int(sys.argv[2]) if len(sys.argv) > 2 else 360)
+
+    app = create_app()
+    with app.app_context():
+        routes = db.session.execute(
+            db.select(Flight.source_norm, Flight.destination_norm).distinct()
+        ).all()
+        days = sorted({departure.date() for departure, in db.session.execute(db.select(Flight.departure_time))})
+        flight_count = db.session.execute(db.select(db.func.count(Flight.id))).scalar()
+        if not routes:
+            print("No flights found; run seed_flights.py first")
+            return
+
+        cities = sorted({city for route in routes for city in route})
+        direct = set(routes)
+        pairs = [(a, b) for a in cities for b in cities if a != b and (a, b) not in direct]
+        queries = [
+            (a, b, datetime.combine(day, datetime.min.time()))
+            for a, b in pairs[::max(1, len(pairs) // 20)]
+            for day in days[::7]
+        ]
+
+        print(f"{flight_count} flights, {len(cities)} cities, {len(days)} days, "
+              f"{len(queries)} searches between cities with no direct route (load + build + find + result rows each)")
+
+        results = {}
+        for label, load in (('two indexed leg reads', indexed_legs), ('window of ORM rows', window_legs)):
+            db.session.expire_all()
+            started = time.perf_counter()
+            results[label] = [
+                [SORT_KEYS['price'](itinerary) for itinerary in search(load, a, b, start, min_layover, max_layover)]
+                for a, b, start in queries
+            ]
+            seconds = time.perf_counter() - started
+            print(f"  {label:<40} {seconds / len(queries) * 1e3:8.3f} ms/search")
+
+        found = sum(1 for itineraries in results['two indexed leg reads'] if itineraries)
+        same = results['two indexed leg reads'] == results['window of ORM rows']
+        print(f"  {found}/{len(queries)} searches found a connection; results match: {same}")
+
+
+if __name__ == '__main__':
+    main()
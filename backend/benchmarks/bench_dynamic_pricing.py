@@ -0,0 +1,64 @@
+"""
+Compare batch dynamic pricing with NumPy and the pure-Python fallback
+against pricing one flight at a time, on synthetic flights.
+
+Usage: python benchmarks/bench_dynamic_pricing.py [flights]
+"""
+import os
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.dynamic_pricing import CLASS_MULTIPLIERS, calculate_dynamic_price, np, price_fares
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    runs = 20
+    rng = random.Random(7)
+    now = datetime.utcnow()
+
+    flights = []
+    for _ in range(count):
+        total = rng.choice((120, 180, 240))
+        flights.append(SimpleNamespace(
+            price=round(rng.uniform(2000, 15000), 2),
+            seats_total=total,
+            seats_available=rng.randint(0, total),
+            departure_time=now + timedelta(hours=rng.uniform(1, 24 * 30)),
+        ))
+    classes = [rng.choice(list(CLASS_MULTIPLIERS)) for _ in flights]
+    base_prices = [flight.price for flight in flights]
+    occupancies = [(flight.seats_total - flight.seats_available) / flight.seats_total for flight in flights]
+    hours = [(flight.departure_time - now).total_seconds() / 3600 for flight in flights]
+
+    cases = [
+        ('per flight', lambda: [
+            calculate_dynamic_price(flight, seat_class) for flight, seat_class in zip(flights, classes)
+        ]),
+        ('batch, pure python', lambda: price_fares(base_prices, occupancies, hours, classes, engine='python')),
+    ]
+    if np is None:
+        print("numpy is not installed; skipping the vectorized engine")
+    else:
+        cases.append(('batch, numpy', lambda: price_fares(base_prices, occupancies, hours, classes, engine='numpy')))
+
+    print(f"{count} flights, best of {runs} runs")
+    results = {}
+    for label, price in cases:
+        results[label] = price()
+        seconds = min(timeit.repeat(price, number=1, repeat=runs))
+        print(f"  {label:<24} {seconds * 1e3:8.2f} ms")
+
+    batches = [label for label in results if label != 'per flight']
+    # Per-flight pricing reads the clock per call, so compare the batch engines with each other
+    same = all(results[label] == results[batches[0]] for label in batches)
+    print(f"  batch engines agree: {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Compare list payloads built with Flight.to_dict() (full seat map) and
+Flight.to_summary_dict() (availability counts only).
+
+Run seed_flights.py first; this reads the flights from DATABASE_URL.
+
+Usage: python benchmarks/bench_flight_payload.py [flights]
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.models.flight import Flight
+
+
+def measure(query, serialize, runs):
+    # Query and serialize from a clean session each run, as a request would
+    started = time.perf_counter()
+    for _ in range(runs):
+        db.session.remove()
+        body = json.dumps({'flights': [serialize(flight) for flight in query().all()]})
+    return len(body), (time.perf_counter() - started) / runs
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    runs = 20
+
+    app = create_app()
+    with app.app_context():
+        def query():
+            return Flight.query.order_by(Flight.departure_time, Flight.id).limit(count)
+
+        if not query().count():
+            print("No flights found; run seed_flights.py first")
+            return
+
+        print(f"{count} flights per list, {runs} runs each")
+        for label, serialize in (
+            ('to_dict (with seat map)', Flight.to_dict),
+            ('to_summary_dict', Flight.to_summary_dict),
+        ):
+            size, seconds = measure(query, serialize, runs)
+            print(f"  {label:<28} {size / 1024:9.1f} KiB {seconds * 1e3:9.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
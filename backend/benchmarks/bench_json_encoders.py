@@ -0,0 +1,54 @@
+"""
+Compare the response encoders in app.utils.reponse_handler against Flask's
+default JSON provider on search results and seat maps.
+
+Run seed_flights.py first; this reads the flights from DATABASE_URL.
+
+Usage: python benchmarks/bench_json_encoders.py [flights]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider
+from app import create_app
+from app.models.flight import Flight
+from app.utils.reponse_handler import ENCODERS, get_encoder, orjson
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    runs = 200
+
+    app = create_app()
+    with app.app_context():
+        flights = Flight.query.order_by(Flight.departure_time, Flight.id).limit(count).all()
+        if not flights:
+            print("No flights found; run seed_flights.py first")
+            return
+        payloads = [
+            (f'search results ({len(flights)} summaries)', {'flights': [flight.to_summary_dict() for flight in flights]}),
+            ('seat map (1 flight)', {'flight': flights[0].to_dict()}),
+            (f'seat maps ({len(flights)} flights)', {'flights': [flight.to_dict() for flight in flights]}),
+        ]
+
+        encoders = [('flask default', DefaultJSONProvider(app).dumps)]
+        for name in ENCODERS:
+            if name == 'orjson' and orjson is None:
+                print("orjson is not installed; skipping it")
+                continue
+            encoders.append((name, get_encoder(name).dumps_bytes))
+
+        print(f"{runs} runs each")
+        for label, payload in payloads:
+            print(f"  {label}")
+            for name, dumps in encoders:
+                size = len(dumps(payload))
+                seconds = timeit.timeit(lambda: dumps(payload), number=runs) / runs
+                print(f"    {name:<16} {size / 1024:9.1f} KiB {seconds * 1e3:9.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
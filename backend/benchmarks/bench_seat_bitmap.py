@@ -0,0 +1,68 @@
+"""
+Compare the seat bitmap against scanning the seat map dict.
+
+Usage: python benchmarks/bench_seat_bitmap.py [occupancy]
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.aircraft_layout import SeatPlan, STANDARD_CABINS
+
+
+def build_seat_map(plan, taken):
+    # The {"1A": {"status": ..., "type": ...}} map Flight.seats returns
+    return {
+        seat_number: {'status': 'booked' if seat_number in taken else 'available', 'type': seat_class}
+        for seat_number, seat_class in plan.seats
+    }
+
+
+def scan_available(seat_map):
+    # What get_available_seats() amounts to on the seat map
+    return [seat_number for seat_number, data in seat_map.items() if data['status'] == 'available']
+
+
+def scan_adjacent(seat_map, count, seat_class):
+    # Trial and error over the flat list: group free seats by row, look for a run
+    rows = {}
+    for seat_number in scan_available(seat_map):
+        if seat_map[seat_number]['type'] == seat_class:
+            rows.setdefault(seat_number[:-1], []).append(seat_number)
+    for row in sorted(rows, key=int):
+        letters = [seat_number[-1] for seat_number in rows[row]]
+        for start in range(len(letters) - count + 1):
+            window = letters[start:start + count]
+            if all(ord(b) - ord(a) == 1 for a, b in zip(window, window[1:])):
+                return rows[row][start:start + count]
+    return None
+
+
+def main():
+    occupancy = float(sys.argv[1]) if len(sys.argv) > 1 else 0.8
+    plan = SeatPlan(STANDARD_CABINS)
+    random.seed(42)
+    taken = set(random.sample([seat_number for seat_number, _ in plan.seats], int(len(plan.seats) * occupancy)))
+    seat_map = build_seat_map(plan, taken)
+    bitmap = plan.grid.bitmap(taken)
+
+    runs = 20000
+    cases = [
+        ('count free seats (dict scan)', lambda: len(scan_available(seat_map))),
+        ('count free seats (popcount)', lambda: bitmap.count()),
+        ('find 3 adjacent economy (dict scan)', lambda: scan_adjacent(seat_map, 3, 'economy')),
+        ('find 3 adjacent economy (bitmap)', lambda: bitmap.find_adjacent(3, 'economy')),
+        ('build bitmap from taken seats', lambda: plan.grid.bitmap(taken)),
+    ]
+
+    print(f"{len(plan.seats)} seats, {len(taken)} taken, {runs} runs each")
+    for label, func in cases:
+        seconds = timeit.timeit(func, number=runs)
+        print(f"  {label:<40} {seconds / runs * 1e6:8.2f} us")
+
+
+if __name__ == '__main__':
+    main()
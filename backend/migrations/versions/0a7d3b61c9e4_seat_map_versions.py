@@ -0,0 +1,47 @@
+"""Seat map versions and change log
+
+Revision ID: 0a7d3b61c9e4
+Revises: f2c94b7a3d15
+Create Date: 2026-10-18 14:52:08.317540
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a7d3b61c9e4'
+down_revision = 'f2c94b7a3d15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('seat_changes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('flight_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('seat_number', sa.String(length=10), nullable=False),
+    sa.Column('seat_class', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('holder', sa.String(length=200), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['flight_id'], ['flights.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('seat_changes', schema=None) as batch_op:
+        batch_op.create_index('ix_seat_changes_flight_version', ['flight_id', 'version'], unique=False)
+
+    # Existing flights start at version 1 with no log, so pollers begin with a full map
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('seat_version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        batch_op.drop_column('seat_version')
+
+    with op.batch_alter_table('seat_changes', schema=None) as batch_op:
+        batch_op.drop_index('ix_seat_changes_flight_version')
+
+    op.drop_table('seat_changes')
@@ -0,0 +1,48 @@
+"""Normalized route columns and search index
+
+Revision ID: 1c5e8f2a7b90
+Revises: 0a7d3b61c9e4
+Create Date: 2026-10-18 15:37:44.602918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c5e8f2a7b90'
+down_revision = '0a7d3b61c9e4'
+branch_labels = None
+depends_on = None
+
+
+def _normalize_city(name):
+    # Same as Flight.normalize_city at this revision
+    return ' '.join((name or '').split()).casefold()
+
+
+def upgrade():
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('source_norm', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('destination_norm', sa.String(length=100), nullable=True))
+
+    bind = op.get_bind()
+    for flight_id, source, destination in bind.execute(
+        sa.text('SELECT id, source, destination FROM flights')
+    ).fetchall():
+        bind.execute(
+            sa.text('UPDATE flights SET source_norm = :source, destination_norm = :destination WHERE id = :id'),
+            {'source': _normalize_city(source), 'destination': _normalize_city(destination), 'id': flight_id}
+        )
+
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        batch_op.alter_column('source_norm', existing_type=sa.String(length=100), nullable=False)
+        batch_op.alter_column('destination_norm', existing_type=sa.String(length=100), nullable=False)
+        batch_op.create_index('ix_flights_route_departure', ['source_norm', 'destination_norm', 'departure_time'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        batch_op.drop_index('ix_flights_route_departure')
+        batch_op.drop_column('destination_norm')
+        batch_op.drop_column('source_norm')
@@ -0,0 +1,43 @@
+"""Route day fares calendar
+
+Revision ID: 2d9b4e6c1f38
+Revises: 1c5e8f2a7b90
+Create Date: 2026-10-18 16:48:13.275061
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d9b4e6c1f38'
+down_revision = '1c5e8f2a7b90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('route_day_fares',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source_norm', sa.String(length=100), nullable=False),
+    sa.Column('destination_norm', sa.String(length=100), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('min_fare', sa.Float(), nullable=False),
+    sa.Column('flight_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source_norm', 'destination_norm', 'day', name='uq_route_day_fares_route_day')
+    )
+
+    # Build the calendar for existing flights in one pass
+    op.execute("""
+        INSERT INTO route_day_fares (source_norm, destination_norm, day, min_fare, flight_count, updated_at)
+        SELECT source_norm, destination_norm, date(departure_time), MIN(price), COUNT(id), CURRENT_TIMESTAMP
+        FROM flights
+        WHERE seats_available > 0
+        GROUP BY source_norm, destination_norm, date(departure_time)
+    """)
+
+
+def downgrade():
+    op.drop_table('route_day_fares')
@@ -0,0 +1,34 @@
+"""Keyset pagination indexes for flight and booking listings
+
+Revision ID: 3e7a1c5d9b42
+Revises: 2d9b4e6c1f38
+Create Date: 2026-10-18 17:21:40.513208
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e7a1c5d9b42'
+down_revision = '2d9b4e6c1f38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        batch_op.create_index('ix_flights_departure_id', ['departure_time', 'id'], unique=False)
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.create_index('ix_bookings_booking_date_id', ['booking_date', 'id'], unique=False)
+        batch_op.create_index('ix_bookings_user_booking_date_id', ['user_id', 'booking_date', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_index('ix_bookings_user_booking_date_id')
+        batch_op.drop_index('ix_bookings_booking_date_id')
+
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        batch_op.drop_index('ix_flights_departure_id')
@@ -0,0 +1,106 @@
+"""Airport directory and IATA route keys
+
+Revision ID: 4b8d2f6a0c17
+Revises: 3e7a1c5d9b42
+Create Date: 2026-10-18 17:52:06.318774
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b8d2f6a0c17'
+down_revision = '3e7a1c5d9b42'
+branch_labels = None
+depends_on = None
+
+
+AIRPORTS = [
+    ('BOM', 'Mumbai', 'Chhatrapati Shivaji Maharaj International Airport', ['Bombay']),
+    ('DEL', 'Delhi', 'Indira Gandhi International Airport', ['New Delhi']),
+    ('BLR', 'Bangalore', 'Kempegowda International Airport', ['Bengaluru']),
+    ('HYD', 'Hyderabad', 'Rajiv Gandhi International Airport', []),
+    ('MAA', 'Chennai', 'Chennai International Airport', ['Madras']),
+    ('CCU', 'Kolkata', 'Netaji Subhas Chandra Bose International Airport', ['Calcutta']),
+    ('PNQ', 'Pune', 'Pune Airport', ['Poona']),
+    ('AMD', 'Ahmedabad', 'Sardar Vallabhbhai Patel International Airport', []),
+    ('JAI', 'Jaipur', 'Jaipur International Airport', []),
+    ('LKO', 'Lucknow', 'Chaudhary Charan Singh International Airport', []),
+    ('COK', 'Kochi', 'Cochin International Airport', ['Cochin']),
+    ('GOI', 'Goa', 'Dabolim Airport', ['Dabolim']),
+    ('IXC', 'Chandigarh', 'Chandigarh International Airport', []),
+    ('SXR', 'Srinagar', 'Sheikh ul-Alam International Airport', []),
+    ('ATQ', 'Amritsar', 'Sri Guru Ram Dass Jee International Airport', []),
+    ('BBI', 'Bhubaneswar', 'Biju Patnaik International Airport', []),
+    ('IDR', 'Indore', 'Devi Ahilya Bai Holkar Airport', []),
+    ('CJB', 'Coimbatore', 'Coimbatore International Airport', []),
+    ('BDQ', 'Vadodara', 'Vadodara Airport', ['Baroda']),
+    ('NAG', 'Nagpur', 'Dr. Babasaheb Ambedkar International Airport', []),
+]
+
+
+def _normalize_term(name):
+    # Same as app.utils.airport_directory.normalize_term at this revision
+    return ' '.join((name or '').split()).casefold()
+
+
+def _rebuild_route_day_fares():
+    op.execute('DELETE FROM route_day_fares')
+    op.execute("""
+        INSERT INTO route_day_fares (source_norm, destination_norm, day, min_fare, flight_count, updated_at)
+        SELECT source_norm, destination_norm, date(departure_time), MIN(price), COUNT(id), CURRENT_TIMESTAMP
+        FROM flights
+        WHERE seats_available > 0
+        GROUP BY source_norm, destination_norm, date(departure_time)
+    """)
+
+
+def upgrade():
+    airports = op.create_table('airports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=3), nullable=False),
+    sa.Column('city', sa.String(length=100), nullable=False),
+    sa.Column('name', sa.String(length=150), nullable=False),
+    sa.Column('aliases', sa.JSON(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('airports', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_airports_code'), ['code'], unique=True)
+
+    op.bulk_insert(airports, [
+        {'code': code, 'city': city, 'name': name, 'aliases': aliases}
+        for code, city, name, aliases in AIRPORTS
+    ])
+
+    # Route keys of known cities become their IATA code
+    bind = op.get_bind()
+    for code, city, name, aliases in AIRPORTS:
+        terms = sorted({_normalize_term(term) for term in (code, city, name, *aliases)})
+        for column in ('source_norm', 'destination_norm'):
+            bind.execute(
+                sa.text(f'UPDATE flights SET {column} = :code WHERE {column} IN :terms').bindparams(
+                    sa.bindparam('terms', expanding=True)
+                ),
+                {'code': code, 'terms': terms}
+            )
+
+    _rebuild_route_day_fares()
+
+
+def downgrade():
+    bind = op.get_bind()
+    for flight_id, source, destination in bind.execute(
+        sa.text('SELECT id, source, destination FROM flights')
+    ).fetchall():
+        bind.execute(
+            sa.text('UPDATE flights SET source_norm = :source, destination_norm = :destination WHERE id = :id'),
+            {'source': _normalize_term(source), 'destination': _normalize_term(destination), 'id': flight_id}
+        )
+
+    _rebuild_route_day_fares()
+
+    with op.batch_alter_table('airports', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_airports_code'))
+
+    op.drop_table('airports')
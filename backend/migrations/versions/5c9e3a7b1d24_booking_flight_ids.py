@@ -0,0 +1,39 @@
+"""Point bookings at flights by primary key
+
+Revision ID: 5c9e3a7b1d24
+Revises: 4b8d2f6a0c17
+Create Date: 2026-10-18 18:26:51.740193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c9e3a7b1d24'
+down_revision = '4b8d2f6a0c17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Bookings made through /api/bookings stored the flight code (e.g. "AI101")
+    # in the integer flight_id column, which only SQLite accepts; resolve
+    # those to the flight's id
+    op.execute("""
+        UPDATE bookings
+        SET flight_id = (
+            SELECT flights.id FROM flights
+            WHERE flights.flight_id = CAST(bookings.flight_id AS VARCHAR(50))
+        )
+        WHERE flight_id NOT IN (SELECT id FROM flights)
+        AND EXISTS (
+            SELECT 1 FROM flights
+            WHERE flights.flight_id = CAST(bookings.flight_id AS VARCHAR(50))
+        )
+    """)
+
+
+def downgrade():
+    # Rows keep pointing at flights by id, which the old code also reads
+    pass
@@ -0,0 +1,32 @@
+"""Record the fare charged on each booking and the quote that paid it
+
+Revision ID: 6d1f4b8e2a35
+Revises: 5c9e3a7b1d24
+Create Date: 2026-10-18 19:12:07.318405
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d1f4b8e2a35'
+down_revision = '5c9e3a7b1d24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Nullable: bookings made before fares were recorded have no total,
+    # and bookings priced without a quote have no quote_id
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_price', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('quote_id', sa.String(length=512), nullable=True))
+        batch_op.create_unique_constraint('uq_bookings_quote_id', ['quote_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_bookings_quote_id', type_='unique')
+        batch_op.drop_column('quote_id')
+        batch_op.drop_column('total_price')
@@ -0,0 +1,42 @@
+"""Precomputed fare per flight and cabin
+
+Revision ID: 7e2a5c9d3f41
+Revises: 6d1f4b8e2a35
+Create Date: 2026-10-18 19:58:42.604817
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e2a5c9d3f41'
+down_revision = '6d1f4b8e2a35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('flight_fares',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('flight_id', sa.Integer(), nullable=False),
+    sa.Column('seat_class', sa.String(length=20), nullable=False),
+    sa.Column('fare', sa.Float(), nullable=False),
+    sa.Column('reprice_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['flight_id'], ['flights.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('flight_id', 'seat_class', name='uq_flight_fares_flight_class')
+    )
+    with op.batch_alter_table('flight_fares', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_flight_fares_reprice_at'), ['reprice_at'], unique=False)
+
+    # Fares come from the pricing rules in app code; fill the table with
+    # `python sweep_fares.py --rebuild`. Until then readers price on the spot.
+
+
+def downgrade():
+    with op.batch_alter_table('flight_fares', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_flight_fares_reprice_at'))
+
+    op.drop_table('flight_fares')
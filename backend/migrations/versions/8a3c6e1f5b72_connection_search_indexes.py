@@ -0,0 +1,28 @@
+"""Indexes for connection search legs
+
+Revision ID: 8a3c6e1f5b72
+Revises: 7e2a5c9d3f41
+Create Date: 2026-10-18 21:12:07.318554
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a3c6e1f5b72'
+down_revision = '7e2a5c9d3f41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        batch_op.create_index('ix_flights_source_departure', ['source_norm', 'departure_time'], unique=False)
+        batch_op.create_index('ix_flights_destination_departure', ['destination_norm', 'departure_time'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        batch_op.drop_index('ix_flights_destination_departure')
+        batch_op.drop_index('ix_flights_source_departure')
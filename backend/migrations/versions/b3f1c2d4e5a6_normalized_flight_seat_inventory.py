@@ -0,0 +1,90 @@
+"""Normalized flight seat inventory
+
+Revision ID: b3f1c2d4e5a6
+Revises: a8d59c952a99
+Create Date: 2026-10-18 09:12:40.114203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import json
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f1c2d4e5a6'
+down_revision = 'a8d59c952a99'
+branch_labels = None
+depends_on = None
+
+
+def _load_seat_map(value):
+    if value is None:
+        return {}
+    if isinstance(value, str):
+        return json.loads(value) if value else {}
+    return value
+
+
+def upgrade():
+    flight_seats = op.create_table('flight_seats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('flight_id', sa.Integer(), nullable=False),
+    sa.Column('seat_number', sa.String(length=10), nullable=False),
+    sa.Column('seat_class', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('holder', sa.String(length=200), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['flight_id'], ['flights.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('flight_id', 'seat_number', name='uq_flight_seats_flight_seat')
+    )
+    with op.batch_alter_table('flight_seats', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_flight_seats_flight_id'), ['flight_id'], unique=False)
+
+    # Move every seat out of the JSON blob, one flight at a time
+    bind = op.get_bind()
+    flights = bind.execute(sa.text('SELECT id, seats FROM flights')).fetchall()
+    for flight_id, seats in flights:
+        rows = [
+            {
+                'flight_id': flight_id,
+                'seat_number': seat_number,
+                'seat_class': data.get('type', 'economy'),
+                'status': data.get('status', 'available'),
+                'holder': data.get('passenger'),
+            }
+            for seat_number, data in _load_seat_map(seats).items()
+        ]
+        if rows:
+            op.bulk_insert(flight_seats, rows)
+
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        batch_op.drop_column('seats')
+
+
+def downgrade():
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('seats', sa.JSON(), nullable=True))
+
+    # Rebuild the JSON blob from the inventory rows
+    bind = op.get_bind()
+    seat_maps = {}
+    rows = bind.execute(sa.text(
+        'SELECT flight_id, seat_number, seat_class, status, holder FROM flight_seats ORDER BY id'
+    )).fetchall()
+    for flight_id, seat_number, seat_class, status, holder in rows:
+        seat = {'status': status, 'type': seat_class}
+        if holder:
+            seat['passenger'] = holder
+        seat_maps.setdefault(flight_id, {})[seat_number] = seat
+
+    for flight_id, seats in seat_maps.items():
+        bind.execute(
+            sa.text('UPDATE flights SET seats = :seats WHERE id = :id'),
+            {'seats': json.dumps(seats), 'id': flight_id}
+        )
+
+    with op.batch_alter_table('flight_seats', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_flight_seats_flight_id'))
+
+    op.drop_table('flight_seats')
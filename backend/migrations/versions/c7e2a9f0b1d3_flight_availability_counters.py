@@ -0,0 +1,54 @@
+"""Flight availability counters
+
+Revision ID: c7e2a9f0b1d3
+Revises: b3f1c2d4e5a6
+Create Date: 2026-10-18 10:03:18.552917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2a9f0b1d3'
+down_revision = 'b3f1c2d4e5a6'
+branch_labels = None
+depends_on = None
+
+COUNTER_COLUMNS = (
+    'seats_total',
+    'seats_available',
+    'business_available',
+    'premium_economy_available',
+    'economy_available',
+)
+
+
+def upgrade():
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        for column in COUNTER_COLUMNS:
+            batch_op.add_column(sa.Column(column, sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill the counters from the seat inventory in one pass
+    op.execute("""
+        UPDATE flights SET
+            seats_total = (SELECT COUNT(*) FROM flight_seats s
+                           WHERE s.flight_id = flights.id),
+            seats_available = (SELECT COUNT(*) FROM flight_seats s
+                               WHERE s.flight_id = flights.id AND s.status = 'available'),
+            business_available = (SELECT COUNT(*) FROM flight_seats s
+                                   WHERE s.flight_id = flights.id AND s.status = 'available'
+                                   AND s.seat_class = 'business'),
+            premium_economy_available = (SELECT COUNT(*) FROM flight_seats s
+                                         WHERE s.flight_id = flights.id AND s.status = 'available'
+                                         AND s.seat_class = 'premium_economy'),
+            economy_available = (SELECT COUNT(*) FROM flight_seats s
+                                 WHERE s.flight_id = flights.id AND s.status = 'available'
+                                 AND s.seat_class = 'economy')
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        for column in reversed(COUNTER_COLUMNS):
+            batch_op.drop_column(column)
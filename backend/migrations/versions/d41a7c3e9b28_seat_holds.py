@@ -0,0 +1,54 @@
+"""Seat holds
+
+Revision ID: d41a7c3e9b28
+Revises: c7e2a9f0b1d3
+Create Date: 2026-10-18 11:26:51.037720
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41a7c3e9b28'
+down_revision = 'c7e2a9f0b1d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('flight_seats', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('hold_token', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('hold_expires_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_flight_seats_hold_token'), ['hold_token'], unique=False)
+        batch_op.create_index(batch_op.f('ix_flight_seats_hold_expires_at'), ['hold_expires_at'], unique=False)
+
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('seats_held', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    # Held seats become available again when holds are removed
+    op.execute("UPDATE flight_seats SET status = 'available' WHERE status = 'held'")
+    for column, seat_class in (
+        ('seats_available', None),
+        ('business_available', 'business'),
+        ('premium_economy_available', 'premium_economy'),
+        ('economy_available', 'economy'),
+    ):
+        class_filter = f"AND s.seat_class = '{seat_class}'" if seat_class else ''
+        op.execute(f"""
+            UPDATE flights SET {column} = (
+                SELECT COUNT(*) FROM flight_seats s
+                WHERE s.flight_id = flights.id AND s.status = 'available' {class_filter}
+            )
+        """)
+
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        batch_op.drop_column('seats_held')
+
+    with op.batch_alter_table('flight_seats', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_flight_seats_hold_expires_at'))
+        batch_op.drop_index(batch_op.f('ix_flight_seats_hold_token'))
+        batch_op.drop_column('hold_expires_at')
+        batch_op.drop_column('hold_token')
@@ -0,0 +1,43 @@
+"""Booking passengers
+
+Revision ID: e58b2d6f1a94
+Revises: d41a7c3e9b28
+Create Date: 2026-10-18 12:14:07.662381
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e58b2d6f1a94'
+down_revision = 'd41a7c3e9b28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('booking_passengers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('booking_id', sa.Integer(), nullable=False),
+    sa.Column('passenger_name', sa.String(length=200), nullable=False),
+    sa.Column('seat_number', sa.String(length=10), nullable=False),
+    sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('booking_id', 'seat_number', name='uq_booking_passengers_booking_seat')
+    )
+    with op.batch_alter_table('booking_passengers', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_booking_passengers_booking_id'), ['booking_id'], unique=False)
+
+    # Existing single-passenger bookings get their one passenger row
+    op.execute("""
+        INSERT INTO booking_passengers (booking_id, passenger_name, seat_number)
+        SELECT id, passenger_name, seat_number FROM bookings
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('booking_passengers', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_booking_passengers_booking_id'))
+
+    op.drop_table('booking_passengers')
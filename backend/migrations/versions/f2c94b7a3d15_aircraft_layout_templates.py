@@ -0,0 +1,170 @@
+"""Aircraft layout templates
+
+Revision ID: f2c94b7a3d15
+Revises: e58b2d6f1a94
+Create Date: 2026-10-18 13:41:22.905316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import datetime
+import hashlib
+import json
+import re
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c94b7a3d15'
+down_revision = 'e58b2d6f1a94'
+branch_labels = None
+depends_on = None
+
+# Copied from app.models.aircraft_layout as it stood for this revision
+SEAT_NUMBER = re.compile(r'^(\d+)([A-Z]+)$')
+STANDARD_LAYOUT_CODE = 'STD-170'
+STANDARD_CABINS = [
+    {'class': 'business', 'rows': [1, 5], 'letters': 'AB CD'},
+    {'class': 'premium_economy', 'rows': [6, 10], 'letters': 'ABC DEF'},
+    {'class': 'economy', 'rows': [11, 30], 'letters': 'ABC DEF'},
+]
+
+
+def _cabins_from_seats(seats):
+    rows = []
+    loose = []
+    for seat_number, seat_class in seats:
+        match = SEAT_NUMBER.match(seat_number)
+        if not match or len(match.group(2)) != 1:
+            loose.append((seat_number, seat_class))
+            continue
+        row, letter = int(match.group(1)), match.group(2)
+        if rows and rows[-1][0] == row and rows[-1][1] == seat_class:
+            rows[-1] = (row, seat_class, rows[-1][2] + letter)
+        else:
+            rows.append((row, seat_class, letter))
+
+    cabins = []
+    for row, seat_class, letters in rows:
+        last = cabins[-1] if cabins else None
+        if last and last['class'] == seat_class and last['letters'] == letters and last['rows'][1] == row - 1:
+            last['rows'][1] = row
+        else:
+            cabins.append({'class': seat_class, 'rows': [row, row], 'letters': letters})
+
+    for seat_number, seat_class in loose:
+        if cabins and 'seats' in cabins[-1] and cabins[-1]['class'] == seat_class:
+            cabins[-1]['seats'].append(seat_number)
+        else:
+            cabins.append({'class': seat_class, 'seats': [seat_number]})
+    return cabins
+
+
+def _seats_from_cabins(cabins):
+    seats = []
+    for cabin in cabins:
+        if 'seats' in cabin:
+            seats.extend((seat_number, cabin['class']) for seat_number in cabin['seats'])
+            continue
+        first, last = cabin['rows']
+        for row in range(first, last + 1):
+            for letter in cabin['letters'].replace(' ', ''):
+                seats.append((f"{row}{letter}", cabin['class']))
+    return seats
+
+
+def _layout_key(cabins):
+    unaisled = [dict(cabin, letters=cabin['letters'].replace(' ', '')) for cabin in STANDARD_CABINS]
+    if cabins == STANDARD_CABINS or cabins == unaisled:
+        return STANDARD_LAYOUT_CODE, 'Standard 3-class (170 seats)', STANDARD_CABINS
+    fingerprint = hashlib.sha1(json.dumps(cabins, sort_keys=True).encode()).hexdigest()[:12]
+    return f'CUSTOM-{fingerprint}', f'Custom ({len(_seats_from_cabins(cabins))} seats)', cabins
+
+
+def upgrade():
+    layouts = op.create_table('aircraft_layouts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=50), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('cabins', sa.JSON(), nullable=False),
+    sa.Column('seat_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('aircraft_layouts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_aircraft_layouts_code'), ['code'], unique=True)
+
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('layout_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_flights_layout_id'), ['layout_id'], unique=False)
+        batch_op.create_foreign_key('fk_flights_layout_id', 'aircraft_layouts', ['layout_id'], ['id'])
+
+    # Derive each flight's layout from its full seat inventory
+    bind = op.get_bind()
+    seats_by_flight = {}
+    for flight_id, seat_number, seat_class in bind.execute(sa.text(
+        'SELECT flight_id, seat_number, seat_class FROM flight_seats ORDER BY flight_id, id'
+    )):
+        seats_by_flight.setdefault(flight_id, []).append((seat_number, seat_class))
+
+    layout_ids = {}
+    for flight_id, seats in seats_by_flight.items():
+        code, name, cabins = _layout_key(_cabins_from_seats(seats))
+        if code not in layout_ids:
+            op.bulk_insert(layouts, [{
+                'code': code,
+                'name': name,
+                'cabins': cabins,
+                'seat_count': len(seats),
+                'created_at': datetime.utcnow(),
+            }])
+            layout_ids[code] = bind.execute(
+                sa.text('SELECT id FROM aircraft_layouts WHERE code = :code'), {'code': code}
+            ).scalar()
+        bind.execute(
+            sa.text('UPDATE flights SET layout_id = :layout_id WHERE id = :id'),
+            {'layout_id': layout_ids[code], 'id': flight_id}
+        )
+
+    # Available seats now come from the layout; keep rows only for the rest
+    op.execute("DELETE FROM flight_seats WHERE status = 'available'")
+
+
+def downgrade():
+    # Materialize a row for every available seat again
+    bind = op.get_bind()
+    layouts = {
+        layout_id: json.loads(cabins) if isinstance(cabins, str) else cabins
+        for layout_id, cabins in bind.execute(sa.text('SELECT id, cabins FROM aircraft_layouts'))
+    }
+    taken = {}
+    for flight_id, seat_number in bind.execute(sa.text('SELECT flight_id, seat_number FROM flight_seats')):
+        taken.setdefault(flight_id, set()).add(seat_number)
+
+    for flight_id, layout_id in bind.execute(
+        sa.text('SELECT id, layout_id FROM flights WHERE layout_id IS NOT NULL')
+    ).fetchall():
+        rows = [
+            {
+                'flight_id': flight_id,
+                'seat_number': seat_number,
+                'seat_class': seat_class,
+                'status': 'available',
+            }
+            for seat_number, seat_class in _seats_from_cabins(layouts[layout_id])
+            if seat_number not in taken.get(flight_id, ())
+        ]
+        if rows:
+            bind.execute(sa.text(
+                'INSERT INTO flight_seats (flight_id, seat_number, seat_class, status) '
+                'VALUES (:flight_id, :seat_number, :seat_class, :status)'
+            ), rows)
+
+    with op.batch_alter_table('flights', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_flights_layout_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_flights_layout_id'))
+        batch_op.drop_column('layout_id')
+
+    with op.batch_alter_table('aircraft_layouts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_aircraft_layouts_code'))
+
+    op.drop_table('aircraft_layouts')
@@ -1,5 +1,6 @@
 from app import create_app, db
 from app.models.flight import Flight
+from app.models.flight_seat import FlightSeat
 
 app = create_app()
 
@@ -8,52 +9,27 @@ def reset_all_seats():
     with app.app_context():
         print("🔄 Resetting all seats to available...")
         
-        # Generate fresh seats layout
-        def generate_seats():
-            seats = {}
-            # Business class (rows 1-5): A, B, C, D
-            for row in range(1, 6):
-                for letter in ['A', 'B', 'C', 'D']:
-                    seat = f"{row}{letter}"
-                    seats[seat] = {'status': 'available', 'type': 'business'}
-            
-            # Premium Economy (rows 6-10): A, B, C, D, E, F
-            for row in range(6, 11):
-                for letter in ['A', 'B', 'C', 'D', 'E', 'F']:
-                    seat = f"{row}{letter}"
-                    seats[seat] = {'status': 'available', 'type': 'premium_economy'}
-            
-            # Economy class (rows 11-30): A, B, C, D, E, F
-            for row in range(11, 31):
-                for letter in ['A', 'B', 'C', 'D', 'E', 'F']:
-                    seat = f"{row}{letter}"
-                    seats[seat] = {'status': 'available', 'type': 'economy'}
-            
-            return seats
+        total_flights = Flight.query.count()
+        print(f"📊 Found {total_flights} flights")
         
-        # Get all flights
-        flights = Flight.query.all()
-        total_flights = len(flights)
+        # Seats without a row are available, so clearing the rows resets every flight
+        reset_count = FlightSeat.query.delete(synchronize_session=False)
+        print(f"🎫 Released {reset_count} seats")
         
-        print(f"📊 Found {total_flights} flights")
-        print(f"🎫 Resetting seats for each flight (170 seats per flight)...")
+        # Bring the availability counters back in line with the inventory
+        Flight.refresh_seat_counters()
+        
+        # New versions with no change log entries make polling clients reload the full map
+        Flight.query.update({Flight.seat_version: Flight.seat_version + 1}, synchronize_session=False)
         
-        # Reset seats for each flight
-        fresh_seats = generate_seats()
-        for i, flight in enumerate(flights, 1):
-            flight.seats = fresh_seats.copy()
-            
-            if i % 100 == 0:
-                print(f"   ✓ Processed {i}/{total_flights} flights")
+        # Every flight is back in its lowest occupancy tier; the commit also puts
+        # sold-out days back on sale in the fare calendar for every repriced route
+        Flight.refresh_fares(db.session.execute(db.select(Flight.id)).scalars().all())
         
         # Commit all changes
         db.session.commit()
         
         print(f"\n✅ Successfully reset {total_flights} flights!")
-        print(f"💺 Each flight now has 170 available seats")
-        print(f"   - Business: 20 seats (rows 1-5)")
-        print(f"   - Premium Economy: 30 seats (rows 6-10)")
-        print(f"   - Economy: 120 seats (rows 11-30)")
         print(f"\n🎉 All flights are now bookable!")
 
 if __name__ == '__main__':
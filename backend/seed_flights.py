@@ -1,5 +1,12 @@
 from app import create_app, db
 from app.models.flight import Flight
+from app.models.aircraft_layout import AircraftLayout
+from app.models.booking import Booking
+from app.models.booking_passenger import BookingPassenger
+from app.models.flight_fare import FlightFare
+from app.models.flight_seat import FlightSeat
+from app.models.route_day_fare import RouteDayFare
+from app.models.seat_change import SeatChange
 from datetime import datetime, timedelta
 import random
 
@@ -7,32 +14,16 @@ app = create_app()
 
 def seed_flights():
     with app.app_context():
-        # Clear existing flights
+        # Clear existing flights. Bulk deletes skip ORM cascades (and SQLite doesn't
+        # enforce ON DELETE CASCADE), so every table keyed on a flight goes first;
+        # otherwise reused flight ids would inherit the old seats, fares and bookings.
+        # The fare calendar is rebuilt by the commit hooks as the new flights go in.
         print("🗑️  Clearing existing flights...")
-        Flight.query.delete()
+        for model in (BookingPassenger, Booking, SeatChange, FlightSeat, FlightFare, RouteDayFare, Flight):
+            model.query.delete(synchronize_session=False)
         
-        # Generate seats layout
-        def generate_seats():
-            seats = {}
-            # Business class (rows 1-5): A, B, C, D
-            for row in range(1, 6):
-                for letter in ['A', 'B', 'C', 'D']:
-                    seat = f"{row}{letter}"
-                    seats[seat] = {'status': 'available', 'type': 'business'}
-            
-            # Premium Economy (rows 6-10): A, B, C, D, E, F
-            for row in range(6, 11):
-                for letter in ['A', 'B', 'C', 'D', 'E', 'F']:
-                    seat = f"{row}{letter}"
-                    seats[seat] = {'status': 'available', 'type': 'premium_economy'}
-            
-            # Economy class (rows 11-30): A, B, C, D, E, F
-            for row in range(11, 31):
-                for letter in ['A', 'B', 'C', 'D', 'E', 'F']:
-                    seat = f"{row}{letter}"
-                    seats[seat] = {'status': 'available', 'type': 'economy'}
-            
-            return seats
+        # Every seeded flight shares the standard three-cabin layout
+        layout = AircraftLayout.standard()
         
         # Airlines with their characteristics
         airlines_info = {
@@ -231,9 +222,9 @@ def seed_flights():
                     destination=flight_data['destination'],
                     departure_time=flight_data['departure_time'],
                     arrival_time=flight_data['arrival_time'],
-                    price=flight_data['price'],
-                    seats=generate_seats()
+                    price=flight_data['price']
                 )
+                flight.apply_layout(layout)
                 db.session.add(flight)
             
             # Commit each batch
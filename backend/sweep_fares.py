@@ -0,0 +1,35 @@
+from app import create_app, db
+from app.models.flight import Flight
+import sys
+import time
+
+app = create_app()
+
+def sweep_fare_buckets(interval=None):
+    """Reprice flights whose time-to-departure bucket changed; loop every `interval` seconds if given"""
+    with app.app_context():
+        batch_size = app.config['FARE_SWEEP_BATCH']
+        
+        while True:
+            repriced = Flight.reprice_due_fares(batch_size=batch_size)
+            print(f"💸 Repriced {repriced} flights")
+            
+            if not interval:
+                break
+            db.session.remove()
+            time.sleep(interval)
+
+def rebuild_fares():
+    """Price every flight into flight_fares, e.g. after migrating or changing the pricing rules"""
+    with app.app_context():
+        flight_ids = db.session.execute(db.select(Flight.id)).scalars().all()
+        Flight.refresh_fares(flight_ids)
+        db.session.commit()
+        print(f"💸 Priced {len(flight_ids)} flights")
+
+if __name__ == '__main__':
+    # Usage: python sweep_fares.py [interval_seconds] | --rebuild
+    if sys.argv[1:] == ['--rebuild']:
+        rebuild_fares()
+    else:
+        sweep_fare_buckets(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,24 @@
+from app import create_app, db
+from app.models.flight import Flight
+import sys
+import time
+
+app = create_app()
+
+def sweep_expired_holds(interval=None):
+    """Release expired seat holds in batches; loop every `interval` seconds if given"""
+    with app.app_context():
+        batch_size = app.config['SEAT_HOLD_SWEEP_BATCH']
+        
+        while True:
+            released = Flight.release_expired_holds(batch_size=batch_size)
+            print(f"🧹 Released {released} expired seat holds")
+            
+            if not interval:
+                break
+            db.session.remove()
+            time.sleep(interval)
+
+if __name__ == '__main__':
+    # Usage: python sweep_holds.py [interval_seconds]
+    sweep_expired_holds(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,22 @@
+from app import create_app, db
+from app.utils.idempotency import purge_expired_keys
+import sys
+import time
+
+app = create_app()
+
+def sweep_expired_keys(interval=None):
+    """Purge idempotency keys past IDEMPOTENCY_TTL_SECONDS in batches; loop every `interval` seconds if given"""
+    with app.app_context():
+        while True:
+            purged = purge_expired_keys()
+            print(f"🧹 Purged {purged} expired idempotency keys")
+            
+            if not interval:
+                break
+            db.session.remove()
+            time.sleep(interval)
+
+if __name__ == '__main__':
+    # Usage: python sweep_idempotency_keys.py [interval_seconds]
+    sweep_expired_keys(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,93 @@
+import pytest
+import json
+from datetime import datetime, timedelta
+from flask import current_app
+from app import create_app, db
+from app.models.airport import Airport
+from app.models.flight import Flight
+
+@pytest.fixture
+def app():
+    """Create and configure a test app instance"""
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    """Test client for making requests"""
+    return app.test_client()
+
+@pytest.fixture
+def airports(app):
+    """Load a few airports into the directory"""
+    with app.app_context():
+        db.session.add_all([
+            Airport(code='BOM', city='Mumbai', name='Chhatrapati Shivaji Maharaj International Airport', aliases=['Bombay']),
+            Airport(code='DEL', city='Delhi', name='Indira Gandhi International Airport', aliases=['New Delhi']),
+            Airport(code='BLR', city='Bangalore', name='Kempegowda International Airport', aliases=['Bengaluru']),
+            Airport(code='BDQ', city='Vadodara', name='Vadodara Airport', aliases=['Baroda']),
+        ])
+        db.session.commit()
+        current_app.extensions['airports'].clear()
+
+class TestAirports:
+    """Test suite for the airport directory"""
+    
+    def test_suggest_by_prefix(self, client, airports):
+        """Test that codes, cities, aliases and name words all complete"""
+        def suggest(q):
+            response = client.get('/api/airports/suggest', query_string={'q': q})
+            assert response.status_code == 200
+            return [airport['code'] for airport in json.loads(response.data)['airports']]
+        
+        assert suggest('ba') == ['BLR', 'BDQ']
+        assert suggest('  BOM') == ['BOM']
+        assert suggest('bomb') == ['BOM']
+        assert suggest('gandhi') == ['DEL']
+        assert suggest('xyz') == []
+        
+        response = client.get('/api/airports/suggest')
+        assert response.status_code == 400
+    
+    def test_search_resolves_aliases_to_codes(self, app, client, airports):
+        """Test that flights are keyed by IATA code and found by any alias"""
+        with app.app_context():
+            departure = datetime.utcnow() + timedelta(days=7)
+            flight = Flight(
+                flight_id='TEST123',
+                airline='Test Airlines',
+                source='Mumbai',
+                destination='Delhi',
+                departure_time=departure,
+                arrival_time=departure + timedelta(hours=2),
+                price=5000.0,
+                seats={'1A': {'status': 'available', 'type': 'economy'}}
+            )
+            db.session.add(flight)
+            db.session.commit()
+            assert (flight.source_norm, flight.destination_norm) == ('BOM', 'DEL')
+            day = departure.date()
+        
+        for source, destination in (('Mumbai', 'Delhi'), ('bombay', 'NEW  DELHI'), ('BOM', 'del')):
+            response = client.get('/api/flights/search', query_string={
+                'source': source,
+                'destination': destination,
+                'date': day.isoformat()
+            })
+            assert response.status_code == 200
+            assert [f['flight_id'] for f in json.loads(response.data)['flights']] == ['TEST123']
+        
+        # A substring is no longer a match
+        response = client.get('/api/flights/search', query_string={
+            'source': 'umba',
+            'destination': 'Delhi',
+            'date': day.isoformat()
+        })
+        assert json.loads(response.data)['count'] == 0
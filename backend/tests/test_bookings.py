@@ -1,10 +1,13 @@
 import pytest
+import hashlib
 import json
 from datetime import datetime, timedelta
 from app import create_app, db
 from app.models.flight import Flight
 from app.models.booking import Booking
 from app.models.user import User
+from app.models.idempotency_key import IdempotencyKey
+from app.utils.query_counter import assert_num_queries
 
 @pytest.fixture
 def app():
@@ -291,4 +294,378 @@ class TestBookingRoutes:
         
         assert response.status_code == 200
         data = json.loads(response.data)
-        assert data['booking']['seat'] == '2A'
\ No newline at end of file
+        assert data['booking']['seat'] == '2A'
+    
+    def test_booking_updates_single_seat_row(self, app, client, auth_headers, sample_flight):
+        """Test booking and cancelling only touch the booked seat's inventory row"""
+        booking_response = client.post('/api/bookings',
+            headers=auth_headers,
+            data=json.dumps({
+                'flight_id': sample_flight,
+                'passenger_name': 'John Doe',
+                'seat_number': '1A'
+            }),
+            content_type='application/json'
+        )
+        
+        assert booking_response.status_code == 201
+        pnr = json.loads(booking_response.data)['booking']['pnr']
+        
+        flight = Flight.query.filter_by(flight_id=sample_flight).first()
+        assert flight.seats['1A'] == {'status': 'booked', 'type': 'economy', 'passenger': 'John Doe'}
+        assert flight.seats['1B'] == {'status': 'available', 'type': 'economy'}
+        assert flight.seats['2B'] == {'status': 'booked', 'type': 'economy'}
+        
+        response = client.put(f'/api/bookings/{pnr}/cancel', headers=auth_headers)
+        
+        assert response.status_code == 200
+        db.session.expire_all()
+        assert flight.seats['1A'] == {'status': 'available', 'type': 'economy'}
+    
+    def test_seat_claim_is_conditional(self, app, sample_flight):
+        """Test a seat can only be claimed once and group claims are all-or-nothing"""
+        flight = Flight.query.filter_by(flight_id=sample_flight).first()
+        
+        assert flight.claim_seat('1A', holder='John Doe') is True
+        db.session.commit()
+        assert flight.claim_seat('1A', holder='Jane Doe') is False
+        db.session.rollback()
+        
+        # 2B is already booked, so 1B must not stay claimed
+        assert flight.claim_seats({'1B': 'Jane Doe', '2B': 'Jim Doe'}) is False
+        db.session.rollback()
+        
+        assert flight.get_seat('1A').holder == 'John Doe'
+        assert flight.get_seat('1B').status == 'available'
+    
+    def test_same_seat_cannot_be_double_booked(self, client, auth_headers, sample_flight):
+        """Test the second booking for a seat is rejected"""
+        payload = json.dumps({
+            'flight_id': sample_flight,
+            'passenger_name': 'John Doe',
+            'seat_number': '1B'
+        })
+        
+        first = client.post('/api/bookings', headers=auth_headers,
+            data=payload, content_type='application/json')
+        second = client.post('/api/bookings', headers=auth_headers,
+            data=payload, content_type='application/json')
+        
+        assert first.status_code == 201
+        assert second.status_code == 400
+    
+    def test_availability_counters_follow_bookings(self, client, auth_headers, sample_flight):
+        """Test availability counters change in the same transaction as the seat"""
+        flight = Flight.query.filter_by(flight_id=sample_flight).first()
+        assert (flight.seats_total, flight.seats_available, flight.economy_available) == (4, 3, 3)
+        
+        booking_response = client.post('/api/bookings',
+            headers=auth_headers,
+            data=json.dumps({
+                'flight_id': sample_flight,
+                'passenger_name': 'John Doe',
+                'seat_number': '1A'
+            }),
+            content_type='application/json'
+        )
+        pnr = json.loads(booking_response.data)['booking']['pnr']
+        db.session.expire_all()
+        assert (flight.seats_available, flight.economy_available) == (2, 2)
+        
+        client.put(f'/api/bookings/{pnr}/cancel', headers=auth_headers)
+        db.session.expire_all()
+        assert (flight.seats_available, flight.economy_available) == (3, 3)
+        
+        Flight.refresh_seat_counters()
+        db.session.expire_all()
+        assert flight.availability() == {'business': 0, 'premium_economy': 0, 'economy': 3, 'total': 3, 'held': 0}
+    
+    def test_group_booking_single_pnr(self, client, auth_headers, sample_flight):
+        """Test booking several passengers under one PNR"""
+        response = client.post('/api/bookings/group',
+            headers=auth_headers,
+            data=json.dumps({
+                'flight_id': sample_flight,
+                'passengers': [
+                    {'passenger_name': 'John Doe', 'seat_number': '1A'},
+                    {'passenger_name': 'Jane Doe', 'seat_number': '1B'},
+                    {'passenger_name': 'Jim Doe', 'seat_number': '2A'}
+                ]
+            }),
+            content_type='application/json'
+        )
+        
+        assert response.status_code == 201
+        booking = json.loads(response.data)['booking']
+        assert [p['seat_number'] for p in booking['passengers']] == ['1A', '1B', '2A']
+        assert Booking.query.count() == 1
+        
+        flight = Flight.query.filter_by(flight_id=sample_flight).first()
+        assert flight.seats_available == 0
+        
+        response = client.put(f"/api/bookings/{booking['pnr']}/cancel", headers=auth_headers)
+        
+        assert response.status_code == 200
+        db.session.expire_all()
+        assert flight.seats_available == 3
+    
+    def test_group_booking_is_all_or_nothing(self, client, auth_headers, sample_flight):
+        """Test one unavailable seat fails the whole group booking"""
+        response = client.post('/api/bookings/group',
+            headers=auth_headers,
+            data=json.dumps({
+                'flight_id': sample_flight,
+                'passengers': [
+                    {'passenger_name': 'John Doe', 'seat_number': '1A'},
+                    {'passenger_name': 'Jane Doe', 'seat_number': '2B'}  # Already booked
+                ]
+            }),
+            content_type='application/json'
+        )
+        
+        assert response.status_code == 400
+        assert Booking.query.count() == 0
+        flight = Flight.query.filter_by(flight_id=sample_flight).first()
+        assert flight.get_seat('1A').status == 'available'
+        assert flight.seats_available == 3
+    
+    def test_group_booking_rejects_duplicate_seats(self, client, auth_headers, sample_flight):
+        """Test two passengers cannot share a seat"""
+        response = client.post('/api/bookings/group',
+            headers=auth_headers,
+            data=json.dumps({
+                'flight_id': sample_flight,
+                'passengers': [
+                    {'passenger_name': 'John Doe', 'seat_number': '1A'},
+                    {'passenger_name': 'Jane Doe', 'seat_number': '1A'}
+                ]
+            }),
+            content_type='application/json'
+        )
+        
+        assert response.status_code == 422
+    
+    def test_booking_history_query_count_is_constant(self, client, auth_headers, sample_flight):
+        """Test the history page costs the same queries for one booking or many"""
+        def book(seat_number):
+            response = client.post('/api/bookings',
+                headers=auth_headers,
+                data=json.dumps({
+                    'flight_id': sample_flight,
+                    'passenger_name': 'John Doe',
+                    'seat_number': seat_number
+                }),
+                content_type='application/json'
+            )
+            assert response.status_code == 201
+        
+        book('1A')
+        db.session.remove()
+        with assert_num_queries(2):
+            response = client.get('/api/bookings', headers=auth_headers)
+        assert len(json.loads(response.data)['bookings']) == 1
+        
+        book('1B')
+        book('2A')
+        db.session.remove()
+        with assert_num_queries(2):
+            response = client.get('/api/bookings', headers=auth_headers)
+        bookings = json.loads(response.data)['bookings']
+        assert len(bookings) == 3
+        assert {booking['flight_id'] for booking in bookings} == {sample_flight}
+        assert all(booking['flight']['airline'] == 'Booking Test Airlines' for booking in bookings)
+        assert all(booking['seat_class'] == 'economy' for booking in bookings)
+
+class TestFareQuotes:
+    """Test server-priced fare quotes"""
+    
+    def quote(self, client, flight_id, **fields):
+        response = client.post('/api/quotes',
+            data=json.dumps({'flight_id': flight_id, **fields}),
+            content_type='application/json'
+        )
+        return response.status_code, json.loads(response.data)
+    
+    def test_booking_pays_quoted_price(self, app, client, auth_headers, sample_flight):
+        """Test a booking charges the quote, not a fresh price"""
+        status, data = self.quote(client, sample_flight)
+        assert status == 201
+        quote = data['quote']
+        assert quote['fare'] == 4000.0
+        assert quote['total_price'] == 4000.0
+        
+        # Repricing after the quote doesn't change what the quote pays
+        with app.app_context():
+            Flight.query.filter_by(flight_id=sample_flight).update({'price': 9000.0})
+            db.session.commit()
+        
+        response = client.post('/api/bookings',
+            headers=auth_headers,
+            data=json.dumps({
+                'flight_id': sample_flight,
+                'passenger_name': 'John Doe',
+                'seat_number': '1A',
+                'quote_id': quote['quote_id']
+            }),
+            content_type='application/json'
+        )
+        
+        assert response.status_code == 201
+        assert json.loads(response.data)['booking']['total_price'] == 4000.0
+    
+    def test_quote_verified_from_signature(self, app, client, sample_flight):
+        """Test a quote issued by another worker is honoured from its id alone"""
+        _, data = self.quote(client, sample_flight, passengers=2)
+        app.extensions['fare_quotes'].clear()
+        
+        response = client.get(f"/api/quotes/{data['quote']['quote_id']}")
+        
+        assert response.status_code == 200
+        assert json.loads(response.data)['quote']['total_price'] == 8000.0
+        assert client.get(f"/api/quotes/{data['quote']['quote_id']}x").status_code == 404
+    
+    def test_mismatched_quote_changes_nothing(self, app, client, auth_headers, sample_flight):
+        """Test a quote for another passenger count is rejected before seats are claimed"""
+        _, data = self.quote(client, sample_flight, passengers=2)
+        
+        response = client.post('/api/bookings',
+            headers=auth_headers,
+            data=json.dumps({
+                'flight_id': sample_flight,
+                'passenger_name': 'John Doe',
+                'seat_number': '1A',
+                'quote_id': data['quote']['quote_id']
+            }),
+            content_type='application/json'
+        )
+        
+        assert response.status_code == 400
+        with app.app_context():
+            assert Flight.query.filter_by(flight_id=sample_flight).first().seats['1A']['status'] == 'available'
+    
+    def test_expired_quote_is_rejected(self, app, client, sample_flight):
+        """Test quotes stop resolving once they expire"""
+        with app.app_context():
+            quote_id, _ = app.extensions['fare_quotes'].issue(sample_flight, 'economy', 1, 4000.0, -1)
+        
+        assert client.get(f'/api/quotes/{quote_id}').status_code == 404
+    
+    def test_quote_pays_for_one_booking(self, app, client, auth_headers, sample_flight):
+        """Test a quote can't be reused for another booking at the old fare"""
+        _, data = self.quote(client, sample_flight)
+        
+        def book(seat_number):
+            return client.post('/api/bookings',
+                headers=auth_headers,
+                data=json.dumps({
+                    'flight_id': sample_flight,
+                    'passenger_name': 'John Doe',
+                    'seat_number': seat_number,
+                    'quote_id': data['quote']['quote_id']
+                }),
+                content_type='application/json'
+            )
+        
+        assert book('1A').status_code == 201
+        response = book('1B')
+        
+        assert response.status_code == 400
+        assert 'already been used' in json.loads(response.data)['error']
+        with app.app_context():
+            assert Flight.query.filter_by(flight_id=sample_flight).first().seats['1B']['status'] == 'available'
+
+class TestIdempotencyKeys:
+    """Test Idempotency-Key handling on booking writes"""
+    
+    def book(self, client, auth_headers, sample_flight, key, seat='1A'):
+        return client.post('/api/bookings',
+            headers={**auth_headers, 'Idempotency-Key': key},
+            data=json.dumps({
+                'flight_id': sample_flight,
+                'passenger_name': 'John Doe',
+                'seat_number': seat
+            }),
+            content_type='application/json'
+        )
+    
+    def test_retried_booking_is_replayed(self, app, client, auth_headers, sample_flight):
+        """Test a retry returns the first PNR without booking again"""
+        first = self.book(client, auth_headers, sample_flight, 'retry-1')
+        retry = self.book(client, auth_headers, sample_flight, 'retry-1')
+        
+        assert first.status_code == retry.status_code == 201
+        assert retry.headers['Idempotent-Replayed'] == 'true'
+        assert json.loads(retry.data)['booking']['pnr'] == json.loads(first.data)['booking']['pnr']
+        with app.app_context():
+            assert Booking.query.count() == 1
+            assert Flight.query.filter_by(flight_id=sample_flight).first().seats_available == 2
+    
+    def test_key_reused_for_other_request(self, client, auth_headers, sample_flight):
+        """Test a key sent with a different body is rejected"""
+        assert self.book(client, auth_headers, sample_flight, 'retry-2').status_code == 201
+        
+        response = self.book(client, auth_headers, sample_flight, 'retry-2', seat='1B')
+        
+        assert response.status_code == 422
+    
+    def test_retried_cancel_is_replayed(self, client, auth_headers, sample_flight):
+        """Test a retried cancellation returns the first response, not an error"""
+        pnr = json.loads(self.book(client, auth_headers, sample_flight, 'retry-3').data)['booking']['pnr']
+        headers = {**auth_headers, 'Idempotency-Key': 'cancel-3'}
+        
+        first = client.put(f'/api/bookings/{pnr}/cancel', headers=headers)
+        retry = client.put(f'/api/bookings/{pnr}/cancel', headers=headers)
+        unkeyed = client.put(f'/api/bookings/{pnr}/cancel', headers=auth_headers)
+        
+        assert first.status_code == retry.status_code == 200
+        assert retry.data == first.data
+        assert unkeyed.status_code == 400
+    
+    def test_rejected_booking_is_replayed(self, app, client, auth_headers, sample_flight):
+        """Test a client error is stored even though the view rolled back"""
+        first = self.book(client, auth_headers, sample_flight, 'retry-4', seat='99Z')
+        retry = self.book(client, auth_headers, sample_flight, 'retry-4', seat='99Z')
+        
+        assert first.status_code == retry.status_code == 400
+        assert retry.headers['Idempotent-Replayed'] == 'true'
+        with app.app_context():
+            stored = IdempotencyKey.query.filter_by(key='retry-4').one()
+            assert (stored.method, stored.path, stored.status_code) == ('POST', '/api/bookings', 400)
+    
+    def test_retry_while_first_attempt_runs(self, app, client, auth_headers, sample_flight):
+        """Test a retry finding the key still claimed gets 409 and books nothing"""
+        app.config['IDEMPOTENCY_WAIT_SECONDS'] = 0
+        body = json.dumps({'flight_id': sample_flight, 'passenger_name': 'John Doe', 'seat_number': '1A'})
+        with app.app_context():
+            # The first attempt's claim, as another worker would hold it
+            db.session.add(IdempotencyKey(
+                user_id=User.query.filter_by(email='user@example.com').first().id,
+                method='POST',
+                path='/api/bookings',
+                key='retry-5',
+                fingerprint=hashlib.sha256(body.encode()).hexdigest()
+            ))
+            db.session.commit()
+        
+        response = self.book(client, auth_headers, sample_flight, 'retry-5')
+        
+        assert response.status_code == 409
+        with app.app_context():
+            assert Booking.query.count() == 0
+            assert IdempotencyKey.query.filter_by(key='retry-5').one().status_code is None
+    
+    def test_expired_keys_are_purged(self, app, client, auth_headers, sample_flight):
+        """Test the purge deletes keys past their TTL and keeps live ones"""
+        from app.utils.idempotency import purge_expired_keys
+        
+        self.book(client, auth_headers, sample_flight, 'old-1')
+        self.book(client, auth_headers, sample_flight, 'new-1', seat='1B')
+        app.config['IDEMPOTENCY_PURGE_BATCH'] = 1
+        with app.app_context():
+            IdempotencyKey.query.filter_by(key='old-1').update({
+                'created_at': datetime.utcnow() - timedelta(seconds=app.config['IDEMPOTENCY_TTL_SECONDS'] + 1)
+            })
+            db.session.commit()
+            
+            assert purge_expired_keys() == 1
+            assert [stored.key for stored in IdempotencyKey.query.all()] == ['new-1']
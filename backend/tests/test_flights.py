@@ -1,8 +1,13 @@
 import pytest
 import json
+import threading
+import time
 from datetime import datetime, timedelta
 from app import create_app, db
 from app.models.flight import Flight
+from app.models.flight_fare import FlightFare
+from app.models.route_day_fare import RouteDayFare
+from app.controllers.flight_controller import FlightController
 from app.models.user import User
 
 @pytest.fixture
@@ -193,4 +198,736 @@ class TestFlightRoutes:
         
         assert response.status_code == 200
         data = json.loads(response.data)
-        assert 'flights' in data
\ No newline at end of file
+        assert 'flights' in data    
+    
+    def test_get_all_flights_pages_by_cursor(self, app, client, sample_flight):
+        """Test that the flight listing is paged in (departure_time, id) order"""
+        with app.app_context():
+            first = Flight.query.filter_by(flight_id=sample_flight).first()
+            # Same departure as the sample flight, so id breaks the tie
+            for number, offset in ((1, 0), (2, 1), (3, 2), (4, -1)):
+                departure = first.departure_time + timedelta(hours=offset)
+                db.session.add(Flight(
+                    flight_id=f'PAGE{number}',
+                    airline='Test Airlines',
+                    source='Mumbai',
+                    destination='Delhi',
+                    departure_time=departure,
+                    arrival_time=departure + timedelta(hours=2),
+                    price=5000.0,
+                    seats={'1A': {'status': 'available', 'type': 'economy'}}
+                ))
+            db.session.commit()
+        
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 2, 'include_total': 'true'}
+            if cursor:
+                params['cursor'] = cursor
+            response = client.get('/api/flights', query_string=params)
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            assert len(data['flights']) <= 2
+            assert data['total'] == 5
+            seen.extend(flight['flight_id'] for flight in data['flights'])
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        
+        assert seen == ['PAGE4', sample_flight, 'PAGE1', 'PAGE2', 'PAGE3']
+        
+        response = client.get('/api/flights', query_string={'cursor': 'not-a-cursor'})
+        assert response.status_code == 400
+    
+    def test_list_endpoints_omit_seat_map(self, client, sample_flight):
+        """Test that lists return summaries and only the detail endpoint has seats"""
+        flight = json.loads(client.get(f'/api/flights/{sample_flight}').data)['flight']
+        listed = json.loads(client.get('/api/flights').data)['flights'][0]
+        found = json.loads(client.get('/api/flights/search', query_string={
+            'source': 'Mumbai',
+            'destination': 'Delhi',
+            'date': flight['departure_time'][:10]
+        }).data)['flights'][0]
+        
+        assert len(flight['seats']) == 4
+        for summary in (listed, found):
+            assert 'seats' not in summary
+            assert summary['available_seats'] == 4
+            assert (summary['available_by_class']['business'], summary['available_by_class']['economy']) == (2, 2)
+    
+    def test_seat_map_comes_from_shared_layout(self, app, sample_flight):
+        """Test that free seats are not stored per flight and layouts are shared"""
+        from app.models.flight_seat import FlightSeat
+        
+        with app.app_context():
+            flight = Flight.query.filter_by(flight_id=sample_flight).first()
+            other = Flight(
+                flight_id='TEST456',
+                airline='Test Airlines',
+                source='Delhi',
+                destination='Mumbai',
+                departure_time=flight.departure_time,
+                arrival_time=flight.arrival_time,
+                price=5000.0,
+                seats={
+                    '1A': {'status': 'available', 'type': 'business'},
+                    '1B': {'status': 'booked', 'type': 'business', 'passenger': 'Jane Doe'},
+                    '2A': {'status': 'available', 'type': 'economy'},
+                    '2B': {'status': 'available', 'type': 'economy'},
+                }
+            )
+            db.session.add(other)
+            db.session.commit()
+            
+            assert other.layout_id == flight.layout_id
+            assert FlightSeat.query.filter_by(flight_id=flight.id).count() == 0
+            assert FlightSeat.query.filter_by(flight_id=other.id).count() == 1
+            assert other.seats['1B'] == {'status': 'booked', 'type': 'business', 'passenger': 'Jane Doe'}
+            assert other.seats['2A'] == {'status': 'available', 'type': 'economy'}
+            assert other.seats_available == 3
+    
+    def test_find_adjacent_seats(self, client, sample_flight):
+        """Test auto-assigning side-by-side seats"""
+        response = client.get(f'/api/flights/{sample_flight}/seats/adjacent?count=2&seat_class=economy')
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['seat_numbers'] == ['2A', '2B']
+        assert data['row'] == '2'
+        assert data['available_in_class'] == 2
+        
+        response = client.get(f'/api/flights/{sample_flight}/seats/adjacent?count=3')
+        assert response.status_code == 404
+    
+    def test_seat_bitmap_skips_taken_seats(self, app, sample_flight):
+        """Test that the bitmap counts and searches only free seats"""
+        with app.app_context():
+            flight = Flight.query.filter_by(flight_id=sample_flight).first()
+            assert flight.claim_seat('1A', 'Jane Doe')
+            db.session.commit()
+            
+            bitmap = flight.seat_bitmap()
+            assert bitmap.count() == flight.seats_available == 3
+            assert bitmap.count('business') == 1
+            assert not bitmap.is_free('1A')
+            assert bitmap.find_adjacent(2, 'business') is None
+            assert bitmap.find_adjacent(1, 'business') == ('1', 'business', ['1B'])
+    
+    def test_seat_map_delta_since_version(self, app, client, sample_flight):
+        """Test polling the seat map for changes since a version"""
+        with app.app_context():
+            flight = Flight.query.filter_by(flight_id=sample_flight).first()
+            version = flight.seat_version
+        
+        response = client.get(f'/api/flights/{sample_flight}/seats?since={version}')
+        assert response.status_code == 304
+        
+        with app.app_context():
+            flight = Flight.query.filter_by(flight_id=sample_flight).first()
+            assert flight.claim_seat('1A', 'Jane Doe')
+            db.session.commit()
+        
+        response = client.get(f'/api/flights/{sample_flight}/seats?since={version}')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['full'] is False
+        assert data['version'] == version + 1
+        assert data['seats'] == {'1A': {'status': 'booked', 'type': 'business', 'passenger': 'Jane Doe'}}
+        
+        # Versions older than the change log get the whole map
+        response = client.get(f'/api/flights/{sample_flight}/seats?since=0')
+        data = json.loads(response.data)
+        assert data['full'] is True
+        assert len(data['seats']) == 4
+    
+    def test_search_uses_route_index(self, app, client, sample_flight):
+        """Test that route/date search is served by the composite index"""
+        with app.app_context():
+            flight = Flight.query.filter_by(flight_id=sample_flight).first()
+            query = Flight.route_query(' MUMBAI ', 'delhi', flight.departure_time.date())
+            assert [found.flight_id for found in query] == [sample_flight]
+            
+            statement = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+            plan = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {statement}')).all()
+            details = ' '.join(row[-1] for row in plan)
+            assert 'SEARCH flights USING INDEX ix_flights_route_departure' in details
+            assert 'SCAN' not in details
+        
+        response = client.get('/api/flights/search', query_string={
+            'source': 'mumbai',
+            'destination': 'DELHI',
+            'date': flight.departure_time.date().isoformat()
+        })
+        assert json.loads(response.data)['count'] == 1
+    
+    def test_search_served_from_route_index(self, app, client, sample_flight):
+        """Test that repeated searches hit the in-memory index and stay current"""
+        app.config['SEARCH_CACHE_ENABLED'] = False
+        
+        with app.app_context():
+            day = Flight.query.filter_by(flight_id=sample_flight).first().departure_time.date()
+        
+        def search():
+            response = client.get('/api/flights/search', query_string={
+                'source': 'Mumbai',
+                'destination': 'Delhi',
+                'date': day.isoformat()
+            })
+            return json.loads(response.data)
+        
+        index = app.extensions['flight_index']
+        first = search()
+        second = search()
+        assert first == second
+        assert 'seats' not in first['flights'][0]
+        assert (index.stats()['hits'], index.stats()['misses']) == (1, 1)
+        
+        # Bookings patch the cached counters instead of evicting the route
+        with app.app_context():
+            flight = Flight.query.filter_by(flight_id=sample_flight).first()
+            assert flight.claim_seat('1A', 'Jane Doe')
+            db.session.commit()
+        
+        data = search()
+        assert data['flights'][0]['available_seats'] == 3
+        assert data['flights'][0]['available_by_class']['business'] == 1
+        assert index.stats()['misses'] == 1
+        
+        # Moving the flight to another day drops it from this route/date
+        with app.app_context():
+            flight = Flight.query.filter_by(flight_id=sample_flight).first()
+            flight.departure_time += timedelta(days=1)
+            flight.arrival_time += timedelta(days=1)
+            db.session.commit()
+        
+        assert search()['count'] == 0
+        assert index.stats()['invalidations'] == 1
+        
+        app.config['FLIGHT_INDEX_ENABLED'] = False
+        assert search()['count'] == 0
+        assert index.stats()['misses'] == 2
+    
+    def test_route_index_entries_expire(self):
+        """Test index entries reload after max_age and invalidation keeps no per-key state"""
+        from app.utils.flight_index import RouteIndex
+        
+        record = {'id': 1, 'departure_time': '2026-01-01T08:00:00', 'seat_version': 1, 'available_seats': 170}
+        
+        # A booking committed by another worker never reaches this index's hooks
+        index = RouteIndex(max_age=60)
+        index.search(('a', 'b', 1), lambda: [record])
+        assert index.search(('a', 'b', 1), lambda: [dict(record, available_seats=169)])[0]['available_seats'] == 170
+        
+        index = RouteIndex(max_age=0)
+        index.search(('a', 'b', 1), lambda: [record])
+        assert index.search(('a', 'b', 1), lambda: [dict(record, available_seats=169)])[0]['available_seats'] == 169
+        
+        index.invalidate([('a', 'b', day) for day in range(1000)])
+        assert index._generations == {}
+    
+    def test_priced_records_expire_with_their_fares(self):
+        """Test index and cache entries are not kept past the next fare bucket"""
+        from app.utils.dynamic_pricing import fare_lifetime
+        from app.utils.flight_index import RouteIndex
+        from app.utils.search_cache import SearchCache
+        
+        # The last-minute surcharge starts 24 hours out, moments from now
+        departure = datetime.utcnow() + timedelta(hours=24, seconds=0.3)
+        record = {'id': 1, 'departure_time': departure, 'seat_version': 1, 'available_seats': 170, 'fare': 5000.0}
+        repriced = dict(record, fare=7250.0)
+        
+        index = RouteIndex(max_age=60)
+        cache = SearchCache(ttl=60)
+        index.search(('a', 'b', 1), lambda: [record], fare_lifetime)
+        cache.get_or_load(('a', 'b', 1), lambda: [record], fare_lifetime)
+        assert index.search(('a', 'b', 1), lambda: [repriced], fare_lifetime)[0]['fare'] == 5000.0
+        assert cache.get_or_load(('a', 'b', 1), lambda: [repriced], fare_lifetime)[0]['fare'] == 5000.0
+        
+        time.sleep(0.4)
+        assert index.search(('a', 'b', 1), lambda: [repriced], fare_lifetime)[0]['fare'] == 7250.0
+        assert cache.get_or_load(('a', 'b', 1), lambda: [repriced], fare_lifetime)[0]['fare'] == 7250.0
+
+class TestSearchOptions:
+    """Test suite for search sort, filters and limit"""
+    
+    @pytest.mark.parametrize('index_enabled', [True, False])
+    def test_sort_filter_and_limit(self, app, client, sample_flight, index_enabled):
+        """Test that both the in-memory and the SQL path honour the options"""
+        app.config['FLIGHT_INDEX_ENABLED'] = index_enabled
+        with app.app_context():
+            flight = Flight.query.filter_by(flight_id=sample_flight).first()
+            day = flight.departure_time.date()
+            start = datetime.combine(day, datetime.min.time())
+            for flight_id, airline, hour, hours, price in (
+                ('OPT1', 'IndiGo', 6, 3, 3000.0),
+                ('OPT2', 'Vistara', 9, 2, 6000.0),
+                ('OPT3', 'IndiGo', 20, 1, 4000.0),
+            ):
+                db.session.add(Flight(
+                    flight_id=flight_id,
+                    airline=airline,
+                    source='Pune',
+                    destination='Goa',
+                    departure_time=start + timedelta(hours=hour),
+                    arrival_time=start + timedelta(hours=hour + hours),
+                    price=price,
+                    seats={'1A': {'status': 'available', 'type': 'economy'}}
+                ))
+            db.session.commit()
+        
+        def search(**params):
+            response = client.get('/api/flights/search', query_string={
+                'source': 'Pune', 'destination': 'Goa', 'date': day.isoformat(), **params
+            })
+            assert response.status_code == 200
+            return [flight['flight_id'] for flight in json.loads(response.data)['flights']]
+        
+        assert search() == ['OPT1', 'OPT2', 'OPT3']
+        assert search(sort='price') == ['OPT1', 'OPT3', 'OPT2']
+        assert search(sort='price', limit=2) == ['OPT1', 'OPT3']
+        assert search(sort='duration', limit=2) == ['OPT3', 'OPT2']
+        assert search(min_price=3500, max_price=6000) == ['OPT2', 'OPT3']
+        assert search(airlines='indigo, SpiceJet') == ['OPT1', 'OPT3']
+        assert search(depart_after='08:00', depart_before='20:00', sort='arrival') == ['OPT2', 'OPT3']
+        
+        response = client.get('/api/flights/search', query_string={
+            'source': 'Pune', 'destination': 'Goa', 'date': day.isoformat(), 'sort': 'airline'
+        })
+        assert response.status_code == 400
+    
+    @pytest.mark.parametrize('index_enabled', [True, False])
+    def test_price_options_use_fares(self, app, client, sample_flight, index_enabled):
+        """Test that the price sort and filters rank on the fare charged, not the base price"""
+        app.config['FLIGHT_INDEX_ENABLED'] = index_enabled
+        with app.app_context():
+            flight = Flight.query.filter_by(flight_id=sample_flight).first()
+            day = flight.departure_time.date()
+            start = datetime.combine(day, datetime.min.time())
+            for flight_id, hour, price in (('FARE1', 6, 3000.0), ('FARE2', 9, 4000.0)):
+                db.session.add(Flight(
+                    flight_id=flight_id,
+                    airline='IndiGo',
+                    source='Pune',
+                    destination='Goa',
+                    departure_time=start + timedelta(hours=hour),
+                    arrival_time=start + timedelta(hours=hour + 1),
+                    price=price,
+                    seats={'1A': {'status': 'available', 'type': 'economy'}}
+                ))
+            db.session.commit()
+            cheap = Flight.query.filter_by(flight_id='FARE1').first()
+            FlightFare.query.filter_by(flight_id=cheap.id, seat_class='economy').update({'fare': 4500.0})
+            db.session.commit()
+        
+        def search(**params):
+            response = client.get('/api/flights/search', query_string={
+                'source': 'Pune', 'destination': 'Goa', 'date': day.isoformat(), **params
+            })
+            assert response.status_code == 200
+            return [flight['flight_id'] for flight in json.loads(response.data)['flights']]
+        
+        assert search(sort='price') == ['FARE2', 'FARE1']
+        assert search(sort='price', limit=1) == ['FARE2']
+        assert search(min_price=4200) == ['FARE1']
+        assert search(max_price=3500) == []
+
+class TestSearchCache:
+    """Test suite for the search result cache"""
+    
+    def test_cached_search_invalidated_by_booking(self, app, client, sample_flight):
+        """Test that a booking on the route drops its cached results"""
+        with app.app_context():
+            day = Flight.query.filter_by(flight_id=sample_flight).first().departure_time.date()
+        
+        def search(passengers):
+            response = client.get('/api/flights/search', query_string={
+                'source': 'mumbai',
+                'destination': 'delhi',
+                'date': day.isoformat(),
+                'passengers': passengers
+            })
+            return json.loads(response.data)
+        
+        cache = app.extensions['search_cache']
+        assert search(4)['count'] == 1
+        assert search(4)['count'] == 1
+        assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 1)
+        
+        with app.app_context():
+            flight = Flight.query.filter_by(flight_id=sample_flight).first()
+            assert flight.claim_seat('2A', 'Jane Doe')
+            db.session.commit()
+        
+        assert cache.stats()['entries'] == 0
+        assert search(4)['count'] == 0
+        assert search(3)['flights'][0]['available_seats'] == 3
+    
+    def test_concurrent_misses_are_coalesced(self):
+        """Test that identical concurrent misses run one load"""
+        from app.utils.search_cache import SearchCache
+        
+        cache = SearchCache(ttl=60)
+        calls = []
+        
+        def load():
+            calls.append(1)
+            time.sleep(0.2)
+            return ['AI101']
+        
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_load(('a', 'b', 'day', 1), load)))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(calls) == 1
+        assert results == [['AI101']] * 10
+        assert cache.stats()['coalesced'] == 9
+    
+    def test_entries_expire_and_evict(self):
+        """Test TTL expiry and LRU eviction"""
+        from app.utils.search_cache import SearchCache
+        
+        cache = SearchCache(max_entries=2, ttl=60)
+        cache.get_or_load(('a', 'b', 1, 1), lambda: 'first')
+        cache.get_or_load(('a', 'b', 2, 1), lambda: 'second')
+        cache.get_or_load(('a', 'b', 1, 1), lambda: 'reloaded')
+        cache.get_or_load(('a', 'b', 3, 1), lambda: 'third')
+        
+        # The least recently used key (day 2) was evicted
+        assert cache.get_or_load(('a', 'b', 2, 1), lambda: 'second again') == 'second again'
+        
+        cache.ttl = 0
+        cache.get_or_load(('c', 'd', 1, 1), lambda: 'stale')
+        assert cache.get_or_load(('c', 'd', 1, 1), lambda: 'fresh') == 'fresh'
+        
+        # Invalidation counts are only kept for routes with a load in progress
+        cache.invalidate([('a', 'b', day) for day in range(1000)])
+        assert cache._generations == {}
+
+class TestFareCalendar:
+    """Test suite for the fare calendar"""
+    
+    def test_calendar_follows_flights_and_seats(self, app, client, sample_flight):
+        """Test that the calendar is maintained on flight and seat changes"""
+        with app.app_context():
+            flight = Flight.query.filter_by(flight_id=sample_flight).first()
+            day = flight.departure_time.date()
+            cheaper = Flight(
+                flight_id='TEST789',
+                airline='Budget Airlines',
+                source='Mumbai',
+                destination='Delhi',
+                departure_time=flight.departure_time + timedelta(hours=3),
+                arrival_time=flight.arrival_time + timedelta(hours=3),
+                price=3500.0,
+                seats={'1A': {'status': 'available', 'type': 'economy'}}
+            )
+            db.session.add(cheaper)
+            db.session.commit()
+        
+        def calendar_day():
+            response = client.get('/api/flights/calendar', query_string={
+                'source': 'Mumbai',
+                'destination': 'Delhi',
+                'month': day.strftime('%Y-%m')
+            })
+            assert response.status_code == 200
+            days = {entry['date']: entry for entry in json.loads(response.data)['days']}
+            return days.get(day.isoformat())
+        
+        assert calendar_day() == {'date': day.isoformat(), 'min_fare': 3500.0, 'flights': 2}
+        
+        # Selling out the cheaper flight takes it off the calendar
+        with app.app_context():
+            cheaper = Flight.query.filter_by(flight_id='TEST789').first()
+            assert cheaper.claim_seat('1A', 'Jane Doe')
+            db.session.commit()
+        assert calendar_day() == {'date': day.isoformat(), 'min_fare': 5000.0, 'flights': 1}
+        
+        with app.app_context():
+            cheaper = Flight.query.filter_by(flight_id='TEST789').first()
+            cheaper.release_seats(['1A'])
+            db.session.commit()
+        assert calendar_day()['min_fare'] == 3500.0
+        
+        with app.app_context():
+            for flight in Flight.query.all():
+                db.session.delete(flight)
+            db.session.commit()
+        assert calendar_day() is None
+    
+    def test_refresh_overwrites_existing_day_row(self, app, sample_flight):
+        """Test a recompute upserts onto a row another transaction already wrote"""
+        with app.app_context():
+            flight = Flight.query.filter_by(flight_id=sample_flight).first()
+            source_norm, destination_norm, day = Flight.route_key(flight.source, flight.destination, flight.departure_time.date())
+            row = RouteDayFare.query.filter_by(source_norm=source_norm, destination_norm=destination_norm, day=day).one()
+            row.min_fare, row.flight_count = 1.0, 9
+            db.session.commit()
+            
+            Flight.refresh_day_fares({(source_norm, destination_norm, day)})
+            db.session.commit()
+            
+            rows = RouteDayFare.query.filter_by(source_norm=source_norm, destination_norm=destination_norm, day=day).all()
+            assert [(row.min_fare, row.flight_count) for row in rows] == [(5000.0, 1)]
+    
+    def test_calendar_shows_dynamic_fares(self, app):
+        """Test the calendar's lowest fare is the fare search charges, and follows the sweep"""
+        with app.app_context():
+            departure = datetime.utcnow() + timedelta(hours=30)
+            db.session.add(Flight(
+                flight_id='SOON1',
+                airline='Test Airlines',
+                source='Mumbai',
+                destination='Goa',
+                departure_time=departure,
+                arrival_time=departure + timedelta(hours=2),
+                price=4000.0,
+                seats={'1A': {'status': 'available', 'type': 'economy'}}
+            ))
+            db.session.commit()
+            
+            def min_fare():
+                return RouteDayFare.query.filter_by(
+                    source_norm=Flight.normalize_city('Mumbai'), destination_norm=Flight.normalize_city('Goa')
+                ).one().min_fare
+            
+            assert min_fare() == 4600.0
+            
+            # Under 24 hours out on the sweep's clock
+            Flight.reprice_due_fares(now=datetime.utcnow() + timedelta(hours=7))
+            assert min_fare() == 5800.0
+
+class TestFlightFares:
+    """Test suite for the precomputed fare table"""
+    
+    def fares(self, flight_id):
+        return {
+            fare.seat_class: fare
+            for fare in FlightFare.query.join(Flight).filter(Flight.flight_id == flight_id)
+        }
+    
+    def test_fares_follow_occupancy_tiers(self, app, sample_flight):
+        """Test fares are recomputed only when a booking crosses a tier"""
+        with app.app_context():
+            fares = self.fares(sample_flight)
+            assert {seat_class: fare.fare for seat_class, fare in fares.items()} == {
+                'business': 10000.0, 'premium_economy': 7000.0, 'economy': 5000.0
+            }
+            
+            # Half booked is still the lowest tier, so the rows are left alone
+            updated = {seat_class: fare.updated_at for seat_class, fare in fares.items()}
+            flight = Flight.query.filter_by(flight_id=sample_flight).first()
+            assert flight.claim_seats({'1A': 'Jane Doe', '1B': 'John Doe'})
+            db.session.commit()
+            assert {seat_class: fare.updated_at for seat_class, fare in self.fares(sample_flight).items()} == updated
+            
+            assert flight.claim_seat('2A', 'Jim Doe')
+            db.session.commit()
+            assert self.fares(sample_flight)['economy'].fare == 6000.0
+            
+            flight.release_seats(['2A'])
+            db.session.commit()
+            assert self.fares(sample_flight)['economy'].fare == 5000.0
+    
+    def test_sweep_reprices_only_due_flights(self, app, sample_flight):
+        """Test the bucket sweep picks up flights entering a last-minute bucket"""
+        with app.app_context():
+            departure = datetime.utcnow() + timedelta(hours=30)
+            db.session.add(Flight(
+                flight_id='TEST456',
+                airline='Test Airlines',
+                source='Mumbai',
+                destination='Delhi',
+                departure_time=departure,
+                arrival_time=departure + timedelta(hours=2),
+                price=4000.0,
+                seats={'1A': {'status': 'available', 'type': 'economy'}}
+            ))
+            db.session.commit()
+            assert self.fares('TEST456')['economy'].fare == 4600.0
+            untouched = self.fares(sample_flight)['economy'].updated_at
+            
+            # Under 24 hours out on the sweep's clock
+            assert Flight.reprice_due_fares(now=datetime.utcnow() + timedelta(hours=7)) == 1
+            assert self.fares('TEST456')['economy'].fare == 5800.0
+            assert self.fares('TEST456')['economy'].reprice_at is None
+            assert self.fares(sample_flight)['economy'].updated_at == untouched
+    
+    def test_search_reads_precomputed_fares(self, app, sample_flight):
+        """Test controller search joins the fare table instead of pricing"""
+        with app.app_context():
+            flight = Flight.query.filter_by(flight_id=sample_flight).first()
+            FlightFare.query.filter_by(flight_id=flight.id, seat_class='economy').update({'fare': 4321.0})
+            db.session.commit()
+            
+            result, status = FlightController.search_flights({
+                'source': 'Mumbai',
+                'destination': 'Delhi',
+                'date': flight.departure_time.date().isoformat()
+            })
+        
+        assert status == 200
+        assert [found['price'] for found in result['flights']] == [4321.0]
+    
+    @pytest.mark.parametrize('index_enabled', [True, False])
+    def test_route_search_carries_fares(self, app, client, sample_flight, index_enabled):
+        """Test search records carry the precomputed fare and drop it once repriced"""
+        app.config['FLIGHT_INDEX_ENABLED'] = index_enabled
+        with app.app_context():
+            flight = Flight.query.filter_by(flight_id=sample_flight).first()
+            params = {'source': 'Mumbai', 'destination': 'Delhi', 'date': flight.departure_time.date().isoformat()}
+        
+        def search_fares():
+            response = client.get('/api/flights/search', query_string=params)
+            assert response.status_code == 200
+            return [(found['price'], found['fare']) for found in json.loads(response.data)['flights']]
+        
+        assert search_fares() == [(5000.0, 5000.0)]
+        
+        # A repricing commit drops the cached records for the flight's route
+        with app.app_context():
+            Flight.refresh_fares([flight.id], now=flight.departure_time - timedelta(hours=12))
+            db.session.commit()
+        assert search_fares() == [(5000.0, 7250.0)]
+
+class TestRoundTripSearch:
+    """Test suite for combined round-trip search"""
+    
+    def test_round_trip_pairs_returns_after_arrival(self, app, client, sample_flight):
+        """Test that both legs come back with the cheapest valid pairings"""
+        with app.app_context():
+            outbound = Flight.query.filter_by(flight_id=sample_flight).first()
+            day = outbound.departure_time.date()
+            return_day = day + timedelta(days=2)
+            for flight_id, departure, price in (
+                # Leaves as the outbound does, so it can never be paired with it
+                ('TEST901', outbound.departure_time, 1000.0),
+                ('TEST902', datetime.combine(return_day, datetime.min.time()) + timedelta(hours=9), 4000.0),
+                ('TEST903', datetime.combine(return_day, datetime.min.time()) + timedelta(hours=18), 3000.0),
+            ):
+                db.session.add(Flight(
+                    flight_id=flight_id,
+                    airline='Test Airlines',
+                    source='Delhi',
+                    destination='Mumbai',
+                    departure_time=departure,
+                    arrival_time=departure + timedelta(hours=2),
+                    price=price,
+                    seats={'1A': {'status': 'available', 'type': 'economy'}}
+                ))
+            db.session.commit()
+        
+        def search(return_on):
+            response = client.get('/api/flights/search/roundtrip', query_string={
+                'source': 'Mumbai',
+                'destination': 'Delhi',
+                'date': day.isoformat(),
+                'return_date': return_on.isoformat()
+            })
+            return response.status_code, json.loads(response.data)
+        
+        status, data = search(return_day)
+        assert status == 200
+        assert [flight['flight_id'] for flight in data['outbound']['flights']] == [sample_flight]
+        assert [flight['flight_id'] for flight in data['return']['flights']] == ['TEST902', 'TEST903']
+        assert data['pairings'] == [{'outbound_id': sample_flight, 'return_id': 'TEST903', 'total_price': 8000.0}]
+        
+        # A same-day return that leaves before the outbound lands is never paired
+        status, data = search(day)
+        assert status == 200
+        assert data['return']['count'] == 1
+        assert data['pairings'] == []
+        
+        status, _ = search(day - timedelta(days=1))
+        assert status == 400
+    
+    def test_round_trip_ranked_on_fares(self, app, client, sample_flight):
+        """Test that pairings are chosen and totalled on the fares charged"""
+        with app.app_context():
+            outbound = Flight.query.filter_by(flight_id=sample_flight).first()
+            day = outbound.departure_time.date()
+            return_day = day + timedelta(days=2)
+            for flight_id, hour, price in (('TEST904', 9, 4000.0), ('TEST905', 18, 3000.0)):
+                departure = datetime.combine(return_day, datetime.min.time()) + timedelta(hours=hour)
+                db.session.add(Flight(
+                    flight_id=flight_id,
+                    airline='Test Airlines',
+                    source='Delhi',
+                    destination='Mumbai',
+                    departure_time=departure,
+                    arrival_time=departure + timedelta(hours=2),
+                    price=price,
+                    seats={'1A': {'status': 'available', 'type': 'economy'}}
+                ))
+            db.session.commit()
+            cheap = Flight.query.filter_by(flight_id='TEST905').first()
+            FlightFare.query.filter_by(flight_id=cheap.id, seat_class='economy').update({'fare': 4500.0})
+            db.session.commit()
+        
+        response = client.get('/api/flights/search/roundtrip', query_string={
+            'source': 'Mumbai',
+            'destination': 'Delhi',
+            'date': day.isoformat(),
+            'return_date': return_day.isoformat()
+        })
+        assert response.status_code == 200
+        assert json.loads(response.data)['pairings'] == [
+            {'outbound_id': sample_flight, 'return_id': 'TEST904', 'total_price': 9000.0}
+        ]
+
+class TestConnections:
+    """Test suite for one-stop connection search"""
+    
+    def test_connections_ranked_within_layover_window(self, app, client, sample_flight):
+        """Test that second legs respect the layover window and results are ranked"""
+        with app.app_context():
+            first = Flight.query.filter_by(flight_id=sample_flight).first()
+            day = first.departure_time.date()
+            for flight_id, layover, price in (('TEST801', 30, 1000.0), ('TEST802', 60, 3000.0), ('TEST803', 180, 2000.0)):
+                departure = first.arrival_time + timedelta(minutes=layover)
+                db.session.add(Flight(
+                    flight_id=flight_id,
+                    airline='Test Airlines',
+                    source='Delhi',
+                    destination='Kolkata',
+                    departure_time=departure,
+                    arrival_time=departure + timedelta(hours=2),
+                    price=price,
+                    seats={'1A': {'status': 'available', 'type': 'economy'}}
+                ))
+            db.session.commit()
+        
+        def search(**params):
+            response = client.get('/api/flights/search/connections', query_string={
+                'source': 'mumbai',
+                'destination': 'Kolkata',
+                'date': day.isoformat(),
+                **params
+            })
+            assert response.status_code == 200
+            return json.loads(response.data)['itineraries']
+        
+        # TEST801 leaves before the 45 minute default minimum layover
+        by_price = search()
+        assert [itinerary['legs'][1]['flight_id'] for itinerary in by_price] == ['TEST803', 'TEST802']
+        assert by_price[0]['via'] == 'Delhi'
+        assert by_price[0]['total_price'] == 7000.0
+        assert by_price[0]['layover_minutes'] == 180
+        
+        by_duration = search(sort='duration', limit=1)
+        assert [itinerary['legs'][1]['flight_id'] for itinerary in by_duration] == ['TEST802']
+        assert by_duration[0]['total_duration_minutes'] == 300
+        
+        assert [itinerary['legs'][1]['flight_id'] for itinerary in search(min_layover=0, max_layover=90)] == ['TEST801', 'TEST802']
+        assert search(passengers=2) == []
+        
+        response = client.get('/api/flights/search/connections', query_string={
+            'source': 'Mumbai', 'destination': 'Kolkata', 'date': day.isoformat(), 'sort': 'stops'
+        })
+        assert response.status_code == 400
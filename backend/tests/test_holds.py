@@ -0,0 +1,159 @@
+import pytest
+import json
+from datetime import datetime, timedelta
+from app import create_app, db
+from app.models.flight import Flight
+
+@pytest.fixture
+def app():
+    """Create and configure a test app instance"""
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    """Test client for making requests"""
+    return app.test_client()
+
+@pytest.fixture
+def auth_headers(client):
+    """Create a test user and return auth headers"""
+    response = client.post('/api/auth/signup',
+        data=json.dumps({
+            'email': 'holder@example.com',
+            'password': 'holderpass123'
+        }),
+        content_type='application/json'
+    )
+    
+    data = json.loads(response.data)
+    token = data.get('access_token')
+    
+    return {'Authorization': f'Bearer {token}'}
+
+@pytest.fixture
+def sample_flight(app):
+    """Create a sample flight for testing"""
+    with app.app_context():
+        departure = datetime.utcnow() + timedelta(days=7)
+        arrival = departure + timedelta(hours=2)
+        
+        flight = Flight(
+            flight_id='HD123',
+            airline='Hold Test Airlines',
+            source='Delhi',
+            destination='Goa',
+            departure_time=departure,
+            arrival_time=arrival,
+            price=3000.0,
+            seats={
+                '1A': {'status': 'available', 'type': 'business'},
+                '1B': {'status': 'available', 'type': 'business'},
+                '2A': {'status': 'available', 'type': 'economy'},
+            }
+        )
+        
+        db.session.add(flight)
+        db.session.commit()
+        
+        return flight.flight_id
+
+def hold_seats(client, headers, flight_id, seat_numbers, **extra):
+    return client.post('/api/holds',
+        headers=headers,
+        data=json.dumps({'flight_id': flight_id, 'seat_numbers': seat_numbers, **extra}),
+        content_type='application/json'
+    )
+
+class TestSeatHoldRoutes:
+    """Test suite for seat hold routes"""
+    
+    def test_hold_shows_in_seat_map_and_counts(self, client, auth_headers, sample_flight):
+        """Test held seats are neither available nor booked"""
+        response = hold_seats(client, auth_headers, sample_flight, ['1A', '2A'])
+        
+        assert response.status_code == 201
+        hold = json.loads(response.data)['hold']
+        assert hold['seat_numbers'] == ['1A', '2A']
+        
+        flight = json.loads(client.get(f'/api/flights/{sample_flight}').data)['flight']
+        assert flight['seats']['1A']['status'] == 'held'
+        assert flight['available_seats'] == 1
+        assert flight['available_by_class']['held'] == 2
+    
+    def test_held_seat_cannot_be_held_again(self, client, auth_headers, sample_flight):
+        """Test a second hold on the same seat is rejected"""
+        hold_seats(client, auth_headers, sample_flight, ['1A'])
+        response = hold_seats(client, auth_headers, sample_flight, ['1A', '1B'])
+        
+        assert response.status_code == 400
+        flight = Flight.query.filter_by(flight_id=sample_flight).first()
+        assert flight.get_seat('1B').status == 'available'
+    
+    def test_booking_converts_hold(self, client, auth_headers, sample_flight):
+        """Test booking with a hold token books the held seat"""
+        hold = json.loads(hold_seats(client, auth_headers, sample_flight, ['1B']).data)['hold']
+        
+        response = client.post('/api/bookings',
+            headers=auth_headers,
+            data=json.dumps({
+                'flight_id': sample_flight,
+                'passenger_name': 'John Doe',
+                'seat_number': '1B',
+                'hold_token': hold['hold_token']
+            }),
+            content_type='application/json'
+        )
+        
+        assert response.status_code == 201
+        flight = Flight.query.filter_by(flight_id=sample_flight).first()
+        assert flight.get_seat('1B').status == 'booked'
+        assert (flight.seats_available, flight.seats_held) == (2, 0)
+    
+    def test_booking_with_wrong_hold_token(self, client, auth_headers, sample_flight):
+        """Test a held seat cannot be booked without its hold token"""
+        hold_seats(client, auth_headers, sample_flight, ['1B'])
+        
+        response = client.post('/api/bookings',
+            headers=auth_headers,
+            data=json.dumps({
+                'flight_id': sample_flight,
+                'passenger_name': 'Jane Doe',
+                'seat_number': '1B',
+                'hold_token': 'not-a-real-token'
+            }),
+            content_type='application/json'
+        )
+        
+        assert response.status_code == 400
+    
+    def test_release_hold(self, client, auth_headers, sample_flight):
+        """Test releasing a hold frees its seats"""
+        hold = json.loads(hold_seats(client, auth_headers, sample_flight, ['1A', '1B']).data)['hold']
+        
+        response = client.delete(f"/api/holds/{hold['hold_token']}", headers=auth_headers)
+        
+        assert response.status_code == 200
+        assert json.loads(response.data)['released'] == 2
+        flight = Flight.query.filter_by(flight_id=sample_flight).first()
+        assert (flight.seats_available, flight.business_available, flight.seats_held) == (3, 2, 0)
+    
+    def test_sweeper_releases_expired_holds(self, client, auth_headers, sample_flight):
+        """Test expired holds are released in batches"""
+        hold_seats(client, auth_headers, sample_flight, ['1A', '1B', '2A'])
+        
+        later = datetime.utcnow() + timedelta(hours=1)
+        released = Flight.release_expired_holds(batch_size=2, now=later)
+        
+        assert released == 3
+        flight = Flight.query.filter_by(flight_id=sample_flight).first()
+        db.session.refresh(flight)
+        assert (flight.seats_available, flight.seats_held) == (3, 0)
+        assert flight.get_available_seats() == ['1A', '1B', '2A']
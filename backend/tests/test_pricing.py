@@ -0,0 +1,51 @@
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from app.utils import dynamic_pricing
+from app.utils.dynamic_pricing import calculate_dynamic_price, price_fares
+
+ENGINES = ['python', pytest.param('numpy', marks=pytest.mark.skipif(
+    dynamic_pricing.np is None, reason='numpy is not installed'
+))]
+
+class TestDynamicPricing:
+    """Test batch dynamic pricing"""
+    
+    @pytest.mark.parametrize('engine', ENGINES)
+    def test_price_fares_applies_rules(self, engine):
+        """Test occupancy tiers, class multipliers and last-minute surcharges"""
+        fares = price_fares(
+            [1000, 1000, 1000, 1000, 1000, 1000],
+            [0.1, 0.6, 0.9, 0.1, 0.1, 0.1],
+            [100, 100, 100, 30, 10, 100],
+            ['economy', 'economy', 'economy', 'economy', 'economy', 'business'],
+            engine=engine
+        )
+        
+        assert fares == [1000.0, 1200.0, 1500.0, 1150.0, 1450.0, 2000.0]
+    
+    def test_engines_agree(self):
+        """Test the NumPy and pure-Python engines return identical fares"""
+        if dynamic_pricing.np is None:
+            pytest.skip('numpy is not installed')
+        count = 500
+        args = (
+            [1999.99 + i * 13.37 for i in range(count)],
+            [(i % 100) / 100 for i in range(count)],
+            [(i % 72) - 0.5 for i in range(count)],
+            [('economy', 'business', 'first', 'unknown')[i % 4] for i in range(count)],
+        )
+        
+        assert price_fares(*args, engine='numpy') == price_fares(*args, engine='python')
+    
+    def test_calculate_dynamic_price_from_flight(self):
+        """Test single-flight pricing reads the availability counters"""
+        flight = SimpleNamespace(
+            price=5000.0,
+            seats_total=100,
+            seats_available=10,
+            departure_time=datetime.utcnow() + timedelta(days=7)
+        )
+        
+        assert calculate_dynamic_price(flight) == 7500.0
+        assert calculate_dynamic_price(flight, 'first') == 22500.0
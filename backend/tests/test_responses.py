@@ -0,0 +1,59 @@
+import pytest
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from app import create_app
+from app.utils import reponse_handler
+from app.utils.reponse_handler import get_encoder
+
+PAYLOAD = {
+    'departure_time': datetime(2025, 12, 1, 8, 30),
+    'booked_at': datetime(2025, 11, 2, 9, 15, 0, 120000),
+    'day': date(2025, 12, 1),
+    'price': Decimal('4500.50'),
+    'seats': ['1A']
+}
+
+EXPECTED = {
+    'departure_time': '2025-12-01T08:30:00',
+    'booked_at': '2025-11-02T09:15:00.120000',
+    'day': '2025-12-01',
+    'price': 4500.5,
+    'seats': ['1A']
+}
+
+ENCODERS = ['json', pytest.param('orjson', marks=pytest.mark.skipif(
+    reponse_handler.orjson is None, reason='orjson is not installed'
+))]
+
+class TestJSONEncoders:
+    """Test the pluggable response encoders"""
+    
+    @pytest.mark.parametrize('name', ENCODERS)
+    def test_encoder_writes_iso_datetimes(self, name):
+        """Test each encoder turns datetimes and dates into ISO 8601 strings"""
+        encoder = get_encoder(name)
+        
+        assert encoder.name == name
+        assert json.loads(encoder.dumps(PAYLOAD)) == EXPECTED
+        assert encoder.loads(encoder.dumps_bytes(PAYLOAD)) == EXPECTED
+    
+    def test_auto_falls_back_to_stdlib(self, monkeypatch):
+        """Test 'auto' picks the stdlib encoder when orjson is missing, and orjson is refused"""
+        monkeypatch.setattr(reponse_handler, 'orjson', None)
+        
+        assert get_encoder('auto').name == 'json'
+        with pytest.raises(ValueError):
+            get_encoder('orjson')
+        with pytest.raises(ValueError):
+            get_encoder('yaml')
+    
+    def test_app_responses_encode_datetimes(self):
+        """Test jsonify() in the app goes through the provider's ISO encoding"""
+        app = create_app()
+        
+        with app.test_request_context():
+            response = app.json.response(PAYLOAD)
+        
+        assert response.mimetype == 'application/json'
+        assert json.loads(response.get_data()) == EXPECTED
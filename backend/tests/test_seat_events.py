@@ -0,0 +1,151 @@
+import pytest
+import json
+from datetime import datetime, timedelta
+from app import create_app, db
+from app.extensions import seat_events
+from app.models.flight import Flight
+
+@pytest.fixture
+def app():
+    """Create and configure a test app instance"""
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SEAT_EVENTS_KEEPALIVE_SECONDS'] = 1
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    """Test client for making requests"""
+    return app.test_client()
+
+@pytest.fixture
+def auth_headers(client):
+    """Create a test user and return auth headers"""
+    response = client.post('/api/auth/signup',
+        data=json.dumps({
+            'email': 'watcher@example.com',
+            'password': 'watcherpass123'
+        }),
+        content_type='application/json'
+    )
+    
+    data = json.loads(response.data)
+    token = data.get('access_token')
+    
+    return {'Authorization': f'Bearer {token}'}
+
+@pytest.fixture
+def sample_flight(app):
+    """Create a sample flight for testing"""
+    with app.app_context():
+        departure = datetime.utcnow() + timedelta(days=7)
+        arrival = departure + timedelta(hours=2)
+        
+        flight = Flight(
+            flight_id='EV123',
+            airline='Event Test Airlines',
+            source='Pune',
+            destination='Chennai',
+            departure_time=departure,
+            arrival_time=arrival,
+            price=4000.0,
+            seats={
+                '1A': {'status': 'available', 'type': 'business'},
+                '1B': {'status': 'available', 'type': 'business'},
+                '2A': {'status': 'available', 'type': 'economy'},
+            }
+        )
+        
+        db.session.add(flight)
+        db.session.commit()
+        
+        return flight.flight_id
+
+def book_seat(client, headers, flight_id, seat_number):
+    return client.post('/api/bookings',
+        headers=headers,
+        data=json.dumps({
+            'flight_id': flight_id,
+            'passenger_name': 'John Doe',
+            'seat_number': seat_number
+        }),
+        content_type='application/json'
+    )
+
+def next_event(chunks):
+    """Read the stream up to the next named event, skipping keep-alives"""
+    for chunk in chunks:
+        text = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if text.startswith(':'):
+            continue
+        fields = dict(line.split(': ', 1) for line in text.strip().split('\n'))
+        return fields['event'], int(fields['id']), json.loads(fields['data'])
+    return None
+
+class TestSeatEvents:
+    """Test suite for live seat change events"""
+    
+    def test_stream_pushes_booking_and_cancellation(self, app, client, auth_headers, sample_flight):
+        """Test that committed bookings reach an open stream"""
+        response = client.get(f'/api/flights/{sample_flight}/seats/stream', buffered=False)
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        chunks = iter(response.response)
+        
+        kind, version, _ = next_event(chunks)
+        assert kind == 'connected'
+        
+        booking = json.loads(book_seat(client, auth_headers, sample_flight, '1A').data)['booking']
+        kind, booked_version, data = next_event(chunks)
+        assert kind == 'booked'
+        assert booked_version == version + 1
+        assert data['seats'] == {'1A': {'status': 'booked', 'type': 'business', 'passenger': 'John Doe'}}
+        
+        client.put(f"/api/bookings/{booking['pnr']}/cancel", headers=auth_headers)
+        kind, _, data = next_event(chunks)
+        assert kind == 'cancelled'
+        assert data['seats']['1A']['status'] == 'available'
+        
+        with app.app_context():
+            flight_pk = Flight.query.filter_by(flight_id=sample_flight).first().id
+        response.close()
+        assert seat_events.subscriber_count(flight_pk) == 0
+    
+    def test_failed_booking_publishes_nothing(self, app, client, auth_headers, sample_flight):
+        """Test that rolled back seat changes are never published"""
+        with app.app_context():
+            flight_pk = Flight.query.filter_by(flight_id=sample_flight).first().id
+        subscription = seat_events.subscribe(flight_pk)
+        
+        try:
+            assert book_seat(client, auth_headers, sample_flight, '2A').status_code == 201
+            assert book_seat(client, auth_headers, sample_flight, '2A').status_code == 400
+            
+            assert subscription.get(timeout=1)['event'] == 'booked'
+            assert subscription.get(timeout=0.1) is None
+        finally:
+            subscription.close()
+    
+    def test_reconnect_replays_missed_changes(self, app, client, auth_headers, sample_flight):
+        """Test that Last-Event-ID replays changes from the log"""
+        with app.app_context():
+            version = Flight.query.filter_by(flight_id=sample_flight).first().seat_version
+        
+        book_seat(client, auth_headers, sample_flight, '1B')
+        
+        response = client.get(f'/api/flights/{sample_flight}/seats/stream',
+            headers={'Last-Event-ID': str(version)},
+            buffered=False
+        )
+        kind, replay_version, data = next_event(iter(response.response))
+        response.close()
+        
+        assert kind == 'changes'
+        assert replay_version == version + 1
+        assert data['seats']['1B']['status'] == 'booked'
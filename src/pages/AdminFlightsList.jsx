@@ -5,7 +5,9 @@ import api from "../services/api";
 
 export default function AdminFlightsList() {
   const [flights, setFlights] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const { showToast, ToastContainer } = useToast();
 
@@ -18,6 +20,7 @@ export default function AdminFlightsList() {
       setLoading(true);
       const response = await api.get('/flights');
       setFlights(response.data.flights || []);
+      setNextCursor(response.data.next_cursor || null);
     } catch (error) {
       console.error('Fetch flights error:', error);
       showToast("Failed to load flights", "error");
@@ -26,6 +29,20 @@ export default function AdminFlightsList() {
     }
   }
 
+  async function loadMoreFlights() {
+    try {
+      setLoadingMore(true);
+      const response = await api.get('/flights', { params: { cursor: nextCursor } });
+      setFlights(prev => [...prev, ...(response.data.flights || [])]);
+      setNextCursor(response.data.next_cursor || null);
+    } catch (error) {
+      console.error('Fetch flights error:', error);
+      showToast("Failed to load flights", "error");
+    } finally {
+      setLoadingMore(false);
+    }
+  }
+
   async function deleteFlight(flightId) {
     if (!confirm(`Are you sure you want to delete flight ${flightId}?`)) {
       return;
@@ -89,6 +106,16 @@ export default function AdminFlightsList() {
         </ul>
       )}
 
+      {nextCursor && (
+        <button
+          className="btn-secondary w-full mt-4"
+          onClick={loadMoreFlights}
+          disabled={loadingMore}
+        >
+          {loadingMore ? 'Loading...' : 'Load more flights'}
+        </button>
+      )}
+
       <ToastContainer />
     </div>
   );
@@ -6,7 +6,9 @@ import PageTransition from "../components/PageTransition";
 
 export default function BookingHistory() {
   const [bookings, setBookings] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const { showToast, ToastContainer } = useToast();
 
   useEffect(() => {
@@ -29,6 +31,7 @@ export default function BookingHistory() {
       console.log('Bookings count:', bookingsList.length);
       
       setBookings(bookingsList);
+      setNextCursor(data?.next_cursor || null);
       
       if (bookingsList.length === 0) {
         showToast("No bookings found", "info");
@@ -45,6 +48,23 @@ export default function BookingHistory() {
     }
   };
 
+  const loadMoreBookings = async () => {
+    try {
+      setLoadingMore(true);
+      const response = await api.get("/bookings", { params: { cursor: nextCursor } });
+      setBookings((prev) => [...prev, ...(response.data?.bookings || [])]);
+      setNextCursor(response.data?.next_cursor || null);
+    } catch (error) {
+      console.error("Error fetching bookings:", error);
+      showToast(
+        error.response?.data?.error || "Failed to load bookings",
+        "error"
+      );
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleCancelBooking = async (pnr) => {
     if (!confirm("Are you sure you want to cancel this booking?")) {
       return;
@@ -176,6 +196,15 @@ export default function BookingHistory() {
                   </div>
                 </div>
               ))}
+              {nextCursor && (
+                <button
+                  onClick={loadMoreBookings}
+                  className="btn-secondary w-full"
+                  disabled={loadingMore}
+                >
+                  {loadingMore ? "Loading..." : "Load more bookings"}
+                </button>
+              )}
             </div>
           )}
         </div>
@@ -15,6 +15,9 @@ export default function BookingPage() {
   const [flight, setFlight] = useState(location.state?.flight || null);
   const [passenger, setPassenger] = useState("");
   const [loading, setLoading] = useState(false);
+  const [quote, setQuote] = useState(null);
+  // One key per booking attempt, so a retried confirm can't book twice
+  const [idempotencyKey, setIdempotencyKey] = useState(() => crypto.randomUUID());
 
   const { showToast, ToastContainer } = useToast();
 
@@ -24,6 +27,44 @@ export default function BookingPage() {
     }
   }, [flightId]);
 
+  useEffect(() => {
+    if (flight) {
+      fetchQuote();
+    }
+  }, [flight, seat]);
+
+  // Quotes are short-lived; fetch a fresh one as soon as this one expires
+  useEffect(() => {
+    if (!quote) return;
+    const timer = setTimeout(fetchQuote, Math.max(quoteExpiresAt(quote) - Date.now(), 0));
+    return () => clearTimeout(timer);
+  }, [quote]);
+
+  // expires_at is UTC without an offset
+  function quoteExpiresAt(current) {
+    return Date.parse(`${current.expires_at}Z`);
+  }
+
+  // Price the seat on the server; the booking pays this quote. Without the
+  // seat map the cabin is unknown, so the server prices at booking time.
+  // Returns the new quote (or null) as well as storing it
+  async function fetchQuote() {
+    const cabin = flight.seats?.[seat]?.type;
+    if (!cabin) return null;
+    try {
+      const response = await api.post('/quotes', {
+        flight_id: flightId,
+        seat_class: cabin,
+        passengers: 1
+      });
+      setQuote(response.data.quote);
+      return response.data.quote;
+    } catch (error) {
+      setQuote(null);
+      return null;
+    }
+  }
+
   async function fetchFlightDetails() {
     try {
       const response = await api.get(`/flights/${flightId}`);
@@ -39,7 +80,7 @@ export default function BookingPage() {
   const seatRow = seat.replace(/[A-Z]/g, '');
   const seatClass = getSeatClass(Number(seatRow));
   const multiplier = seatPriceMultiplier(seatClass);
-  const finalPrice = Math.round(flight.price * multiplier);
+  const finalPrice = quote ? quote.total_price : Math.round(flight.price * multiplier);
 
   async function handleConfirm() {
     if (!passenger.trim()) {
@@ -53,20 +94,51 @@ export default function BookingPage() {
       return;
     }
 
-    try {
-      setLoading(true);
-
+    function submitBooking(currentQuote, key) {
       // Log the payload for debugging
       const payload = {
         flight_id: flightId,  // This is the flight_id string like "AI101" from URL
         passenger_name: passenger.trim(),
-        seat_number: seat  // This is the seat like "1E" from URL
+        seat_number: seat,  // This is the seat like "1E" from URL
+        ...(currentQuote && { quote_id: currentQuote.quote_id })
       };
       
       console.log('Booking payload:', payload);
       console.log('Flight object:', flight);
 
-      const response = await api.post('/bookings', payload);
+      return api.post('/bookings', payload, {
+        headers: { 'Idempotency-Key': key }
+      });
+    }
+
+    try {
+      setLoading(true);
+
+      // A quote that ran out while the page was open is replaced before paying with it
+      let currentQuote = quote;
+      if (currentQuote && quoteExpiresAt(currentQuote) <= Date.now()) {
+        currentQuote = await fetchQuote();
+      }
+
+      let response;
+      try {
+        response = await submitBooking(currentQuote, idempotencyKey);
+      } catch (error) {
+        // The server turned the quote down (expired, already used): quote again and,
+        // if the fare is unchanged, retry once as a new attempt
+        if (!currentQuote || error.response?.status !== 400 || !/fare quote/i.test(error.response.data?.error || '')) {
+          throw error;
+        }
+        const freshQuote = await fetchQuote();
+        if (freshQuote && freshQuote.total_price !== currentQuote.total_price) {
+          setIdempotencyKey(crypto.randomUUID());
+          showToast(`The fare has changed to ₹${freshQuote.total_price}. Please confirm again.`, "warning");
+          return;
+        }
+        const retryKey = crypto.randomUUID();
+        setIdempotencyKey(retryKey);
+        response = await submitBooking(freshQuote, retryKey);
+      }
       
       console.log('Full response:', response);
       console.log('Response data:', response.data);
@@ -85,6 +157,10 @@ export default function BookingPage() {
 
     } catch (error) {
       console.error('Booking error:', error);
+      // The server answered, so the next confirm is a new attempt rather than a retry
+      if (error.response) {
+        setIdempotencyKey(crypto.randomUUID());
+      }
       console.error('Error response:', error.response?.data);
       showToast(
         error.response?.data?.error || "Booking failed. Please try again.",
@@ -23,31 +23,32 @@ export default function SearchFlights() {
     setError("");
     
     try {
-      // Search outbound flights
-      const outboundResponse = await api.get('/flights/search', {
-        params: {
-          source,
-          destination,
-          date: departDate,
-          passengers: 1
-        }
-      });
-      
-      setOutboundFlights(outboundResponse.data.flights || []);
-      
-      // If round trip, search return flights
+      // If round trip, search both legs in one request
       if (tripType === "roundtrip" && returnDate) {
-        const returnResponse = await api.get('/flights/search', {
+        const response = await api.get('/flights/search/roundtrip', {
           params: {
-            source: destination,  // Swap source and destination
-            destination: source,
-            date: returnDate,
+            source,
+            destination,
+            date: departDate,
+            return_date: returnDate,
             passengers: 1
           }
         });
         
-        setReturnFlights(returnResponse.data.flights || []);
+        setOutboundFlights(response.data.outbound?.flights || []);
+        setReturnFlights(response.data.return?.flights || []);
       } else {
+        // Search outbound flights
+        const outboundResponse = await api.get('/flights/search', {
+          params: {
+            source,
+            destination,
+            date: departDate,
+            passengers: 1
+          }
+        });
+        
+        setOutboundFlights(outboundResponse.data.flights || []);
         setReturnFlights([]);
       }
       
@@ -168,7 +169,7 @@ export default function SearchFlights() {
                   </div>
                   <div className="text-right">
                     <p className="text-lg font-bold text-indigo-600">
-                      ₹{flight.price?.toFixed(2) || 'N/A'}
+                      ₹{(flight.fare ?? flight.price)?.toFixed(2) || 'N/A'}
                     </p>
                     <p className="text-xs text-gray-500">
                       {flight.available_seats} seats left
@@ -212,7 +213,7 @@ export default function SearchFlights() {
                   </div>
                   <div className="text-right">
                     <p className="text-lg font-bold text-indigo-600">
-                      ₹{flight.price?.toFixed(2) || 'N/A'}
+                      ₹{(flight.fare ?? flight.price)?.toFixed(2) || 'N/A'}
                     </p>
                     <p className="text-xs text-gray-500">
                       {flight.available_seats} seats left
@@ -1,4 +1,7 @@
 export function calculateDynamicPrice(flight) {
+  // Search results carry the server's precomputed fare
+  if (flight.fare != null) return flight.fare;
+
   const basePrice = Number(flight.price || 0);
   let price = basePrice;
 